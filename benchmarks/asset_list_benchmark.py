@@ -0,0 +1,183 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014-2023 ftrack
+import os
+import sys
+import time
+import uuid
+import random
+
+from Qt import QtWidgets
+
+from ftrack_connect_pipeline.constants import asset as asset_const
+from ftrack_connect_pipeline_qt.ui.asset_manager.model import AssetListModel
+from ftrack_connect_pipeline_qt.ui.asset_manager.base import AssetListWidget
+from ftrack_connect_pipeline_qt.ui.utility.widget.base.accordion_base import (
+    AccordionBaseWidget,
+)
+
+# Micro-benchmarks of the asset list model and widget lookups, run
+# standalone without an ftrack server:
+#
+#   python benchmarks/asset_list_benchmark.py [rows]
+#
+# Prints the time spent by each operation at the given amount of rows,
+# 10000 by default.
+
+SAMPLES = 1000  # Lookups, inserts and removes timed per operation
+
+
+class BenchmarkAssetWidget(AccordionBaseWidget):
+    '''Minimal asset widget, only holding its model index'''
+
+    @property
+    def index(self):
+        return self._index
+
+    @index.setter
+    def index(self, value):
+        self._index = value
+
+    def __init__(self, index, parent=None):
+        self._index = index
+        super(BenchmarkAssetWidget, self).__init__(
+            AccordionBaseWidget.SELECT_MODE_LIST,
+            AccordionBaseWidget.CHECK_MODE_NONE,
+            collapsable=False,
+            parent=parent,
+        )
+
+
+class BenchmarkAssetListWidget(AssetListWidget):
+    '''Virtualized asset list, building benchmark widgets when requested'''
+
+    def build_widget(self, index):
+        return BenchmarkAssetWidget(index)
+
+
+def create_asset_info():
+    '''Return an asset info having only an id'''
+    return {asset_const.ASSET_INFO_ID: uuid.uuid4().hex}
+
+
+def report(name, seconds, count):
+    '''Print the total and per operation time'''
+    print(
+        '{:<40} {:>9.3f} ms {:>10.2f} us/op'.format(
+            name, seconds * 1000, seconds * 1000000 / max(1, count)
+        )
+    )
+
+
+def timed(name, operations):
+    '''Run *operations*, a list of callables, and report time spent'''
+    start = time.perf_counter()
+    for operation in operations:
+        operation()
+    report(name, time.perf_counter() - start, len(operations))
+
+
+def main(rows):
+    '''Run the benchmarks at *rows* amount of assets'''
+    # Init QApplication
+    app = QtWidgets.QApplication(sys.argv)
+
+    print('Asset list benchmark, {} rows'.format(rows))
+
+    model = AssetListModel(None)
+    asset_list = BenchmarkAssetListWidget(model, virtualized=True)
+
+    asset_infos = [create_asset_info() for _ in range(rows)]
+    timed(
+        'model insertRows (all)', [lambda: model.insertRows(0, asset_infos)]
+    )
+    timed(
+        'widget insert_rows (all)',
+        [lambda: asset_list.insert_rows(0, rows - 1)],
+    )
+
+    sample_ids = [
+        asset_info[asset_const.ASSET_INFO_ID]
+        for asset_info in random.sample(asset_infos, min(SAMPLES, rows))
+    ]
+    timed(
+        'model getIndex',
+        [
+            lambda asset_info_id=i: model.getIndex(asset_info_id)
+            for i in sample_ids
+        ],
+    )
+    timed(
+        'model getDataById',
+        [
+            lambda asset_info_id=i: model.getDataById(asset_info_id)
+            for i in sample_ids
+        ],
+    )
+
+    def set_data(asset_info_id):
+        '''Replace asset info having *asset_info_id* by a new one, as a
+        version change does'''
+        index = model.getIndex(asset_info_id)
+        asset_info = create_asset_info()
+        model.setData(index, asset_info, silent=True)
+        return asset_info[asset_const.ASSET_INFO_ID]
+
+    sample_ids = [set_data(asset_info_id) for asset_info_id in sample_ids]
+    timed(
+        'model setData + getIndex',
+        [
+            lambda asset_info_id=i: model.getIndex(asset_info_id)
+            for i in sample_ids
+        ],
+    )
+
+    sample_rows = [
+        model.getIndex(asset_info_id).row() for asset_info_id in sample_ids
+    ]
+    timed(
+        'widget get_widget (build)',
+        [
+            lambda row=r: asset_list.get_widget(
+                model.createIndex(row, 0, model)
+            )
+            for r in sample_rows
+        ],
+    )
+    timed(
+        'widget get_widget (built)',
+        [
+            lambda row=r: asset_list.get_widget(
+                model.createIndex(row, 0, model)
+            )
+            for r in sample_rows
+        ],
+    )
+
+    def insert_row():
+        '''Insert a row in the middle, then look up the last one'''
+        row = model.rowCount() // 2
+        asset_info = create_asset_info()
+        model.insertRows(row, [asset_info])
+        asset_list.insert_rows(row, row)
+        model.getIndex(asset_infos[-1][asset_const.ASSET_INFO_ID])
+        asset_list.get_widget(
+            model.createIndex(model.rowCount() - 1, 0, model)
+        )
+
+    def remove_row():
+        '''Remove a row in the middle, then look up the last one'''
+        row = model.rowCount() // 2
+        model.removeRows(model.createIndex(row, 0, model))
+        asset_list.remove_rows(row, row)
+        model.getIndex(asset_infos[-1][asset_const.ASSET_INFO_ID])
+        asset_list.get_widget(
+            model.createIndex(model.rowCount() - 1, 0, model)
+        )
+
+    timed('insert row + lookups', [insert_row] * SAMPLES)
+    timed('remove row + lookups', [remove_row] * SAMPLES)
+
+
+if __name__ == '__main__':
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
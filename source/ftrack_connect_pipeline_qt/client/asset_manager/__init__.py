@@ -48,6 +48,13 @@ class QtAssetManagerClientWidget(QtAssetManagerClient, QtWidgets.QFrame):
     QtAssetManagerClientWidget class.
     '''
 
+    virtualized_asset_list = (
+        False  # Build asset widgets first when scrolled into view
+    )
+    live_mode = (
+        False  # Flag assets as outdated when new versions are published
+    )
+
     contextChanged = QtCore.Signal(object)  # Context has changed
     assetsDiscovered = QtCore.Signal()  # Assets has been discovered and loaded
     selectionUpdated = QtCore.Signal(object)  # Selection has changed
@@ -173,6 +180,7 @@ class QtAssetManagerClientWidget(QtAssetManagerClient, QtWidgets.QFrame):
             )
 
         self.asset_manager_widget.rebuild.connect(self.rebuild)
+        self.asset_manager_widget.set_live_mode(self.live_mode)
 
         self.asset_manager_widget.changeAssetVersion.connect(
             self._on_change_asset_version
@@ -266,15 +274,10 @@ class QtAssetManagerClientWidget(QtAssetManagerClient, QtWidgets.QFrame):
         '''
         self.logger.debug('Discovered assets: {}'.format(event))
         try:
-            if not event['data']:
-                self.assetsDiscovered.emit()
-                return
-            asset_entities_list = []
-            for ftrack_asset in event['data']:
-                if ftrack_asset not in self._asset_list_model.items():
-                    asset_entities_list.append(ftrack_asset)
-
-            self.asset_manager_widget.set_asset_list(asset_entities_list)
+            # Reconcile with model in main thread
+            self.asset_manager_widget.assetsDiscovered.emit(
+                event['data'] or []
+            )
             self.assetsDiscovered.emit()
         finally:
             self.asset_manager_widget.stopBusyIndicator.emit()
@@ -341,23 +344,21 @@ class QtAssetManagerClientWidget(QtAssetManagerClient, QtWidgets.QFrame):
             if not event['data']:
                 return
             data = event['data']
-            do_refresh = False
             for key, value in data.items():
                 if key == 'message':
                     if len(value or '') > 0:
                         self.onAssetManagerMessage.emit(value, 'Load asset')
                     continue
-                asset_info = self._asset_list_model.getDataById(key)
-                if asset_info is None:
+                index = self._asset_list_model.getIndex(key)
+                if index is None:
                     continue
                 self.logger.debug(
                     'Updating id {} with loaded status'.format(key)
                 )
                 # Set to loaded
+                asset_info = self._asset_list_model.data(index)
                 asset_info[asset_const.OBJECTS_LOADED] = True
-                do_refresh = True
-            if do_refresh:
-                self.asset_manager_widget.refresh.emit()
+                self._asset_list_model.setData(index, asset_info)
         finally:
             self.asset_manager_widget.stopBusyIndicator.emit()
 
@@ -384,7 +385,6 @@ class QtAssetManagerClientWidget(QtAssetManagerClient, QtWidgets.QFrame):
         '''
         try:
             data = event['data']
-            do_refresh = False
             for key, value in data.items():
                 if key == 'message':
                     if len(value or '') > 0:
@@ -397,10 +397,7 @@ class QtAssetManagerClientWidget(QtAssetManagerClient, QtWidgets.QFrame):
                     'Updating id {} @ position {}'.format(key, index)
                 )
                 asset_info = value.get(list(value.keys())[0])
-                self._asset_list_model.setData(index, asset_info, silent=True)
-                do_refresh = True
-            if do_refresh:
-                self.asset_manager_widget.refresh.emit()
+                self._asset_list_model.setData(index, asset_info)
         finally:
             self.asset_manager_widget.stopBusyIndicator.emit()
 
@@ -428,7 +425,6 @@ class QtAssetManagerClientWidget(QtAssetManagerClient, QtWidgets.QFrame):
             if not event['data']:
                 return
             data = event['data']
-            do_refresh = False
             for key, value in data.items():
                 if key == 'message':
                     if len(value or '') > 0:
@@ -443,10 +439,7 @@ class QtAssetManagerClientWidget(QtAssetManagerClient, QtWidgets.QFrame):
                     'Updating id {} @ position {}'.format(key, index)
                 )
                 asset_info = value
-                self._asset_list_model.setData(index, asset_info, silent=True)
-                do_refresh = True
-            if do_refresh:
-                self.asset_manager_widget.refresh.emit()
+                self._asset_list_model.setData(index, asset_info)
         finally:
             self.asset_manager_widget.stopBusyIndicator.emit()
 
@@ -474,14 +467,13 @@ class QtAssetManagerClientWidget(QtAssetManagerClient, QtWidgets.QFrame):
             if not event['data']:
                 return
             data = event['data']
-            do_refresh = False
             for key, value in data.items():
                 if key == 'message':
                     if len(value or '') > 0:
                         self.onAssetManagerMessage.emit(value, 'Unload asset')
                     continue
-                asset_info = self._asset_list_model.getDataById(key)
-                if asset_info is None:
+                index = self._asset_list_model.getIndex(key)
+                if index is None:
                     self.logger.warning(
                         'Could not find recently unloaded asset: {} (event: {})'.format(
                             key, event
@@ -492,10 +484,9 @@ class QtAssetManagerClientWidget(QtAssetManagerClient, QtWidgets.QFrame):
                     'Updating id {} with loaded status'.format(key)
                 )
                 # Set to unloaded
+                asset_info = self._asset_list_model.data(index)
                 asset_info[asset_const.OBJECTS_LOADED] = False
-                do_refresh = True
-            if do_refresh:
-                self.asset_manager_widget.refresh.emit()
+                self._asset_list_model.setData(index, asset_info)
         finally:
             self.asset_manager_widget.stopBusyIndicator.emit()
 
@@ -576,6 +567,7 @@ class QtAssetManagerClientWidget(QtAssetManagerClient, QtWidgets.QFrame):
         self.logger.debug('closing qt client')
         # Unsubscribe to context change events
         self.unsubscribe_host_context_change()
+        self.asset_manager_widget.set_live_mode(False)
         # Have asset manager widget unsubscribe to events
         if self.asset_manager_widget.client_notification_subscribe_id:
             self.session.unsubscribe(
@@ -2,19 +2,27 @@
 # :coding: utf-8
 # :copyright: Copyright (c) 2014-2022 ftrack
 import shiboken2
+import threading
 from functools import partial
 
 from Qt import QtCore, QtWidgets
 
+import ftrack_api
+
 from ftrack_connect_pipeline.utils import str_version
 from ftrack_connect_pipeline import constants as core_constants
 from ftrack_connect_pipeline.client.loader import LoaderClient
 from ftrack_connect_pipeline_qt.ui.utility.widget.button import (
     AddRunButton,
     LoadRunButton,
+    RemoveButton,
 )
 
-from ftrack_connect_pipeline_qt.utils import get_theme, set_theme
+from ftrack_connect_pipeline_qt.utils import (
+    get_theme,
+    set_theme,
+    query_in_batches,
+)
 from ftrack_connect_pipeline_qt import constants as qt_constants
 from ftrack_connect_pipeline_qt.ui.utility.widget.dialog import ModalDialog
 from ftrack_connect_pipeline_qt.ui.utility.widget import (
@@ -36,10 +44,15 @@ from ftrack_connect_pipeline_qt.client.asset_manager import (
 from ftrack_connect_pipeline_qt.ui.assembler import (
     AssemblerDependenciesWidget,
     AssemblerBrowserWidget,
+    DependencyResolveCache,
 )
 from ftrack_connect_pipeline_qt.ui.factory.assembler import (
     AssemblerWidgetFactory,
 )
+from ftrack_connect_pipeline_qt.client.load.batch import (
+    BatchItem,
+    BatchRunner,
+)
 
 
 class QtLoaderClient(LoaderClient):
@@ -69,6 +82,15 @@ class QtAssemblerClientWidget(QtLoaderClient, dialog.Dialog):
     asset_fetch_chunk_size = (
         10  # Amount of assets to fetch at a time within the browser
     )
+    asset_fetch_prefetch = (
+        False  # Prefetch next chunk of assets, fetch more on scroll to end
+    )
+    virtualized_asset_list = (
+        False  # Build component widgets first when scrolled into view
+    )
+    batch_prepare_queue_size = (
+        16  # Max amount of components resolved ahead of the one loading
+    )
 
     # Assembler modes
     ASSEMBLE_MODE_DEPENDENCIES = 0
@@ -107,6 +129,11 @@ class QtAssemblerClientWidget(QtLoaderClient, dialog.Dialog):
             -1
         )  # The mode assembler is in - resolve dependencies or manual browse
         self._assembler_widget = None
+        self._batch_runner = None
+        self._prepare_session = None  # Session resolving batch components
+        self._prepare_session_lock = threading.Lock()
+        self._deferred_context_id = None  # Context change during batch
+        self._close_requested = False  # Close requested during batch
         self.hard_refresh = True  # Flag telling assembler that next refresh should be a complete rebuild
 
         set_theme(self, get_theme())
@@ -276,6 +303,8 @@ class QtAssemblerClientWidget(QtLoaderClient, dialog.Dialog):
 
     def on_hosts_discovered(self, host_connections):
         '''(Override)'''
+        # Plugins might have changed
+        AssemblerWidgetFactory.clear_plugin_widget_cache()
         self.host_selector.add_hosts(host_connections)
 
     def on_host_changed(self, host_connection):
@@ -302,7 +331,13 @@ class QtAssemblerClientWidget(QtLoaderClient, dialog.Dialog):
         if not shiboken2.isValid(self):
             # Widget has been closed while context changed
             return
+        if self._batch_runner is not None:
+            # Would rebuild lists, apply when batch is done
+            self._deferred_context_id = context_id
+            return
         self.context_selector.context_id = self.context_id
+        # Dependencies has to be resolved again in new context
+        DependencyResolveCache.get_cache(self.session).invalidate()
         # Have AM fetch assets
         self.asset_manager.on_host_changed(self.host_connection)
         # Reset definition selector and clear client
@@ -341,7 +376,9 @@ class QtAssemblerClientWidget(QtLoaderClient, dialog.Dialog):
                 if self.assemble_mode != self.ASSEMBLE_MODE_DEPENDENCIES
                 else self._browse_widget
             )
-            # Clear the other tab
+            # Stop and clear the other tab
+            if self._assembler_widget is not None:
+                self._assembler_widget.cancel()
             clear_layout(inactive_tab_widget.layout())
             # Create tab widget
             self._assembler_widget = (
@@ -392,6 +429,9 @@ class QtAssemblerClientWidget(QtLoaderClient, dialog.Dialog):
         '''(Override) Function called when the run button is clicked.
         *method* decides which load method to use, "init_nodes"(track) or "init_and_load"(track and load)
         '''
+        if self._batch_runner is not None:
+            # Already running a batch
+            return
         # Load batch of components, any selected
         component_widgets = self._assembler_widget.component_list.selection(
             as_widgets=True
@@ -420,59 +460,85 @@ class QtAssemblerClientWidget(QtLoaderClient, dialog.Dialog):
                 component_widgets = all_component_widgets
         if len(component_widgets) > 0:
             # Each component contains a definition ready to run and a factory,
-            # run them one by one. Start by preparing progress widget
-            self.progress_widget.prepare_add_steps()
-            self.progress_widget.set_status(
-                core_constants.RUNNING_STATUS, 'Initializing...'
-            )
+            # prepare them in background and run them one by one.
+            items = []
             for component_widget in component_widgets:
                 component = self._assembler_widget.component_list.model.data(
                     component_widget.index
                 )[0]
-                factory = component_widget.factory
-                factory.progress_widget = (
+                items.append(
+                    BatchItem(
+                        component,
+                        component_widget.definition,
+                        component_widget.factory,
+                    )
+                )
+            # Fetch the version labels for progress widget in one go
+            query_in_batches(
+                self.session,
+                'select version, asset.name, asset.parent.name, task.link '
+                'from AssetVersion where id in ({})',
+                list(
+                    set([item.component['version']['id'] for item in items])
+                ),
+            )
+            self._batch_runner = BatchRunner(
+                items,
+                self._prepare_batch_item,
+                partial(self._run_batch_item, method),
+                max_workers=1,  # Preparation session is not thread safe
+                queue_size=self.batch_prepare_queue_size,
+            )
+            # Start by preparing progress widget
+            self.progress_widget.prepare_add_steps()
+            self.progress_widget.set_status(
+                core_constants.RUNNING_STATUS, 'Initializing...'
+            )
+            for item in items:
+                item.factory.progress_widget = (
                     self.progress_widget
                 )  # Have factory update main progress widget
-                self.progress_widget.add_version(component)
-                factory.build_progress_ui(component)
-            self.progress_widget.widgets_added()
+                self.progress_widget.add_version(
+                    item.component, on_cancel=item.cancel
+                )
+                self.progress_widget.set_version_status(
+                    item.batch_id, 'Queued', cancellable=True
+                )
+                item.factory.build_progress_ui(item.component)
+            cancel_button = RemoveButton('CANCEL REMAINING')
+            cancel_button.clicked.connect(self._batch_runner.cancel)
+            self.progress_widget.widgets_added(cancel_button)
 
             self.progress_widget.show_widget()
-            failed = 0
-            for component_widget in component_widgets:
-                # Prepare progress widget
-                component = self._assembler_widget.component_list.model.data(
-                    component_widget.index
-                )[0]
-                self.progress_widget.set_status(
-                    core_constants.RUNNING_STATUS,
-                    'Loading {} / {}...'.format(
-                        str_version(component['version']), component['name']
-                    ),
+            self._set_batch_running(True)
+            try:
+                self._batch_runner.run(
+                    on_item_started=self._on_batch_item_started,
+                    on_item_finished=self._on_batch_item_finished,
                 )
-                definition = component_widget.definition
-                factory = component_widget.factory
-                factory.listen_widget_updates()
-
-                engine_type = definition['_config']['engine_type']
-                try:
-                    # Set method to importer plugins
-                    if method:
-                        for plugin in definition.get_all(
-                            category=core_constants.PLUGIN,
-                            type=core_constants.plugin._PLUGIN_IMPORTER_TYPE,
-                        ):
-                            plugin['default_method'] = method
-                    self.run_definition(definition, engine_type)
-                    # Did it go well?
-                    if factory.has_error:
-                        failed += 1
-                finally:
-                    component_widget.factory.end_widget_updates()
-
-            succeeded = len(component_widgets) - failed
+            finally:
+                self._batch_runner = None
+                self._set_batch_running(False)
+                if shiboken2.isValid(cancel_button):
+                    cancel_button.setVisible(False)
+
+            succeeded = len(
+                [
+                    item
+                    for item in items
+                    if item.status == BatchItem.STATUS_DONE
+                ]
+            )
+            failed = len(
+                [
+                    item
+                    for item in items
+                    if item.status == BatchItem.STATUS_FAILED
+                ]
+            )
+            cancelled = len(items) - succeeded - failed
             if succeeded > 0:
-                if failed == 0:
+                if failed == 0 and cancelled == 0:
                     self.progress_widget.set_status(
                         core_constants.SUCCESS_STATUS,
                         'Successfully {} {}/{} asset{}!'.format(
@@ -487,7 +553,7 @@ class QtAssemblerClientWidget(QtLoaderClient, dialog.Dialog):
                 else:
                     self.progress_widget.set_status(
                         core_constants.WARNING_STATUS,
-                        'Successfully {} {}/{} asset{}, {} failed - check logs for more information!'.format(
+                        'Successfully {} {}/{} asset{}, {} failed{} - check logs for more information!'.format(
                             'loaded'
                             if method == 'init_and_load'
                             else 'tracked',
@@ -495,9 +561,16 @@ class QtAssemblerClientWidget(QtLoaderClient, dialog.Dialog):
                             len(component_widgets),
                             's' if len(component_widgets) > 1 else '',
                             failed,
+                            ', {} cancelled'.format(cancelled)
+                            if cancelled > 0
+                            else '',
                         ),
                     )
                 self.asset_manager.asset_manager_widget.rebuild.emit()
+            elif failed == 0:
+                self.progress_widget.set_status(
+                    core_constants.WARNING_STATUS, 'Cancelled!'
+                )
             else:
                 self.progress_widget.set_status(
                     core_constants.ERROR_STATUS,
@@ -506,10 +579,127 @@ class QtAssemblerClientWidget(QtLoaderClient, dialog.Dialog):
                         's' if len(component_widgets) > 1 else '',
                     ),
                 )
+            self._apply_deferred()
+
+    def _set_batch_running(self, running):
+        '''Disable the widgets that would rebuild the assembler lists if
+        *running*, as the batch items hold the row widgets and factories.
+        Events are still processed while the batch runs.'''
+        for widget in [
+            self._tab_widget,
+            self.context_selector,
+            self.definition_selector,
+            self.host_selector,
+            self.run_button,
+            self.run_button_no_load,
+        ]:
+            widget.setEnabled(not running)
+        if not running:
+            self._asset_selection_updated()
+
+    def _apply_deferred(self):
+        '''Apply the close, context change and refresh requested while a
+        batch was running'''
+        if self._close_requested:
+            self._close_requested = False
+            self.close()
+            return
+        if self._deferred_context_id is not None:
+            context_id = self._deferred_context_id
+            self._deferred_context_id = None
+            self.on_context_changed_sync(context_id)
+        if self.hard_refresh:
+            self.refresh()
+
+    def _get_prepare_session(self):
+        '''Return the session resolving batch components, separate from
+        the client session used by the main thread. Created on first
+        use with the same credentials and location plugins.'''
+        if self._prepare_session is None:
+            self._prepare_session = ftrack_api.Session(
+                server_url=self.session.server_url,
+                api_key=self.session.api_key,
+                api_user=self.session.api_user,
+                auto_connect_event_hub=False,
+            )
+        return self._prepare_session
+
+    def _prepare_batch_item(self, item):
+        '''(Worker thread) Fetch the locations of batch *item* component
+        on the preparation session, to be merged into client session
+        before the loader runs'''
+        with self._prepare_session_lock:
+            item.prepared_component = (
+                self._get_prepare_session()
+                .query(
+                    'select name, file_type, version.id, '
+                    'component_locations, '
+                    'component_locations.location_id, '
+                    'component_locations.resource_identifier from '
+                    'Component where id is "{}"'.format(item.component['id'])
+                )
+                .one()
+            )
+
+    def _run_batch_item(self, method, item):
+        '''Run the definition of batch *item*, using load *method*. Return
+        False if it failed.'''
+        definition = item.definition
+        if item.prepared_component is not None:
+            # Have component locations cached before loader resolves path
+            try:
+                self.session.merge(item.prepared_component)
+            except Exception as e:
+                self.logger.debug(
+                    'Could not merge prepared component {}: {}'.format(
+                        item.batch_id, e
+                    )
+                )
+        item.factory.listen_widget_updates()
+        try:
+            # Set method to importer plugins
+            if method:
+                for plugin in definition.get_all(
+                    category=core_constants.PLUGIN,
+                    type=core_constants.plugin._PLUGIN_IMPORTER_TYPE,
+                ):
+                    plugin['default_method'] = method
+            self.run_definition(definition, item.engine_type)
+            # Did it go well?
+            return not item.factory.has_error
+        finally:
+            item.factory.end_widget_updates()
+
+    def _on_batch_item_started(self, item):
+        '''Batch *item* is about to run, update progress'''
+        self.progress_widget.set_status(
+            core_constants.RUNNING_STATUS,
+            'Loading {} / {}...'.format(
+                str_version(item.component['version']),
+                item.component['name'],
+            ),
+        )
+        self.progress_widget.set_version_status(item.batch_id, 'Running')
+
+    def _on_batch_item_finished(self, item):
+        '''Batch *item* is done, show time spent in each phase'''
+        if item.status == BatchItem.STATUS_CANCELLED:
+            message = 'Cancelled'
+        else:
+            message = '{} - prepare: {:.1f}s, wait: {:.1f}s, run: {:.1f}s'.format(
+                'Done' if item.status == BatchItem.STATUS_DONE else 'Failed',
+                item.timings.get(BatchItem.PHASE_PREPARE, 0),
+                item.timings.get(BatchItem.PHASE_WAIT, 0),
+                item.timings.get(BatchItem.PHASE_RUN, 0),
+            )
+        self.progress_widget.set_version_status(item.batch_id, message)
 
     def refresh(self, force_hard_refresh=False):
         if force_hard_refresh:
             self.hard_refresh = True
+        if self._batch_runner is not None:
+            # Lists are in use by batch, refresh when done
+            return
         if self.hard_refresh:
             if self._assembler_widget:
                 self._assembler_widget.rebuild()
@@ -533,6 +723,13 @@ class QtAssemblerClientWidget(QtLoaderClient, dialog.Dialog):
         self.host_connection.launch_client(qt_constants.CHANGE_CONTEXT_WIDGET)
 
     def closeEvent(self, e):
+        if self._batch_runner is not None:
+            # Batch items hold widgets deleted on close, cancel remaining
+            # items and close when the running one is done
+            self._batch_runner.cancel()
+            self._close_requested = True
+            e.ignore()
+            return
         super(QtAssemblerClientWidget, self).closeEvent(e)
         self.logger.debug('closing qt client')
         # Unsubscribe to context change events
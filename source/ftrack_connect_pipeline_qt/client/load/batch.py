@@ -0,0 +1,202 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014-2023 ftrack
+import time
+import logging
+import threading
+from concurrent import futures
+
+
+class BatchItem(object):
+    '''An asset(component) to be loaded in a batch, with its status and
+    the time spent in each phase'''
+
+    STATUS_PENDING = 'pending'
+    STATUS_PREPARED = 'prepared'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CANCELLED = 'cancelled'
+
+    PHASE_PREPARE = 'prepare'  # Resolving in worker thread
+    PHASE_WAIT = 'wait'  # Waiting for preparation to finish before run
+    PHASE_RUN = 'run'  # Running definition
+
+    @property
+    def batch_id(self):
+        '''Return the id identifying the item in progress widget, the
+        component id as several components of a version can be loaded'''
+        return self.component['id']
+
+    @property
+    def cancelled(self):
+        '''Return True if item has been cancelled'''
+        return self._cancel_event.is_set()
+
+    def __init__(self, component, definition, factory, engine_type=None):
+        '''
+        Initialise BatchItem
+
+        :param component: The component entity to load
+        :param definition: The loader definition to run
+        :param factory: The :class:`~ftrack_connect_pipeline_qt.ui.factory.assembler.AssemblerWidgetFactory` of the component
+        :param engine_type: The engine to run definition with, read from definition if not provided
+        '''
+        self.component = component
+        self.definition = definition
+        self.factory = factory
+        self.engine_type = engine_type or definition['_config']['engine_type']
+        self.status = self.STATUS_PENDING
+        self.prepared_component = None  # Resolved during preparation
+        self.timings = {}  # Seconds spent per phase
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        '''Cancel item, has no effect if already running or finished'''
+        with self._lock:
+            if self.status in [self.STATUS_PENDING, self.STATUS_PREPARED]:
+                self._cancel_event.set()
+
+    def set_prepared(self):
+        '''Mark item as prepared, unless cancelled meanwhile'''
+        with self._lock:
+            if not self.cancelled:
+                self.status = self.STATUS_PREPARED
+
+
+class BatchRunner(object):
+    '''
+    Run a batch of items in two phases. Items are prepared in background on
+    a worker pool, a bounded number of items ahead of the one running. Items
+    are then run one by one in order, in the calling (main) thread, as
+    running a definition might touch the DCC.
+    '''
+
+    MAX_WORKERS = 4  # Threads preparing items
+    QUEUE_SIZE = 16  # Items prepared ahead of the one running
+    WAIT_INTERVAL = 0.05  # Seconds between processing UI events while waiting
+
+    @property
+    def items(self):
+        '''Return the items of the batch'''
+        return self._items
+
+    @property
+    def running(self):
+        '''Return True if batch is running'''
+        return self._running
+
+    def __init__(
+        self,
+        items,
+        prepare,
+        execute,
+        max_workers=None,
+        queue_size=None,
+        process_events=None,
+    ):
+        '''
+        Initialise BatchRunner
+
+        :param items: List of :class:`BatchItem` to run
+        :param prepare: Function preparing an item, called in a worker thread
+        :param execute: Function running an item in calling thread, should return False on failure
+        :param max_workers: The number of worker threads, defaults to MAX_WORKERS
+        :param queue_size: The number of items to prepare ahead, defaults to QUEUE_SIZE
+        :param process_events: Function processing UI events while waiting, defaults to QApplication.processEvents
+        '''
+        self.logger = logging.getLogger(
+            __name__ + '.' + self.__class__.__name__
+        )
+        self._items = items
+        self._prepare = prepare
+        self._execute = execute
+        self._max_workers = max_workers or self.MAX_WORKERS
+        self._queue_size = max(1, queue_size or self.QUEUE_SIZE)
+        if process_events is None:
+            from Qt import QtWidgets
+
+            process_events = QtWidgets.QApplication.processEvents
+        self._process_events = process_events
+        self._running = False
+
+    def cancel(self):
+        '''Cancel all items not yet running'''
+        for item in self._items:
+            item.cancel()
+
+    def run(self, on_item_started=None, on_item_finished=None):
+        '''Run the batch, calling *on_item_started* before an item runs and
+        *on_item_finished* when it is done, failed or cancelled'''
+        self._running = True
+        executor = futures.ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix='batch_prepare_thread',
+        )
+        pending = {}
+        next_index = 0
+        try:
+            for index, item in enumerate(self._items):
+                # Keep queue of items being prepared filled
+                while next_index < min(
+                    len(self._items), index + self._queue_size
+                ):
+                    pending[next_index] = executor.submit(
+                        self._prepare_item, self._items[next_index]
+                    )
+                    next_index += 1
+                self._wait_item(item, pending.pop(index))
+                if item.cancelled:
+                    item.status = BatchItem.STATUS_CANCELLED
+                else:
+                    if on_item_started:
+                        on_item_started(item)
+                    self._execute_item(item)
+                if on_item_finished:
+                    on_item_finished(item)
+        finally:
+            for future in pending.values():
+                future.cancel()
+            executor.shutdown(wait=False)
+            self._running = False
+
+    def _prepare_item(self, item):
+        '''(Worker thread) Prepare *item*, unless cancelled. Failures are
+        logged, item will still run and report the error.'''
+        if item.cancelled:
+            return
+        start = time.time()
+        try:
+            self._prepare(item)
+        except Exception as e:
+            self.logger.warning(
+                'Could not prepare {}: {}'.format(item.batch_id, e)
+            )
+        item.timings[BatchItem.PHASE_PREPARE] = time.time() - start
+        item.set_prepared()
+
+    def _wait_item(self, item, future):
+        '''Wait for *item* preparation *future* to finish, processing UI
+        events meanwhile so item can be cancelled'''
+        start = time.time()
+        while not item.cancelled:
+            try:
+                future.result(timeout=self.WAIT_INTERVAL)
+                break
+            except futures.TimeoutError:
+                self._process_events()
+        item.timings[BatchItem.PHASE_WAIT] = time.time() - start
+
+    def _execute_item(self, item):
+        '''Run *item*, recording status and time spent'''
+        item.status = BatchItem.STATUS_RUNNING
+        start = time.time()
+        try:
+            succeeded = self._execute(item)
+        except Exception as e:
+            self.logger.exception(e)
+            succeeded = False
+        item.timings[BatchItem.PHASE_RUN] = time.time() - start
+        item.status = (
+            BatchItem.STATUS_DONE if succeeded else BatchItem.STATUS_FAILED
+        )
@@ -42,7 +42,9 @@ class QtLogViewerClientWidget(QtLogViewerClient, dialog.Dialog):
 
     contextChanged = QtCore.Signal(object)  # Context has changed
 
-    logItemAdded = QtCore.Signal(object)
+    logItemAdded = QtCore.Signal(object)  # A log item has been added
+
+    LOG_UPDATE_INTERVAL = 250  # Coalesce log items added within (ms)
 
     def __init__(self, event_manager, parent=None):
         '''Initialise QtLogViewerClientWidget with *event_manager*
@@ -105,9 +107,14 @@ class QtLogViewerClientWidget(QtLogViewerClient, dialog.Dialog):
 
         self.layout().addWidget(self._tab_widget)
 
+        self._log_update_timer = QtCore.QTimer(self)
+        self._log_update_timer.setSingleShot(True)
+        self._log_update_timer.setInterval(self.LOG_UPDATE_INTERVAL)
+
     def update_log_items(self):
-        '''Connect to persistent log storage and fetch records.'''
-        self._plugin_log_viewer_widget.set_log_items(self.logs)
+        '''Connect to persistent log storage and fetch records, append
+        new ones to view.'''
+        self._plugin_log_viewer_widget.update_log_items(self.logs)
 
     def post_build(self):
         '''Post Build ui method for events connections.'''
@@ -116,7 +123,8 @@ class QtLogViewerClientWidget(QtLogViewerClient, dialog.Dialog):
         self._plugin_log_viewer_widget.refresh_button.clicked.connect(
             self._refresh_ui
         )
-        self.logItemAdded.connect(self.update_log_items)
+        self.logItemAdded.connect(self._on_log_item_added_sync)
+        self._log_update_timer.timeout.connect(self._refresh_ui)
         self._tab_widget.currentChanged.connect(self._on_tab_changed)
 
         self.setWindowTitle('ftrack Log viewer')
@@ -130,7 +138,7 @@ class QtLogViewerClientWidget(QtLogViewerClient, dialog.Dialog):
 
     def on_host_changed(self, host_connection):
         '''Triggered when client has set host connection'''
-        self.update_log_items()
+        self._plugin_log_viewer_widget.set_log_items(self.logs)
 
     # Context
 
@@ -149,8 +157,14 @@ class QtLogViewerClientWidget(QtLogViewerClient, dialog.Dialog):
             self._file_log_viewer_widget.refresh_ui()
 
     def _on_log_item_added(self, log_item):
-        '''Override client function, update view.'''
-        self._refresh_ui()
+        '''Override client function, update view in main thread.'''
+        self.logItemAdded.emit(log_item)
+
+    def _on_log_item_added_sync(self, log_item):
+        '''Throttle view updates, update at most once per update interval
+        while log items are being added'''
+        if not self._log_update_timer.isActive():
+            self._log_update_timer.start()
 
     def _refresh_ui(self):
         '''
@@ -177,6 +177,8 @@ class QtOpenerClientWidget(QtOpenerClient, dialog.Dialog):
 
     def on_hosts_discovered(self, host_connections):
         '''(Override)'''
+        # Plugins might have changed
+        OpenerWidgetFactory.clear_plugin_widget_cache()
         self.host_selector.add_hosts(host_connections)
 
     def on_host_changed(self, host_connection):
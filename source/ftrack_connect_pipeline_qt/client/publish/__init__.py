@@ -183,6 +183,8 @@ class QtPublisherClientWidget(QtPublisherClient, QtWidgets.QFrame):
 
     def on_hosts_discovered(self, host_connections):
         '''(Override)'''
+        # Plugins might have changed
+        PublisherWidgetFactory.clear_plugin_widget_cache()
         self.host_selector.add_hosts(host_connections)
 
     def on_host_changed(self, host_connection):
@@ -1,26 +1,32 @@
 # :coding: utf-8
 # :copyright: Copyright (c) 2014-2023 ftrack
 import os
+import time
+import threading
+import weakref
 
 from functools import partial
 
 from Qt import QtCore, QtWidgets
+import shiboken2
 
 import ftrack_connect_pipeline.constants as core_constants
 from ftrack_connect_pipeline.client import constants
 from ftrack_connect_pipeline_qt.ui.utility.widget.thumbnail import (
     Context,
+    get_fetched_thumbnail_id,
 )
 from ftrack_connect_pipeline.utils import str_version
 from ftrack_connect_pipeline_qt.utils import (
     BaseThread,
     center_widget,
     set_property,
-    clear_layout,
+    query_in_batches,
 )
 from ftrack_connect_pipeline_qt.ui.utility.widget.entity_browser import (
     EntityBrowser,
 )
+from ftrack_connect_pipeline_qt.ui.utility.search_index import SearchIndex
 
 from ftrack_connect_pipeline_qt.ui.assembler.base import (
     AssemblerBaseWidget,
@@ -32,6 +38,167 @@ from ftrack_connect_pipeline_qt.ui.assembler.base import (
 from ftrack_connect_pipeline_qt.ui.utility.widget import dialog
 
 
+class DependencyResolveCache(object):
+    '''
+    Session scoped cache of the versions resolved as dependencies of a
+    context, per context id and linked only option. Entries expire after
+    TTL seconds or when invalidated.
+    '''
+
+    TTL = 300  # Seconds before dependencies has to be resolved again
+
+    _caches = weakref.WeakKeyDictionary()  # Cache per session
+    _caches_lock = threading.Lock()
+
+    @classmethod
+    def get_cache(cls, session):
+        '''Return the dependency resolve cache for *session*'''
+        with cls._caches_lock:
+            cache = cls._caches.get(session)
+            if cache is None:
+                cache = cls._caches[session] = cls()
+            return cache
+
+    def __init__(self):
+        '''Initialise DependencyResolveCache'''
+        self._lock = threading.Lock()
+        self._entries = {}  # (context id, linked only) -> (time, result)
+
+    def get(self, context_id, linked_only):
+        '''Return the cached tuple of resolved versions and user message
+        for *context_id* and *linked_only*, None if not cached.'''
+        key = (context_id, linked_only)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.TTL:
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def store(self, context_id, linked_only, versions, user_message=None):
+        '''Cache resolved *versions* and *user_message* for *context_id*
+        and *linked_only*'''
+        with self._lock:
+            self._entries[(context_id, linked_only)] = (
+                time.time(),
+                (versions, user_message),
+            )
+
+    def invalidate(self, context_id=None):
+        '''Forget the dependencies resolved for *context_id*, or all if
+        None'''
+        with self._lock:
+            for key in list(self._entries.keys()):
+                if context_id is None or key[0] == context_id:
+                    del self._entries[key]
+
+
+class VersionComponentMap(object):
+    '''
+    The versions of browsed assets and the components of each version,
+    fetched in bulk in background for the rows listed. Lets the version
+    selector list versions, and a version change find the matching
+    component, without querying. The attributes displayed by a row and the
+    component locations are fetched along.
+    '''
+
+    def __init__(self, session):
+        '''Initialise VersionComponentMap'''
+        self._session = session
+        self._lock = threading.Lock()
+        self._generation = 0  # Bumped on clear, discards pending fetches
+        self._pending = set()  # Asset ids being fetched
+        self._versions = {}  # asset id -> versions, latest first
+        self._version_by_id = {}  # version id -> version
+        self._components = {}  # version id -> {component name: component}
+
+    def clear(self):
+        '''Forget all versions, ongoing fetches are discarded'''
+        with self._lock:
+            self._generation += 1
+            self._pending = set()
+            self._versions = {}
+            self._version_by_id = {}
+            self._components = {}
+
+    def fetch(self, asset_ids):
+        '''(Background thread) Fetch the versions of *asset_ids* not
+        already mapped, with their components, in one batched query'''
+        with self._lock:
+            generation = self._generation
+            asset_ids = [
+                asset_id
+                for asset_id in set(asset_ids)
+                if asset_id
+                and not asset_id in self._versions
+                and not asset_id in self._pending
+            ]
+            self._pending.update(asset_ids)
+        if len(asset_ids) == 0:
+            return
+        versions_by_asset = dict((asset_id, []) for asset_id in asset_ids)
+        version_by_id = {}
+        components = {}
+        try:
+            for version in query_in_batches(
+                self._session,
+                'select id, version, asset_id, task_id, is_latest_version, '
+                'date, comment, asset.id, asset.name, task.link, task.name, '
+                'status.id, status.name, user.first_name, user.last_name, '
+                'components.id, components.name, components.file_type, '
+                'components.version.id, '
+                'components.component_locations.location_id '
+                'from AssetVersion where asset_id in ({})',
+                asset_ids,
+            ):
+                versions_by_asset[version['asset_id']].append(version)
+                version_by_id[version['id']] = version
+                components[version['id']] = dict(
+                    (component['name'], component)
+                    for component in version['components']
+                )
+        finally:
+            with self._lock:
+                if generation == self._generation:
+                    self._pending.difference_update(asset_ids)
+        for versions in versions_by_asset.values():
+            versions.sort(key=lambda version: -version['version'])
+        with self._lock:
+            if generation == self._generation:
+                self._versions.update(versions_by_asset)
+                self._version_by_id.update(version_by_id)
+                self._components.update(components)
+
+    def get_versions(self, asset_id, context_id=None):
+        '''Return the versions of *asset_id*, latest first, optionally
+        published on *context_id*. None if not fetched yet.'''
+        with self._lock:
+            versions = self._versions.get(asset_id)
+        if versions is None:
+            return None
+        if context_id is None:
+            return list(versions)
+        return [
+            version for version in versions if version['task_id'] == context_id
+        ]
+
+    def get_version(self, version_id):
+        '''Return the fetched version having *version_id*, None if not
+        fetched'''
+        with self._lock:
+            return self._version_by_id.get(version_id)
+
+    def get_component(self, version_id, component_name):
+        '''Return the component named *component_name* of *version_id*,
+        None if version has no such component or has not been fetched'''
+        with self._lock:
+            return (self._components.get(version_id) or {}).get(
+                component_name
+            )
+
+
 class AssemblerDependenciesWidget(AssemblerBaseWidget):
     '''Dependencies widget'''
 
@@ -39,14 +206,19 @@ class AssemblerDependenciesWidget(AssemblerBaseWidget):
         object, object, object
     )  # Emitted when an error/warning message needs to be displayed
     dependenciesResolved = QtCore.Signal(
-        object
-    )  # Emitted from background thread when components has been extracted
+        object, object
+    )  # Emitted from background thread for each batch of components extracted
 
     @property
     def linked_only(self):
         '''Return True if user has chosen to return linked dependencies only'''
         return self._cb_linked_only.isChecked()
 
+    @property
+    def dependency_resolve_cache(self):
+        '''Return the :class:`DependencyResolveCache` of the session'''
+        return DependencyResolveCache.get_cache(self.session)
+
     def __init__(self, client):
         '''
         Instantiate the dependencies widget
@@ -58,7 +230,7 @@ class AssemblerDependenciesWidget(AssemblerBaseWidget):
     def post_build(self):
         '''(Override)'''
         super(AssemblerDependenciesWidget, self).post_build()
-        self._rebuild_button.clicked.connect(self.rebuild)
+        self._rebuild_button.clicked.connect(self._on_sync)
         self.dependenciesResolved.connect(self._on_dependencies_resolved)
         self.dependencyResolveWarning.connect(
             self._on_dependency_resolve_warning
@@ -75,10 +247,32 @@ class AssemblerDependenciesWidget(AssemblerBaseWidget):
         self._cb_linked_only.setChecked(True)
         return self._cb_linked_only
 
+    def _on_sync(self):
+        '''Sync button clicked, resolve dependencies again'''
+        self.dependency_resolve_cache.invalidate(self.client.context_id)
+        self.rebuild()
+
     def rebuild(self, reset=True):
-        '''(Override) Resolve dependencies in separate thread'''
+        '''(Override) Resolve dependencies in separate thread, or extract
+        loadable components from the versions previously resolved for
+        context'''
         if super(AssemblerDependenciesWidget, self).rebuild():
             self.scroll.setWidget(QtWidgets.QLabel(''))
+            self._component_list = None
+            cancel_token = self._cancel_token
+
+            cached = self.dependency_resolve_cache.get(
+                self.client.context_id, self.linked_only
+            )
+            if cached is not None:
+                # Only matching against loaders needs to be done
+                thread = BaseThread(
+                    name='extract_components_thread',
+                    target=self._on_versions_resolved,
+                    target_args=list(cached) + [cancel_token],
+                )
+                thread.start()
+                return
 
             # Resolve version this context is depending on in separate thread
             thread = BaseThread(
@@ -89,63 +283,87 @@ class AssemblerDependenciesWidget(AssemblerBaseWidget):
                     {'linked_only': False}
                     if self.linked_only is False
                     else None,
+                    cancel_token,
                 ],
             )
             thread.start()
 
-    def _resolve_dependencies(self, context_id, options):
+    def _resolve_dependencies(self, context_id, options, cancel_token):
         '''(Background thread) Resolve dependencies from ftrack'''
         try:
             return self.client.asset_manager.resolve_dependencies(
                 context_id,
-                self._on_dependencies_resolved_async,
+                partial(
+                    self._on_dependencies_resolved_async,
+                    context_id,
+                    options is None,
+                    cancel_token,
+                ),
                 options=options,
             )
         except Exception as e:
             self.dependencyResolveWarning.emit(True, str(e), 'Error')
             raise
 
-    def _on_dependencies_resolved_async(self, result):
-        '''(Background thread) Process the resolved dependencies based on what we can load'''
+    def _on_dependencies_resolved_async(
+        self, context_id, linked_only, cancel_token, result
+    ):
+        '''(Background thread) Cache the dependencies resolved for
+        *context_id* and *linked_only*, then process them based on what we
+        can load'''
+        try:
+            resolved_versions = None
+            user_message = None
+            if isinstance(result, dict):
+                # Versions without a user message
+                resolved_versions = result['versions']
+            else:
+                if isinstance(result, tuple):
+                    # With user message?
+                    if isinstance(result[0], dict):
+                        resolved_versions = result[0].get('versions') or []
+                    if isinstance(result[1], dict):
+                        user_data = result[1]
+                        if 'message' in user_data:
+                            user_message = user_data['message']
+            versions = [
+                resolved_version['entity']
+                for resolved_version in resolved_versions or []
+            ]
+        except:
+            self.stopBusyIndicator.emit()
+            self.loadError.emit('An internal exception occurred')
+            raise
+        self.dependency_resolve_cache.store(
+            context_id, linked_only, versions, user_message
+        )
+        self._on_versions_resolved(versions, user_message, cancel_token)
+
+    def _on_versions_resolved(self, versions, user_message, cancel_token):
+        '''(Background thread) Extract the components of resolved
+        *versions* that can be loaded, streaming them in batches until
+        *cancel_token* is set'''
         try:
             try:
                 if (
-                    self.client.assemble_mode
+                    cancel_token.is_set()
+                    or self.client.assemble_mode
                     != self.client.ASSEMBLE_MODE_DEPENDENCIES
                 ):
                     return
 
-                resolved_versions = None
-                user_message = None
-                if isinstance(result, dict):
-                    # Versions without a user message
-                    resolved_versions = result['versions']
-                else:
-                    if isinstance(result, tuple):
-                        # With user message?
-                        if isinstance(result[0], dict):
-                            resolved_version = result[0].get('versions') or []
-                        if isinstance(result[1], dict):
-                            user_data = result[1]
-                            if 'message' in user_data:
-                                user_message = user_data['message']
                 if user_message:
                     self.dependencyResolveWarning.emit(
                         True, user_message, 'Error'
                     )
 
-                if len(resolved_versions or []) == 0:
+                if len(versions) == 0:
                     if user_message is None:
                         self.dependencyResolveWarning.emit(
                             False, 'No dependencies found!', 'No assets found'
                         )
                     return
 
-                versions = [
-                    resolved_version['entity']
-                    for resolved_version in resolved_versions
-                ]
-
                 # Process versions, filter against
                 self.logger.info(
                     'Resolved versions: {}'.format(
@@ -155,23 +373,24 @@ class AssemblerDependenciesWidget(AssemblerBaseWidget):
                     )
                 )
 
-                components = self.extract_components(versions)
-
-                if (
-                    self.client.assemble_mode
-                    != self.client.ASSEMBLE_MODE_DEPENDENCIES
+                found = False
+                for components in self.iter_components(
+                    versions, cancel_token=cancel_token
                 ):
-                    return
-
-                if len(components) == 0:
+                    if (
+                        self.client.assemble_mode
+                        != self.client.ASSEMBLE_MODE_DEPENDENCIES
+                    ):
+                        return
+                    self.dependenciesResolved.emit(cancel_token, components)
+                    found = True
+
+                if not found and not cancel_token.is_set():
                     self.dependencyResolveWarning.emit(
                         False,
                         'No loadable dependencies found!',
                         'No loadable dependencies found.',
                     )
-                    return
-
-                self.dependenciesResolved.emit(components)
             finally:
                 self.stopBusyIndicator.emit()
         except RuntimeError as re:
@@ -199,18 +418,26 @@ class AssemblerDependenciesWidget(AssemblerBaseWidget):
         self.client.run_button_no_load.setEnabled(self.loadable_count > 0)
         self.client.run_button.setEnabled(self.loadable_count > 0)
 
-    def _on_dependencies_resolved(self, components):
-        '''Create and deploy list of resolved components'''
-        # Create component list
-        self._component_list = DependenciesListWidget(self)
-        self.listWidgetCreated.emit(self._component_list)
-        # self._asset_list.setStyleSheet('background-color: blue;')
+    def _on_dependencies_resolved(self, cancel_token, components):
+        '''Add a batch of resolved *components* to list, created and
+        deployed on first batch. Discarded if extraction has been cancelled
+        by *cancel_token*.'''
+        if cancel_token is not self._cancel_token or cancel_token.is_set():
+            return
+        if self._component_list is None:
+            # Create component list
+            self._component_list = DependenciesListWidget(self)
+            self._component_list.on_search(self._search.text)
+            self.listWidgetCreated.emit(self._component_list)
+            # self._asset_list.setStyleSheet('background-color: blue;')
 
-        self.scroll.setWidget(self._component_list)
+            self.scroll.setWidget(self._component_list)
 
-        # Will trigger list to be rebuilt.
-        self.model.insertRows(0, components)
+        # Will trigger rows to be appended to list.
+        self.model.insertRows(self.model.rowCount(), components)
 
+        self.client.run_button_no_load.setEnabled(self.loadable_count > 0)
+        self.client.run_button.setEnabled(self.loadable_count > 0)
         self._label_info.setText(
             'Listing {} {}'.format(
                 self.model.rowCount(),
@@ -222,6 +449,9 @@ class AssemblerDependenciesWidget(AssemblerBaseWidget):
 class AssemblerBrowserWidget(AssemblerBaseWidget):
     '''Widget driving manual user browse of assets (components)'''
 
+    componentsExtracted = QtCore.Signal(
+        object, object
+    )  # Emitted from background thread for each batch of components extracted
     componentsFetched = QtCore.Signal(
         object, object
     )  # Emitted when a new chunk of versions has been loaded
@@ -231,6 +461,14 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
     allVersionsFetched = (
         QtCore.Signal()
     )  # Emitted when all versions has been fetched
+    versionComponentResolved = QtCore.Signal(
+        object, object, object, object
+    )  # Emitted from background thread when a version change has been resolved
+
+    @property
+    def version_map(self):
+        '''Return the :class:`VersionComponentMap` of listed assets'''
+        return self._version_map
 
     @property
     def context_path(self):
@@ -253,6 +491,15 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
         :param client:  :class:`~ftrack_connect_pipeline_qt.client.load.QtAssemblerWidget` instance
         '''
         self._component_list = None
+        self._version_map = VersionComponentMap(client.session)
+        self._version_requests = {}  # Row widget -> version id resolved
+        self._query_terms = []
+        self._query_filter = None
+        self._all_versions_fetched = False
+        self._fetching = False
+        self._fetched_pages = []  # Versions fetched per chunk, for re-match
+        # Fetched component id -> (component, availability) chosen by user
+        self._switched_components = {}
         super(AssemblerBrowserWidget, self).__init__(client)
         self._cached_context_path_id = None
 
@@ -280,9 +527,16 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
         super(AssemblerBrowserWidget, self).post_build()
         self._rebuild_button.clicked.connect(self.rebuild)
         self._entity_browser.entityChanged.connect(self.rebuild)
+        self.componentsExtracted.connect(self._on_components_extracted)
         self.componentsFetched.connect(self._on_components_fetched)
         self.allVersionsFetched.connect(self._on_all_versions_fetched)
+        self.versionComponentResolved.connect(
+            self._on_version_component_resolved
+        )
         self._search.inputUpdated.connect(self._on_search)
+        self.scroll.verticalScrollBar().valueChanged.connect(
+            self._on_scrolled
+        )
 
     def rebuild(self, reset=True):
         '''(Override) Fetch assets beneath the current context, start on new query'''
@@ -291,6 +545,9 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
                 # First time set
                 self._entity_browser.entity = self.client.context
 
+            self._version_map.clear()
+            self._version_requests = {}
+
             # Create viewport widget, component list with load more button
             widget = QtWidgets.QWidget()
             widget.setLayout(QtWidgets.QVBoxLayout())
@@ -301,6 +558,7 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
             self._component_list.versionChanged.connect(
                 self._on_version_changed
             )
+            self._component_list.on_search(self._search.text)
             self.listWidgetCreated.emit(self._component_list)
 
             widget.layout().addWidget(self._component_list)
@@ -318,14 +576,27 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
 
             # Find version beneath browsed entity, in chunks
             self._limit = self.client.asset_fetch_chunk_size
-            self._tail = 0  # The current fetch position
-            self.fetched_version_ids = []
+            self._cursor = None  # The id of the last fetched version
+            self._prefetch = None
+            self._all_versions_fetched = False
+            self._fetching = True
+            self._fetched_pages = []
+            self._switched_components = {}
+            self.fetched_version_ids = set()
             self._recent_context_browsed = context
+            # Have server filter on search and loadable versions
+            self._query_terms = SearchIndex.get_terms(self._search.text)
+            self._query_filter = self._get_query_filter(self._query_terms)
 
             thread = BaseThread(
                 name='fetch_browsed_assets_thread',
                 target=self._fetch_versions_async,
-                target_args=[context],
+                target_args=[
+                    context,
+                    self._cursor,
+                    self._query_filter,
+                    self._cancel_token,
+                ],
             )
             thread.start()
 
@@ -337,38 +608,150 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
         '''Continue previous query and fetch more assets'''
         self._fetch_more_button.setVisible(False)
         if super(AssemblerBrowserWidget, self).rebuild(reset=False):
-            self._tail += self._limit
+            self._fetching = True
             context = self._entity_browser.entity
             thread = BaseThread(
                 name='fetch_more_browsed_assets_thread',
                 target=self._fetch_versions_async,
-                target_args=[context],
+                target_args=[
+                    context,
+                    self._cursor,
+                    self._query_filter,
+                    self._cancel_token,
+                ],
             )
             thread.start()
 
-    def _fetch_versions_async(self, context):
-        '''(Background thread) Search ftrack for versions beneath the given *context_id*'''
+    def _on_scrolled(self, value):
+        '''Fetch more assets when user has scrolled to the end of list, if
+        prefetch is enabled'''
+        if (
+            self.client.asset_fetch_prefetch
+            and value == self.scroll.verticalScrollBar().maximum()
+            and self._component_list is not None
+            and shiboken2.isValid(self._fetch_more_button)
+            and self._fetch_more_button.isVisible()
+        ):
+            self._fetch_more()
+
+    def _get_query_filter(self, terms):
+        '''Return the predicates narrowing the browse query to versions
+        matching all search *terms* on asset name, component name or task
+        path. Unless all assets are shown, also to versions having a
+        component with a file format loadable for the asset type.'''
+        predicates = []
+        for term in terms:
+            term = term.replace('"', '').replace('\\', '')
+            if len(term) == 0:
+                continue
+            predicates.append(
+                '(asset.name like "%{0}%" or components any (name like '
+                '"%{0}%") or task.name like "%{0}%" or task.ancestors any '
+                '(name like "%{0}%") or task.project.name like "%{0}%")'.format(
+                    term
+                )
+            )
+        if not self.show_non_compatible_assets:
+            (_, by_extension) = self._get_definition_index(
+                self.client.definition_selector.definitions
+            )
+            file_formats = {}
+            for asset_type_name_short, file_format in by_extension.keys():
+                file_formats.setdefault(asset_type_name_short, set()).add(
+                    file_format
+                )
+            loadable = [
+                '(asset.type.short is "{}" and components any '
+                '(file_type in ({})))'.format(
+                    asset_type_name_short,
+                    ','.join(
+                        '"{}"'.format(file_format)
+                        for file_format in sorted(
+                            file_formats[asset_type_name_short]
+                        )
+                    ),
+                )
+                for asset_type_name_short in sorted(file_formats.keys())
+            ]
+            if len(loadable) > 0:
+                predicates.append('({})'.format(' or '.join(loadable)))
+        return ''.join([' and {}'.format(p) for p in predicates])
+
+    def _query_versions(self, context, cursor, query_filter):
+        '''(Background thread) Query the chunk of versions beneath *context*
+        following version id *cursor*, ordered by id, narrowed by
+        *query_filter*'''
+        return self.session.query(
+            'select components.name,components.file_type,id,version,date,comment,is_latest_version,thumbnail_url,'
+            'asset.id,asset.name,asset.parent.id,asset.type.id,asset.type.short,task.link,task.name,status.id,status.name,user.id '
+            'from AssetVersion where is_latest_version=true and ('
+            'asset.context_id in ('
+            'select id from TypedContext where ancestors.id is "{0}"'
+            ') or '
+            'asset.context_id is "{0}" or '
+            'asset.project_id is "{0}" or '
+            'task_id is "{0}"'
+            '){1}{3} order by id ascending limit {2}'.format(
+                context['id'],
+                ' and id > "{}"'.format(cursor) if cursor else '',
+                self._limit,
+                query_filter,
+            )
+        ).all()
+
+    def _prefetch_versions_async(self, prefetch):
+        '''(Background thread) Fetch the next chunk of versions ahead of
+        user request, as described by *prefetch*'''
+        try:
+            prefetch['versions'] = self._query_versions(
+                prefetch['context'],
+                prefetch['cursor'],
+                prefetch['query_filter'],
+            )
+        except Exception as e:
+            self.logger.warning('Could not prefetch versions: {}'.format(e))
+        finally:
+            prefetch['done'].set()
+
+    def _is_browse_stale(self, context, query_filter, cancel_token):
+        '''Return True if fetch of versions beneath *context* matching
+        *query_filter* is not valid anymore - cancelled by *cancel_token*,
+        user has browsed to another context, changed search or mode'''
+        return (
+            cancel_token.is_set()
+            or self._recent_context_browsed != context
+            or self._query_filter != query_filter
+            or self.client.assemble_mode != self.client.ASSEMBLE_MODE_BROWSE
+        )
+
+    def _fetch_versions_async(
+        self, context, cursor, query_filter, cancel_token
+    ):
+        '''(Background thread) Search ftrack for versions beneath the given
+        *context*, following version id *cursor* and matching
+        *query_filter*. Components are streamed in batches until
+        *cancel_token* is set.'''
         try:
             self.logger.info(
-                'Fetching versions beneath context: {0} [{1}-{2}]'.format(
-                    context, self._tail, self._tail + self._limit - 1
+                'Fetching versions beneath context: {0} [{1}-]'.format(
+                    context, cursor or ''
                 )
             )
-            versions = []
-            for version in self.session.query(
-                'select components.name,components.file_type,id,version,date,comment,is_latest_version,thumbnail_url,'
-                'asset.id,asset.name,asset.type.id,task.link,task.name,status.id,status.name,user.id '
-                'from AssetVersion where is_latest_version=true and ('
-                'asset.context_id in ('
-                'select id from TypedContext where ancestors.id is "{0}"'
-                ') or '
-                'asset.context_id is "{0}" or '
-                'asset.project_id is "{0}" or '
-                'task_id is "{0}"'
-                ') offset {1} limit {2}'.format(
-                    context['id'], self._tail, self._limit
-                )
+            chunk = None
+            prefetch = self._prefetch
+            if (
+                prefetch
+                and prefetch['context']['id'] == context['id']
+                and prefetch['cursor'] == cursor
+                and prefetch['query_filter'] == query_filter
             ):
+                # Chunk has been, or is being, prefetched
+                prefetch['done'].wait()
+                chunk = prefetch['versions']
+            if chunk is None:
+                chunk = self._query_versions(context, cursor, query_filter)
+            versions = []
+            for version in chunk:
                 if not version['id'] in self.fetched_version_ids:
                     self.logger.debug(
                         'Got version: {}_v{}({})'.format(
@@ -378,28 +761,46 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
                         )
                     )
                     versions.append(version)
-                    self.fetched_version_ids.append(version['id'])
+                    self.fetched_version_ids.add(version['id'])
 
-            if (
-                self._recent_context_browsed != context
-                or self.client.assemble_mode
-                != self.client.ASSEMBLE_MODE_BROWSE
-            ):
+            if self._is_browse_stale(context, query_filter, cancel_token):
                 # User is fast, have already traveled to a new context or switched mode
                 return
 
-            if len(versions) > 0:
-                components = self.extract_components(versions)
+            if len(chunk) > 0:
+                self._cursor = chunk[-1]['id']
+
+            if len(chunk) == self._limit and self.client.asset_fetch_prefetch:
+                # Fetch next chunk while this one is being rendered
+                self._prefetch = {
+                    'context': context,
+                    'cursor': self._cursor,
+                    'query_filter': query_filter,
+                    'versions': None,
+                    'done': threading.Event(),
+                }
+                thread = BaseThread(
+                    name='prefetch_browsed_assets_thread',
+                    target=self._prefetch_versions_async,
+                    target_args=[self._prefetch],
+                )
+                thread.start()
 
-                if (
-                    self._recent_context_browsed != context
-                    or self.client.assemble_mode
-                    != self.client.ASSEMBLE_MODE_BROWSE
+            if len(versions) > 0:
+                for components in self.iter_components(
+                    versions, cancel_token=cancel_token
                 ):
-                    # User is fast, have already traveled to a new context
+                    if self._is_browse_stale(
+                        context, query_filter, cancel_token
+                    ):
+                        # User is fast, have already traveled to a new context
+                        return
+                    self.componentsExtracted.emit(cancel_token, components)
+
+                if self._is_browse_stale(context, query_filter, cancel_token):
                     return
 
-                self.componentsFetched.emit(components, len(versions))
+                self.componentsFetched.emit(versions, len(chunk))
             else:
                 # We are done
                 self.allVersionsFetched.emit()
@@ -413,16 +814,51 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
             self.loadError.emit('An internal exception occurred')
             raise
 
-    def _on_components_fetched(self, components, version_count):
-        '''A chunk of versions has been obtained'''
+    def _on_components_fetched(self, versions, version_count):
+        '''A chunk of versions has been obtained and its components
+        extracted'''
+        self._fetching = False
+        self._fetched_pages.append(versions)
         self.stopBusyIndicator.emit()
-        # Add components to model, will trigger list to be rebuilt.
-        self.model.insertRows(self.model.rowCount(), components)
         self._fetch_more_button.setVisible(version_count == self._limit)
+        self._all_versions_fetched = version_count < self._limit
+        self.update()
+
+    def _on_components_extracted(self, cancel_token, components):
+        '''A batch of *components* has been extracted from the chunk being
+        fetched, discarded if cancelled by *cancel_token*'''
+        if cancel_token is not self._cancel_token or cancel_token.is_set():
+            return
+        # Add components to model, will trigger rows to be added to list.
+        self.model.insertRows(self.model.rowCount(), components)
         self.update()
+        # Have versions ready for the version selectors of the new rows
+        thread = BaseThread(
+            name='prefetch_version_map_thread',
+            target=self._prefetch_version_map_async,
+            target_args=[
+                [
+                    component['version']['asset']['id']
+                    for component, _, _ in components
+                ]
+            ],
+        )
+        thread.start()
+
+    def _prefetch_version_map_async(self, asset_ids):
+        '''(Background thread) Fetch versions and components of
+        *asset_ids* into the version map'''
+        try:
+            self._version_map.fetch(asset_ids)
+        except Exception as e:
+            self.logger.warning(
+                'Could not prefetch asset versions: {}'.format(e)
+            )
 
     def _on_all_versions_fetched(self):
         '''No more versions to fetch'''
+        self._all_versions_fetched = True
+        self._fetching = False
         self.stopBusyIndicator.emit()
         self.update()
         if self.model.rowCount() == 0:
@@ -433,6 +869,55 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
             self.scroll.setWidget(center_widget(l))
             self._label_info.setText('No assets found')
 
+    def _on_match_changed(self):
+        '''(Override) Match the versions already fetched again instead of
+        querying, if they cover the new match settings. The list is updated
+        with the difference, keeping scroll position and selection.'''
+        query_filter = self._get_query_filter(self._query_terms)
+        if (
+            self._component_list is None
+            or not shiboken2.isValid(self._component_list)
+            or self._fetching
+            or self._query_filter is None
+            or not query_filter.startswith(self._query_filter)
+        ):
+            # Fetch needed, fetched versions are not covering all assets
+            self.rebuild()
+            return
+        self._query_filter = query_filter
+        self._prefetch = None  # Was made with previous filter
+        availabilities = dict(
+            (component['id'], availability)
+            for (component, _, availability) in self.model.items()
+        )
+        self._loadable_count = 0
+        components = []
+        for versions in self._fetched_pages:
+            # Per chunk, to keep the order of rows
+            components.extend(
+                self.extract_components(
+                    versions, availabilities=availabilities
+                )
+            )
+        # Keep the versions chosen by user
+        for index, (component, definitions, availability) in enumerate(
+            components
+        ):
+            if component['id'] in self._switched_components:
+                (component, availability) = self._switched_components[
+                    component['id']
+                ]
+                self._set_definitions_version(
+                    definitions, component['version']
+                )
+                components[index] = (component, definitions, availability)
+        self.model.reconcile(
+            components, key=lambda component_data: component_data[0]['id']
+        )
+        self.update()
+        if self.model.rowCount() == 0 and self._all_versions_fetched:
+            self._on_all_versions_fetched()
+
     def update(self):
         '''Update UI on new fetched components'''
         super(AssemblerBrowserWidget, self).update()
@@ -450,27 +935,145 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
         self.client.run_button.setEnabled(self._loadable_count > 0)
 
     def _on_search(self, text):
-        '''Filter list on free text search'''
-        if self._component_list:
-            self._component_list.on_search(text)
+        '''Filter list on free text search, query server again unless the
+        search has been narrowed and all matching versions are already
+        fetched'''
+        if not self._component_list:
+            return
+        self._component_list.on_search(text)
+        terms = SearchIndex.get_terms(text)
+        if self._get_query_filter(terms) == self._query_filter:
+            return
+        if self._all_versions_fetched and self._terms_narrows(
+            self._query_terms, terms
+        ):
+            # Filtering the fetched versions locally is enough
+            return
+        self.rebuild()
+
+    @staticmethod
+    def _terms_narrows(terms, new_terms):
+        '''Return True if versions matching *new_terms* on server is a
+        subset of those matching *terms*'''
+        for term in terms:
+            if not any(new_term.find(term) > -1 for new_term in new_terms):
+                return False
+        return True
+
+    def _get_fetched_component_id(self, component_id):
+        '''Return the id of the fetched component that has been switched
+        by user to component having *component_id*'''
+        for fetched_id, (component, _) in self._switched_components.items():
+            if component['id'] == component_id:
+                return fetched_id
+        return component_id
+
+    @staticmethod
+    def _set_definitions_version(definitions, version_entity):
+        '''Have importer of *definitions* load *version_entity*'''
+        for definition in definitions:
+            for plugin in definition.get_all(
+                type=core_constants.CONTEXT,
+                category=core_constants.PLUGIN,
+            ):
+                if 'options' in plugin:
+                    options = plugin['options']
+                    options['version_id'] = version_entity['id']
+                    options['version_number'] = version_entity['version']
 
     def _on_version_changed(self, widget, version_id):
-        '''User request a change of version, check that the new version
-        has the component and it matches.'''
-        version_entity = self.client.session.query(
-            'AssetVersion where id={}'.format(version_id)
-        ).one()
-        current_component = self.client.session.query(
-            'Component where id={}'.format(widget.component_id)
-        ).one()
-        component = self.client.session.query(
-            'Component where version.id={} and name={}'.format(
-                version_entity['id'], current_component['name']
-            )
-        ).first()
+        '''User request a change of version, check in background that the
+        new version has the component and it matches.'''
+        current_component = self.model.data(widget.index)[0]
+        self._version_requests[widget] = version_id
+        thread = BaseThread(
+            name='resolve_version_component_thread',
+            target=self._resolve_version_component_async,
+            target_args=[widget, current_component, version_id],
+        )
+        thread.start()
+
+    def _resolve_version_component_async(
+        self, widget, current_component, version_id
+    ):
+        '''(Background thread) Find the component of *version_id* named as
+        *current_component*, together with attributes displayed and its
+        availability. Taken from the version map if prefetched, queried
+        otherwise.'''
+        version_entity = component = availability = None
+        try:
+            version_entity = self._version_map.get_version(version_id)
+            if version_entity is not None:
+                component = self._version_map.get_component(
+                    version_id, current_component['name']
+                )
+                if component is not None:
+                    availability = self._get_mapped_availability(
+                        self.session.pick_location(), component
+                    )
+            else:
+                # Not prefetched yet
+                version_entity = self.session.query(
+                    'select version from AssetVersion where id is "{}"'.format(
+                        version_id
+                    )
+                ).one()
+                component = self.session.query(
+                    'select name,file_type,version.id,version.version,'
+                    'version.date,version.comment,version.is_latest_version,'
+                    'version.asset.id,version.asset.name,version.task.link,'
+                    'version.task.name,version.status.id,version.status.name,'
+                    'version.user.first_name,version.user.last_name '
+                    'from Component where version.id is "{}" and '
+                    'name is "{}"'.format(
+                        version_id, current_component['name']
+                    )
+                ).first()
+                if component is not None:
+                    location = self.session.pick_location()
+                    availability = location.get_component_availability(
+                        component
+                    )
+        except Exception as e:
+            self.logger.exception(e)
+        self.versionComponentResolved.emit(
+            widget,
+            current_component,
+            version_id,
+            (version_entity, component, availability),
+        )
+
+    @staticmethod
+    def _get_mapped_availability(location, component):
+        '''Return the availability in *location* of *component* from the
+        version map. A file component is available if it has a component
+        location there, the member availability of container components is
+        queried.'''
+        if component.entity_type != 'FileComponent':
+            return location.get_component_availability(component)
+        for component_location in component['component_locations']:
+            if component_location['location_id'] == location['id']:
+                return 100.0
+        return 0.0
+
+    def _on_version_component_resolved(
+        self, widget, current_component, version_id, result
+    ):
+        '''The component of *version_id* has been resolved as *result*,
+        set it or tell user and revert version of *widget*'''
+        if not shiboken2.isValid(widget):
+            # List has been rebuilt
+            return
+        if self._version_requests.get(widget) != version_id:
+            # User has already chosen another version
+            return
+        del self._version_requests[widget]
+        (version_entity, component, availability) = result
         # Has the same component name?
         error_message = None
-        if component is None:
+        if version_entity is None:
+            error_message = 'Could not change version, please try again!'
+        elif component is None:
             error_message = (
                 'There is no component by the name {} at version {}!'.format(
                     current_component['name'], version_entity['version']
@@ -480,22 +1083,24 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
             # Set the new component
             matching_definitions = self.model.data(widget.index)[1]
             # Replace version ID for importer
-            for definition in matching_definitions:
-                for plugin in definition.get_all(
-                    type=core_constants.CONTEXT,
-                    category=core_constants.PLUGIN,
-                ):
-                    if 'options' in plugin:
-                        options = plugin['options']
-                        options['version_id'] = version_entity['id']
-                        options['version_number'] = version_entity['version']
-            location = self.session.pick_location()
+            self._set_definitions_version(matching_definitions, version_entity)
+            # Remember the switch, to survive a re-match
+            fetched_id = self._get_fetched_component_id(
+                current_component['id']
+            )
+            if component['id'] == fetched_id:
+                self._switched_components.pop(fetched_id, None)
+            else:
+                self._switched_components[fetched_id] = (
+                    component,
+                    availability,
+                )
             self.model.setData(
                 widget.index,
                 (
                     component,
                     matching_definitions,
-                    location.get_component_availability(component),
+                    availability,
                 ),
             )
         else:
@@ -511,6 +1116,10 @@ class AssemblerBrowserWidget(AssemblerBaseWidget):
 class DependenciesListWidget(AssemblerListBaseWidget):
     """List of assets evaluated as dependencies on the current context"""
 
+    contextsHydrated = QtCore.Signal(
+        object, object, object
+    )  # Contexts of the assets has been fetched
+
     def __init__(self, assembler_widget, parent=None):
         '''
         Instantiate the dependency list widget
@@ -519,6 +1128,11 @@ class DependenciesListWidget(AssemblerListBaseWidget):
         :param parent: The parent dialog or frame
         '''
         self._asset_widget_class = DependencyComponentWidget
+        self._hydration_generation = 0
+        self._hydrating = False
+        self._rows_built = 0  # Model rows added to list
+        self._prev_context_id = None  # Context of the last row added
+        self._stretch_widget = None
         super(DependenciesListWidget, self).__init__(
             assembler_widget, parent=parent
         )
@@ -526,10 +1140,19 @@ class DependenciesListWidget(AssemblerListBaseWidget):
     def post_build(self):
         '''(Override)'''
         super(DependenciesListWidget, self).post_build()
-        self._model.rowsInserted.connect(self._on_dependencies_added)
+        self._model.rowsInserted.connect(self._on_dependencies_inserted)
         self._model.modelReset.connect(self._on_dependencies_added)
         self._model.rowsRemoved.connect(self._on_dependencies_added)
         self._model.dataChanged.connect(self._on_dependencies_added)
+        self.contextsHydrated.connect(self._on_contexts_hydrated)
+
+    def _on_dependencies_inserted(self, index, first, last):
+        '''Rows has been inserted, add them to list if appended while
+        dependencies are being streamed'''
+        if first < self._rows_built:
+            self._on_dependencies_added()
+        else:
+            self._hydrate_rows()
 
     def _on_dependencies_added(self, *args):
         '''Model has been updated'''
@@ -539,12 +1162,95 @@ class DependenciesListWidget(AssemblerListBaseWidget):
             self.selectionUpdated.emit(selection)
 
     def rebuild(self):
-        '''Add all assets(components) again from model.'''
+        '''Add all assets(components) again from model, grouped by
+        context, after the contexts has been fetched in one go.'''
+        self.clear_rows()
+        self._hydration_generation += 1
+        self._hydrating = False
+        self._rows_built = 0
+        self._prev_context_id = None
+        self._stretch_widget = None
+        self._hydrate_rows()
+
+    def _hydrate_rows(self):
+        '''Fetch the contexts of the model rows not yet added to list in
+        background, unless already fetching. Rows added meanwhile are
+        hydrated when done.'''
+        last = self.model.rowCount() - 1
+        if self._hydrating or last < self._rows_built:
+            return
+        self._hydrating = True
+        components = [
+            self.model.data(self.model.createIndex(row, 0, self.model))[0]
+            for row in range(self._rows_built, last + 1)
+        ]
+        thread = BaseThread(
+            name='hydrate_contexts_thread',
+            target=self._hydrate_contexts_async,
+            callback=partial(
+                self._on_contexts_hydrated_async,
+                self._hydration_generation,
+                last,
+            ),
+            target_args=[components],
+        )
+        thread.start()
+
+    def _hydrate_contexts_async(self, components):
+        '''(Background thread) Fetch the task of each version and the
+        context header data - name, link and thumbnail, for all
+        *components* with a few batched queries. Returns the contexts by
+        id.'''
+        try:
+            versions = query_in_batches(
+                self.model.session,
+                'select task from AssetVersion where id in ({})',
+                list(
+                    set(
+                        [
+                            component['version']['id']
+                            for component in components
+                        ]
+                    )
+                ),
+            )
+            contexts = query_in_batches(
+                self.model.session,
+                'select id, name, link, thumbnail, thumbnail_id from Context '
+                'where id in ({})',
+                list(
+                    set(
+                        [
+                            version['task']['id']
+                            for version in versions
+                            if version['task'] is not None
+                        ]
+                    )
+                ),
+            )
+        except Exception as e:
+            self.model.logger.exception(e)
+            return None
+        return dict([(context['id'], context) for context in contexts])
+
+    def _on_contexts_hydrated_async(self, generation, last, contexts):
+        '''(Background thread) Contexts has been fetched, pass on to main
+        thread'''
+        self.contextsHydrated.emit(generation, last, contexts)
+
+    def _on_contexts_hydrated(self, generation, last, contexts):
+        '''Add model rows up to *last* to list, with context headers filled
+        from the fetched *contexts*. Discard if a rebuild has been requested
+        since.'''
+        if generation != self._hydration_generation:
+            return
+        self._hydrating = False
         # TODO: Save selection state
-        clear_layout(self.layout())
+        if self._stretch_widget is not None:
+            # Keep stretch last
+            self.layout().removeWidget(self._stretch_widget)
         # Group by context
-        prev_context_id = None
-        for row in range(self.model.rowCount()):
+        for row in range(self._rows_built, last + 1):
             index = self.model.createIndex(row, 0, self.model)
 
             (component, definitions, availability) = self.model.data(index)
@@ -553,11 +1259,16 @@ class DependenciesListWidget(AssemblerListBaseWidget):
 
             # Add a grouping element?
 
-            if prev_context_id is None or context_id != prev_context_id:
-                context_entity = self.model.session.query(
-                    'select link, name, parent, parent.name from Context where id '
-                    'is "{}"'.format(context_id)
-                ).one()
+            if (
+                self._prev_context_id is None
+                or context_id != self._prev_context_id
+            ):
+                context_entity = (contexts or {}).get(context_id)
+                if context_entity is None:
+                    context_entity = self.model.session.query(
+                        'select link, name, thumbnail, thumbnail_id from '
+                        'Context where id is "{}"'.format(context_id)
+                    ).one()
 
                 widget = QtWidgets.QFrame()
                 widget.setLayout(QtWidgets.QHBoxLayout())
@@ -572,7 +1283,10 @@ class DependenciesListWidget(AssemblerListBaseWidget):
                 thumbnail_widget.setMinimumHeight(40)
                 thumbnail_widget.setMaximumWidth(40)
                 thumbnail_widget.setMaximumHeight(40)
-                thumbnail_widget.load(context_entity['id'])
+                thumbnail_widget.load(
+                    context_entity['id'],
+                    thumbnail_id=get_fetched_thumbnail_id(context_entity),
+                )
                 widget.layout().addWidget(thumbnail_widget)
 
                 # Append a context label
@@ -585,28 +1299,40 @@ class DependenciesListWidget(AssemblerListBaseWidget):
 
                 self.layout().addWidget(widget)
 
-            # Append component accordion
+            self._prev_context_id = context_id
 
-            component_widget = self._asset_widget_class(
-                index, self._assembler_widget, self.model.event_manager
-            )
-            set_property(
-                component_widget,
-                'first',
-                'true' if row == 0 else 'false',
-            )
-            if availability < 100.0:
-                component_widget.warning_message = 'Not available in your current location - please transfer over!'
-            component_widget.set_component_and_definitions(
-                component, definitions
-            )
-            self.layout().addWidget(component_widget)
-            component_widget.clicked.connect(
-                partial(self.asset_clicked, component_widget)
-            )
+            # Append component accordion
+            self.add_row(index)
 
-        self.layout().addWidget(QtWidgets.QLabel(), 1000)
+        self._rows_built = last + 1
+        if self._stretch_widget is None:
+            self._stretch_widget = QtWidgets.QLabel()
+        self.layout().addWidget(self._stretch_widget, 1000)
         self.refreshed.emit()
+        selection = self.selection()
+        if selection:
+            self.selectionUpdated.emit(selection)
+        # Rows might have been appended while fetching
+        self._hydrate_rows()
+
+    def build_widget(self, index):
+        '''(Override) Build component accordion widget'''
+        (component, definitions, availability) = self.model.data(index)
+        component_widget = self._asset_widget_class(
+            index, self._assembler_widget, self.model.event_manager
+        )
+        set_property(
+            component_widget,
+            'first',
+            'true' if index.row() == 0 else 'false',
+        )
+        if availability < 100.0:
+            component_widget.warning_message = 'Not available in your current location - please transfer over!'
+        component_widget.set_component_and_definitions(component, definitions)
+        component_widget.clicked.connect(
+            partial(self.asset_clicked, component_widget)
+        )
+        return component_widget
 
 
 class BrowserListWidget(AssemblerListBaseWidget):
@@ -622,7 +1348,6 @@ class BrowserListWidget(AssemblerListBaseWidget):
         :param parent: The parent dialog or frame
         '''
         self._asset_widget_class = BrowserComponentWidget
-        self.prev_search_text = None
         super(BrowserListWidget, self).__init__(
             assembler_widget, parent=parent
         )
@@ -636,6 +1361,7 @@ class BrowserListWidget(AssemblerListBaseWidget):
         '''(Override)'''
         super(BrowserListWidget, self).post_build()
         self.model.rowsInserted.connect(self._on_components_added)
+        self.model.rowsRemoved.connect(self._on_components_removed)
         self.model.dataChanged.connect(
             self._on_component_set
         )  # Support change version > change component
@@ -643,32 +1369,26 @@ class BrowserListWidget(AssemblerListBaseWidget):
     def rebuild(self):
         pass
 
-    def _on_component_set(self, index_first, unused_index_last):
+    def _on_component_set(self, index_first, index_last):
         '''Replace an asset with another (version)'''
-        current_widget = self.get_widget(index_first)
-        updated_widget = self._build_widget(index_first)
-        updated_widget.selected = current_widget.selected
-        self.layout().replaceWidget(current_widget, updated_widget)
-        current_widget.deleteLater()
-        self.refresh()
+        self.update_rows(index_first.row(), index_last.row())
         selection = self.selection()
         if selection is not None:
             self.selectionUpdated.emit(selection)
 
     def _on_components_added(self, index, first, last):
         '''Add components recently added from model to list.'''
-        for row in range(first, last + 1):
-            index = self.model.createIndex(row, 0, self.model)
-            self.layout().insertWidget(
-                self.layout().count() - 1, self._build_widget(index)
-            )
-        self.refresh()
+        self.insert_rows(first, last)
         selection = self.selection()
         if selection is not None:
             self.selectionUpdated.emit(selection)
 
-    def _build_widget(self, index):
-        '''Build component accordion widget'''
+    def _on_components_removed(self, index, first, last):
+        '''Remove components no longer matching from list'''
+        self.remove_rows(first, last)
+
+    def build_widget(self, index):
+        '''(Override) Build component accordion widget'''
         (component, definitions, availability) = self.model.data(index)
         component_widget = self._asset_widget_class(
             index, self._assembler_widget, self.model.event_manager
@@ -691,22 +1411,6 @@ class BrowserListWidget(AssemblerListBaseWidget):
         )
         return component_widget
 
-    def refresh(self, search_text=None):
-        '''Update visibility based on search'''
-        if search_text is None:
-            search_text = self.prev_search_text
-        for component_widget in self.assets:
-            component_widget.setVisible(
-                len(search_text or '') == 0
-                or component_widget.matches(search_text)
-            )
-
-    def on_search(self, text):
-        '''Search input text change callback'''
-        if text != self.prev_search_text:
-            self.refresh(text.lower())
-            self.prev_search_text = text
-
     def _on_version_change(self, widget, version_id):
         '''Another version has been selected by user, relay event passing on *version_id*'''
         self.versionChanged.emit(widget, version_id)
@@ -847,7 +1551,9 @@ class BrowserComponentWidget(ComponentBaseWidget):
 
     def get_version_widget(self):
         '''(Override)'''
-        self._version_nr_widget = AssemblerVersionComboBox(self.session)
+        self._version_nr_widget = AssemblerVersionComboBox(
+            self.session, version_map=self._assembler_widget.version_map
+        )
         self._version_nr_widget.versionChanged.connect(
             self._on_version_changed
         )
@@ -886,17 +1592,3 @@ class BrowserComponentWidget(ComponentBaseWidget):
     def _on_version_changed(self, version_id):
         '''Another version has been selected by user, relay event passing on *version_id*'''
         self.versionChanged.emit(version_id)
-
-    def matches(self, search_text):
-        '''Do a simple match if this search text matches my attributes'''
-        if self._context_id.lower().find(search_text) > -1:
-            return True
-        if self._context_name.lower().find(search_text) > -1:
-            return True
-        if self._asset_name_widget.text().lower().find(search_text) > -1:
-            return True
-        if self._component_name.lower().find(search_text) > -1:
-            return True
-        if self._path_widget.text().lower().find(search_text) > -1:
-            return True
-        return False
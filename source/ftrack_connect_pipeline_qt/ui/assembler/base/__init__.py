@@ -2,6 +2,8 @@
 # :copyright: Copyright (c) 2014-2022 ftrack
 import logging
 import copy
+import threading
+import json
 import os
 
 from Qt import QtCore, QtWidgets
@@ -19,6 +21,7 @@ from ftrack_connect_pipeline_qt.ui.asset_manager.base import (
 )
 from ftrack_connect_pipeline_qt.ui.utility.widget.thumbnail import (
     AssetVersion,
+    get_fetched_thumbnail_url,
 )
 from ftrack_connect_pipeline_qt.ui.factory.assembler import (
     AssemblerWidgetFactory,
@@ -62,6 +65,8 @@ class AssemblerBaseWidget(QtWidgets.QWidget):
         object
     )  # Emitted if a critical error occurs during load
 
+    EXTRACT_BATCH_SIZE = 16  # Max versions per batch of components streamed
+
     @property
     def component_list(self):
         '''Return the collected object by the widget'''
@@ -100,6 +105,9 @@ class AssemblerBaseWidget(QtWidgets.QWidget):
         self._client = client
         self._component_list = None
         self._loadable_count = -1
+        self._definition_index = None
+        self._fragment_templates = {}
+        self._cancel_token = None
 
         self.logger = logging.getLogger(
             __name__ + '.' + self.__class__.__name__
@@ -222,6 +230,7 @@ class AssemblerBaseWidget(QtWidgets.QWidget):
                 )
                 return False
 
+            self._renew_cancel_token()
             self.model.reset()
             self._loadable_count = 0
 
@@ -240,16 +249,21 @@ class AssemblerBaseWidget(QtWidgets.QWidget):
         pass
 
     def post_build(self):
-        self._cb_show_non_compatible.clicked.connect(self.rebuild)
+        self._cb_show_non_compatible.clicked.connect(self._on_match_changed)
         if self.client.assembler_match_extension:
             self._rb_match_extension.setChecked(True)
         else:
             self._rb_match_component_name.setChecked(True)
-        self._rb_match_component_name.clicked.connect(self.rebuild)
-        self._rb_match_extension.clicked.connect(self.rebuild)
+        self._rb_match_component_name.clicked.connect(self._on_match_changed)
+        self._rb_match_extension.clicked.connect(self._on_match_changed)
         self.stopBusyIndicator.connect(self._stop_busy_indicator)
         self.loadError.connect(self._on_load_error)
 
+    def _on_match_changed(self):
+        '''User has changed how assets are matched against loader
+        definitions, rebuild. Can be overridden by child.'''
+        self.rebuild()
+
     def update(self):
         '''Update widget inputs'''
         self._rb_match_component_name.setEnabled(
@@ -277,216 +291,350 @@ class AssemblerBaseWidget(QtWidgets.QWidget):
             self._component_list.clear_selection()
         return super(AssemblerBaseWidget, self).mousePressEvent(event)
 
-    def extract_components(self, versions):
-        '''Build a list of loadable components from the supplied *versions*'''
+    def _get_definition_index(self, loader_definitions):
+        '''Return the index of *loader_definitions* components, built once
+        per set of definitions. The index maps (asset type short, lowercase
+        component name, file extension) to candidate (definition, definition
+        component) pairs, and (asset type short, file extension) for relaxed
+        matching on component name.'''
+        if (
+            self._definition_index is not None
+            and self._definition_index[0] is loader_definitions
+            and self._definition_index[1] == len(loader_definitions)
+        ):
+            return self._definition_index[2]
+        by_name = {}
+        by_extension = {}
+        for definition in loader_definitions:
+            asset_type_name_short = definition['asset_type']
+            for d_component in definition.get_all(
+                type=core_constants.COMPONENT
+            ):
+                for file_format in set(d_component['file_formats']):
+                    by_name.setdefault(
+                        (
+                            asset_type_name_short,
+                            d_component['name'].lower(),
+                            file_format,
+                        ),
+                        [],
+                    ).append((definition, d_component))
+                    by_extension.setdefault(
+                        (asset_type_name_short, file_format), []
+                    ).append((definition, d_component))
+        index = (by_name, by_extension)
+        self._definition_index = (
+            loader_definitions,
+            len(loader_definitions),
+            index,
+        )
+        self._fragment_templates = {}
+        return index
+
+    def _get_fragment_template(self, definition, d_component):
+        '''Return the JSON template of the loader definition fragment having
+        *d_component* as the only component of *definition*, cached'''
+        key = (id(definition), id(d_component))
+        if key not in self._fragment_templates:
+            definition_fragment = DefinitionObject({})
+            for key_category in definition:
+                if key_category == core_constants.COMPONENTS:
+                    # Have that as the only component
+                    definition_fragment[key_category] = DefinitionList(
+                        [DefinitionObject(d_component.to_dict())]
+                    )
+                    # It can be disabled, enable it
+                    definition_fragment.get_first(
+                        type=core_constants.COMPONENT
+                    )['enabled'] = True
+                else:
+                    # Copy the category
+                    definition_fragment[key_category] = copy.deepcopy(
+                        definition[key_category]
+                    )
+            self._fragment_templates[key] = definition_fragment.to_json()
+        return self._fragment_templates[key]
+
+    def _build_definition_fragment(
+        self, definition, d_component, component_name, version
+    ):
+        '''Build loader definition fragment from template of *definition*
+        and *d_component*, with the *component_name* and context options
+        of *version* patched in.'''
+        definition_fragment = DefinitionObject(
+            json.loads(self._get_fragment_template(definition, d_component))
+        )
+        # Make sure component name align
+        definition_fragment.get_first(type=core_constants.COMPONENT)[
+            'name'
+        ] = component_name
+        # Inject context ident
+        if core_constants.CONTEXTS in definition_fragment:
+            for plugin_definition in definition_fragment[
+                core_constants.CONTEXTS
+            ].get_all(
+                type=core_constants.CONTEXT,
+                category=core_constants.PLUGIN,
+            ):
+                if not 'options' in plugin_definition:
+                    plugin_definition['options'] = {}
+                options = plugin_definition['options']
+                # Store version
+                options['asset_name'] = version['asset']['name']
+                options['asset_id'] = version['asset']['id']
+                options['version_number'] = version['version']
+                options['version_id'] = version['id']
+        return definition_fragment
+
+    def cancel(self):
+        '''Cancel ongoing extraction of components'''
+        if self._cancel_token is not None:
+            self._cancel_token.set()
+
+    def _renew_cancel_token(self):
+        '''Cancel ongoing extraction of components and return the
+        cancellation token of the next one'''
+        self.cancel()
+        self._cancel_token = threading.Event()
+        return self._cancel_token
+
+    def _extract_version_components(self, version, by_name, by_extension):
+        '''Return the loadable components of *version* as a list of
+        [component, matching definitions, availability] entries, matched
+        against definition index *by_name* and *by_extension*'''
+        result = []
+        self.client.logger.debug(
+            'Processing version: {}'.format(str_version(version, with_id=True))
+        )
+
+        asset_type_name_short = version['asset']['type']['short']
+        for component in version['components']:
+            component_extension = component.get('file_type')
+            self.client.logger.debug(
+                '     Processing component: {}({})'.format(
+                    component['name'], component['file_type']
+                )
+            )
+            if not component_extension:
+                self.logger.warning(
+                    'Could not assemble version {} component {}; missing file type!'.format(
+                        version['id'], component['id']
+                    )
+                )
+                continue
+            elif not self.show_non_compatible_assets:
+                if component['name'] == core_constants.SNAPSHOT_COMPONENT_NAME:
+                    self.logger.warning(
+                        'Not assembling version {} snapshot component {}!'.format(
+                            version['id'], component['id']
+                        )
+                    )
+                    continue
+                elif component['name'].startswith(
+                    core_constants.FTRACKREVIEW_COMPONENT_NAME
+                ):
+                    self.logger.warning(
+                        'Not assembling version {} ftrackreview component {}!'.format(
+                            version['id'], component['id']
+                        )
+                    )
+                    continue
+            if self.match_component_names:
+                candidates = by_name.get(
+                    (
+                        asset_type_name_short,
+                        component['name'].lower(),
+                        component_extension,
+                    ),
+                    [],
+                )
+            else:
+                candidates = by_extension.get(
+                    (asset_type_name_short, component_extension), []
+                )
+            matching_definitions = None
+            for (definition, d_component) in candidates:
+                if matching_definitions is None:
+                    matching_definitions = []
+                matching_definitions.append(
+                    self._build_definition_fragment(
+                        definition,
+                        d_component,
+                        d_component['name']
+                        if d_component['name'].lower()
+                        == component['name'].lower()
+                        else component['name'],
+                        version,
+                    )
+                )
+            if matching_definitions is None:
+                self.client.logger.debug(
+                    '        No definition component matches {}({})!'.format(
+                        component['name'], component_extension
+                    )
+                )
+                if self.show_non_compatible_assets:
+                    matching_definitions = []
+            else:
+                self._loadable_count += 1
+            if matching_definitions is not None:
+                result.append(
+                    [
+                        component,
+                        matching_definitions,
+                        None,
+                    ]
+                )
+                self.logger.info(
+                    'Assembled version {0} component {1}({2}) for import'.format(
+                        version['id'], component['name'], component['id']
+                    )
+                )
+        return result
+
+    def _resolve_availabilities(self, location, components, availabilities):
+        '''Set availability in *location* of *components* entries, from
+        *availabilities* if known otherwise resolved in one go'''
+        unresolved = []
+        for entry in components:
+            if entry[0]['id'] in availabilities:
+                entry[2] = availabilities[entry[0]['id']]
+            else:
+                unresolved.append(entry)
+        if len(unresolved) > 0:
+            for (entry, availability) in zip(
+                unresolved,
+                location.get_component_availabilities(
+                    [component for (component, _, _) in unresolved]
+                ),
+            ):
+                entry[2] = availability
+
+    def iter_components(
+        self,
+        versions,
+        cancel_token=None,
+        availabilities=None,
+        batch_size=None,
+    ):
+        '''
+        Extract loadable components from the supplied *versions*, yielding
+        them in batches as lists of (component, matching definitions,
+        availability) tuples. Batches are of *batch_size* versions if given,
+        otherwise the first batch holds one version and the following ones
+        grow up to EXTRACT_BATCH_SIZE versions, to have first components
+        displayed quickly.
+
+        :param versions: The versions to extract components from
+        :param cancel_token: Optional :class:`threading.Event`, extraction stops when set
+        :param availabilities: Optional dict of component id to availability already known
+        :param batch_size: Fixed number of versions per batch
+        '''
 
         # Fetch all definitions, append asset type name
         loader_definitions = self.client.definition_selector.definitions
 
-        # import json
-        self.client.logger.debug(
-            'Available loader definitions: {}'.format(
-                '\n'.join(
-                    [loader.to_json(indent=4) for loader in loader_definitions]
+        if self.client.logger.isEnabledFor(logging.DEBUG):
+            self.client.logger.debug(
+                'Available loader definitions: {}'.format(
+                    '\n'.join(
+                        [
+                            loader.to_json(indent=4)
+                            for loader in loader_definitions
+                        ]
+                    )
                 )
             )
+
+        (by_name, by_extension) = self._get_definition_index(
+            loader_definitions
         )
 
         # For each version, figure out loadable components and store with
         # fragment of its possible loader definition(s)
 
-        components = []
-
         location = self.session.pick_location()
 
         # Group by context, sort by asset name
-        for version in sorted(
+        versions = sorted(
             versions,
             key=lambda v: '{}/{}'.format(
                 v['asset']['parent']['id'], v['asset']['name']
             ),
-        ):
-            self.client.logger.debug(
-                'Processing version: {}'.format(
-                    str_version(version, with_id=True)
-                )
-            )
-
-            for component in version['components']:
-                component_extension = component.get('file_type')
-                self.client.logger.debug(
-                    '     Processing component: {}({})'.format(
-                        component['name'], component['file_type']
+        )
+        size = batch_size or 1
+        offset = 0
+        while offset < len(versions):
+            if cancel_token is not None and cancel_token.is_set():
+                self.logger.debug('Component extraction cancelled')
+                return
+            components = []
+            for version in versions[offset : offset + size]:
+                components.extend(
+                    self._extract_version_components(
+                        version, by_name, by_extension
                     )
                 )
-                if not component_extension:
-                    self.logger.warning(
-                        'Could not assemble version {} component {}; missing file type!'.format(
-                            version['id'], component['id']
-                        )
-                    )
-                    continue
-                elif not self.show_non_compatible_assets:
-                    if (
-                        component['name']
-                        == core_constants.SNAPSHOT_COMPONENT_NAME
-                    ):
-                        self.logger.warning(
-                            'Not assembling version {} snapshot component {}!'.format(
-                                version['id'], component['id']
-                            )
-                        )
-                        continue
-                    elif component['name'].startswith(
-                        core_constants.FTRACKREVIEW_COMPONENT_NAME
-                    ):
-                        self.logger.warning(
-                            'Not assembling version {} ftrackreview component {}!'.format(
-                                version['id'], component['id']
-                            )
-                        )
-                        continue
-                matching_definitions = None
-                for definition in loader_definitions:
-                    # Matches asset type?
-                    definition_asset_type_name_short = definition['asset_type']
-                    if (
-                        definition_asset_type_name_short
-                        != version['asset']['type']['short']
-                    ):
-                        self.client.logger.debug(
-                            '        Definition asset type {} mismatch version {}!'.format(
-                                definition_asset_type_name_short,
-                                version['asset']['type']['short'],
-                            )
-                        )
-                        continue
-                    definition_fragment = None
-                    for d_component in definition.get_all(
-                        type=core_constants.COMPONENT
-                    ):
-                        component_name_effective = d_component['name']
-                        if (
-                            component_name_effective.lower()
-                            != component['name'].lower()
-                        ):
-                            if self.match_component_names:
-                                self.client.logger.debug(
-                                    '        Definition component name {} mismatch!'.format(
-                                        d_component['name']
-                                    )
-                                )
-                                continue
-                            else:
-                                component_name_effective = component['name']
-                        file_formats = d_component['file_formats']
-                        if set(file_formats).intersection(
-                            set([component_extension])
-                        ):
-                            # Construct definition fragment
-                            definition_fragment = DefinitionObject({})
-                            for key in definition:
-                                if key == core_constants.COMPONENTS:
-                                    # Have that as the only component
-                                    definition_fragment[key] = DefinitionList(
-                                        [
-                                            DefinitionObject(
-                                                d_component.to_dict()
-                                            )
-                                        ]
-                                    )
-                                    component_fragment = (
-                                        definition_fragment.get_first(
-                                            type=core_constants.COMPONENT
-                                        )
-                                    )
-                                    # Make sure component name align
-                                    component_fragment[
-                                        'name'
-                                    ] = component_name_effective
-                                    # It can be disabled, enable it
-                                    component_fragment['enabled'] = True
-                                else:
-                                    # Copy the category
-                                    definition_fragment[key] = copy.deepcopy(
-                                        definition[key]
-                                    )
-                                    if key != core_constants.CONTEXTS:
-                                        continue
-                                    # Inject context ident
-                                    for plugin in definition_fragment[
-                                        key
-                                    ].get_all(
-                                        type=core_constants.CONTEXT,
-                                        category=core_constants.PLUGIN,
-                                    ):
-                                        if not 'options' in plugin:
-                                            plugin['options'] = {}
-                                        # Store version
-                                        plugin['options'][
-                                            'asset_name'
-                                        ] = version['asset']['name']
-                                        plugin['options'][
-                                            'asset_id'
-                                        ] = version['asset']['id']
-                                        plugin['options'][
-                                            'version_number'
-                                        ] = version['version']
-                                        plugin['options'][
-                                            'version_id'
-                                        ] = version['id']
-                        else:
-                            self.client.logger.debug(
-                                '        File formats {} does not intersect with {}!'.format(
-                                    file_formats,
-                                    [component_extension],
-                                )
-                            )
-                        if definition_fragment:
-                            if matching_definitions is None:
-                                matching_definitions = []
-                            matching_definitions.append(definition_fragment)
-                if matching_definitions is None:
-                    if self.show_non_compatible_assets:
-                        matching_definitions = []
-                else:
-                    self._loadable_count += 1
-                if matching_definitions is not None:
-                    availability = location.get_component_availability(
-                        component
-                    )
-                    components.append(
-                        (
-                            component,
-                            matching_definitions,
-                            availability,
-                        )
-                    )
-                    self.logger.info(
-                        'Assembled version {0} component {1}({2}) for import'.format(
-                            version['id'], component['name'], component['id']
-                        )
-                    )
+            offset += size
+            if batch_size is None:
+                size = min(size * 2, self.EXTRACT_BATCH_SIZE)
+            if len(components) > 0:
+                self._resolve_availabilities(
+                    location, components, availabilities or {}
+                )
+                yield [tuple(entry) for entry in components]
 
-        return components
+    def extract_components(self, versions, availabilities=None):
+        '''Build a list of loadable components from the supplied *versions*,
+        resolving availability of components not in *availabilities*, a dict
+        of component id to availability already known'''
+        result = []
+        for components in self.iter_components(
+            versions,
+            availabilities=availabilities,
+            batch_size=max(1, len(versions)),
+        ):
+            result.extend(components)
+        return result
 
 
 class AssemblerListBaseWidget(AssetListWidget):
     '''Base for asset lists within the assembler'''
 
+    placeholder_height = 32
+
     def __init__(self, assembler_widget, parent=None):
         self._assembler_widget = assembler_widget
         super(AssemblerListBaseWidget, self).__init__(
-            self._assembler_widget.model, parent=parent
+            self._assembler_widget.model,
+            virtualized=self._assembler_widget.client.virtualized_asset_list,
+            parent=parent,
         )
 
     def rebuild(self):
         '''Rebuild the list widget, must be implemented by child'''
         raise NotImplementedError()
 
+    def get_search_values(self, index):
+        '''(Override) Match the context, asset and component of the
+        component at model *index*'''
+        (component, definitions, availability) = self.model.data(index)
+        version_entity = component['version']
+        return [
+            version_entity['task']['id'],
+            ' / '.join(link['name'] for link in version_entity['task']['link']),
+            version_entity['asset']['name'],
+            component['name'],
+        ]
+
+    def on_search(self, text):
+        '''Search input text change callback'''
+        self.set_search_text(text)
+
     def get_loadable(self):
         '''Return a list of all loadable assets regardless of selection'''
         result = []
+        self.materialize_all()
         for widget in self.assets:
             if widget.definition is not None:
                 widget.set_selected(True)
@@ -502,6 +650,11 @@ class ComponentBaseWidget(AccordionBaseWidget):
         '''Return the index this asset has in list'''
         return self._index
 
+    @index.setter
+    def index(self, value):
+        '''Set the index this asset has in list to *value*'''
+        self._index = value
+
     @property
     def options_widget(self):
         '''Return the widget representing options'''
@@ -510,13 +663,17 @@ class ComponentBaseWidget(AccordionBaseWidget):
     @property
     def definition(self):
         '''Return the currently selected definition to use for loading'''
-        return (
-            self._widget_factory.definition if self._widget_factory else None
-        )
+        return self._definition
 
     @property
     def factory(self):
-        '''Return the factory to use for building options and loader serialize'''
+        '''Return the factory to use for building options and loader
+        serialize, created on first demand'''
+        if self._widget_factory is None:
+            self._widget_factory = AssemblerWidgetFactory(
+                self.event_manager, self._assembler_widget.client.ui_types
+            )
+            self._setup_widget_factory()
         return self._widget_factory
 
     @property
@@ -563,6 +720,9 @@ class ComponentBaseWidget(AccordionBaseWidget):
         :param parent: the parent dialog or frame
         '''
         self._assembler_widget = assembler_widget
+        self._definition = None
+        self._widget_factory = None  # Created when options or run needs it
+        self._version_id = None
         super(ComponentBaseWidget, self).__init__(
             AccordionBaseWidget.SELECT_MODE_LIST,
             AccordionBaseWidget.CHECK_MODE_NONE,
@@ -571,7 +731,6 @@ class ComponentBaseWidget(AccordionBaseWidget):
             collapsable=False,
             parent=parent,
         )
-        self._version_id = None
         self._index = index
         self._adjust_height()
 
@@ -669,13 +828,9 @@ class ComponentBaseWidget(AccordionBaseWidget):
         self._mode_selector.currentIndexChanged.connect(self._mode_selected)
         upper_layout.addWidget(self._mode_selector)
 
-        # Options widget,initialize its factory
+        # Options widget, factory is initialized when needed
         upper_layout.addWidget(self.init_options_button())
 
-        self._widget_factory = AssemblerWidgetFactory(
-            self.event_manager, self._assembler_widget.client.ui_types
-        )
-
         header_layout.addWidget(upper_widget, 10)
 
         self._warning_message_widget = QtWidgets.QWidget()
@@ -697,13 +852,23 @@ class ComponentBaseWidget(AccordionBaseWidget):
         header_layout.addWidget(self._warning_message_widget)
         self._warning_message_widget.setVisible(False)
 
-    def _definition_selected(self, index):
-        '''Loader definition were selected,'''
+    def _setup_widget_factory(self):
+        '''Bind the factory to the selected definition and this asset'''
         self._assembler_widget.client.setup_widget_factory(
             self._widget_factory,
-            self._definition_selector.itemData(index),
+            self._definition,
             self.context_id,
         )
+        self._widget_factory.batch_id = self._component_id
+
+    def _definition_selected(self, index):
+        '''Loader definition were selected, keep it until factory is
+        needed'''
+        self._definition = self._definition_selector.itemData(index)
+        if self._definition is None:
+            return
+        if self._widget_factory is not None:
+            self._setup_widget_factory()
         self._set_default_mode()
 
     def _set_default_mode(self):
@@ -730,7 +895,7 @@ class ComponentBaseWidget(AccordionBaseWidget):
 
     def _build_options(self):
         '''Build options overlay with factory'''
-        self._widget_factory.build(self.options_widget.main_widget)
+        self.factory.build(self.options_widget.main_widget)
         # Make sure we can save options on close
         self.options_widget.overlay_container.close_btn.clicked.connect(
             self._store_options
@@ -742,6 +907,7 @@ class ComponentBaseWidget(AccordionBaseWidget):
         '''Serialize definition and store'''
         updated_definition = self._widget_factory.to_json_object()
 
+        self._definition = updated_definition
         self._widget_factory.set_definition(updated_definition)
         # Transfer back load mode
         self._set_default_mode()
@@ -759,8 +925,14 @@ class ComponentBaseWidget(AccordionBaseWidget):
         self._context_name = version_entity['task']['name']
         self._component_id = component['id']
         self._component_name = component['name']
-        self.thumbnail_widget.load(version_entity['id'])
-        self._widget_factory.batch_id = version_entity['id']
+        # Reuse thumbnail url fetched with the version, if any
+        self.thumbnail_widget.load(
+            version_entity['id'],
+            url=get_fetched_thumbnail_url(version_entity),
+        )
+        self._version_id = version_entity['id']
+        if self._widget_factory is not None:
+            self._widget_factory.batch_id = self._component_id
 
         self._status_widget.set_status(version_entity['status'])
 
@@ -900,13 +1072,8 @@ class AssemblerEntityInfo(QtWidgets.QWidget):
         if not value:
             return
         self._entity = value
-        parent = value['parent']
-        parents = [value]
-        while parent is not None:
-            parents.append(parent)
-            parent = parent['parent']
-        parents.reverse()
-        self.pathReady.emit(parents)
+        # Link holds the names from project down to entity
+        self.pathReady.emit(value['link'])
 
     def __init__(self, parent=None):
         '''Instantiate the entity path widget.'''
@@ -942,8 +1109,27 @@ class AssemblerEntityInfo(QtWidgets.QWidget):
 
 
 class AssemblerVersionComboBox(VersionComboBox):
-    def __init__(self, session, parent=None):
+    def __init__(self, session, version_map=None, parent=None):
+        '''
+        Initialise AssemblerVersionComboBox
+
+        :param session: :class:`ftrack_api.session.Session`
+        :param version_map: Optional :class:`~ftrack_connect_pipeline_qt.ui.assembler.VersionComponentMap` providing prefetched versions
+        :param parent: The parent widget
+        '''
         super(AssemblerVersionComboBox, self).__init__(session, parent=parent)
+        self._version_map = version_map
+
+    def get_versions(self):
+        '''(Override) Return versions from version map if prefetched,
+        sparing a query each time popup is shown'''
+        if self._version_map is not None and not self._filters:
+            versions = self._version_map.get_versions(
+                self.asset_entity['id'], context_id=self.context_id
+            )
+            if versions is not None:
+                return [(version, True) for version in versions]
+        return super(AssemblerVersionComboBox, self).get_versions()
 
     def _add_version(self, version_and_compatible_tuple):
         '''Override'''
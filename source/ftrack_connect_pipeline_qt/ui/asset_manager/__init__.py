@@ -1,10 +1,12 @@
 # :coding: utf-8
 # :copyright: Copyright (c) 2014-2023 ftrack
 import json
+import logging
 from functools import partial
 
 
 from Qt import QtWidgets, QtCore, QtCompat, QtGui
+import shiboken2
 
 from ftrack_connect_pipeline import constants as core_constants
 from ftrack_connect_pipeline.constants import asset as asset_constants
@@ -13,6 +15,9 @@ from ftrack_connect_pipeline_qt.ui.asset_manager.base import (
     AssetManagerBaseWidget,
     AssetListWidget,
 )
+from ftrack_connect_pipeline_qt.ui.asset_manager.tracker import (
+    LatestVersionTracker,
+)
 from ftrack_connect_pipeline_qt.ui.utility.widget.circular_button import (
     CircularButton,
 )
@@ -23,22 +28,32 @@ from ftrack_connect_pipeline.utils import str_version
 from ftrack_connect_pipeline_qt.utils import set_property
 from ftrack_connect_pipeline_qt.ui.utility.widget.thumbnail import (
     AssetVersion as AssetVersionThumbnail,
+    get_fetched_thumbnail_url,
 )
 from ftrack_connect_pipeline_qt.ui.utility.widget.entity_info import EntityInfo
 from ftrack_connect_pipeline_qt.ui.utility.widget import line
-from ftrack_connect_pipeline_qt.utils import clear_layout
+from ftrack_connect_pipeline_qt.utils import (
+    BaseThread,
+    clear_layout,
+    query_in_batches,
+)
 from ftrack_connect_pipeline_qt.ui.utility.widget.dialog import ModalDialog
 from ftrack_connect_pipeline_qt.ui.utility.widget.busy_indicator import (
     BusyIndicator,
 )
 from ftrack_connect_pipeline_qt.ui.utility.widget.button import ApproveButton
 
+logger = logging.getLogger(__name__)
+
 
 class AssetManagerWidget(AssetManagerBaseWidget):
     '''Asset manager widget that lives within the asset manager client'''
 
     refresh = QtCore.Signal()  # Refresh asset list from model
     rebuild = QtCore.Signal()  # Fetch assets from DCC and update model
+    assetsDiscovered = QtCore.Signal(
+        object
+    )  # Assets has been discovered in DCC, reconcile model
 
     changeAssetVersion = QtCore.Signal(
         object, object
@@ -80,6 +95,7 @@ class AssetManagerWidget(AssetManagerBaseWidget):
         '''
         self._client = asset_manager_client
         self.client_notification_subscribe_id = None
+        self._tracker = None
         super(AssetManagerWidget, self).__init__(
             asset_manager_client.is_assembler,
             asset_manager_client.event_manager,
@@ -174,6 +190,7 @@ class AssetManagerWidget(AssetManagerBaseWidget):
             self._asset_list_model,
             AssetWidget,
             docked=self._client.is_docked(),
+            virtualized=self._client.virtualized_asset_list,
         )
 
         asset_list_container = QtWidgets.QWidget()
@@ -190,6 +207,7 @@ class AssetManagerWidget(AssetManagerBaseWidget):
         super(AssetManagerWidget, self).post_build()
         self._rebuild_button.clicked.connect(self._on_rebuild)
         self.refresh.connect(self._on_refresh)
+        self.assetsDiscovered.connect(self.set_asset_list)
         self.stopBusyIndicator.connect(self._on_stop_busy_indicator)
         self._asset_list.refreshed.connect(self._on_asset_list_refreshed)
         self._asset_list.changeAssetVersion.connect(
@@ -197,10 +215,46 @@ class AssetManagerWidget(AssetManagerBaseWidget):
         )
 
     def set_asset_list(self, asset_entities_list):
-        '''Clear model and add asset entities, will trigger list to be rebuilt.'''
-        self._asset_list_model.reset()
-        if asset_entities_list and 0 < len(asset_entities_list):
-            self._asset_list.model.insertRows(0, asset_entities_list)
+        '''Reconcile model with asset entities, only the assets added,
+        removed or changed will be updated in list.'''
+        self._asset_list_model.reconcile(asset_entities_list or [])
+
+    def set_live_mode(self, enabled, event_source=None):
+        '''Track new versions of assets in model through session event
+        hub, or *event_source* if provided, if *enabled*. Stop tracking
+        otherwise.'''
+        if not enabled:
+            if self._tracker is not None:
+                self._tracker.stop()
+            return
+        if self._tracker is None:
+            self._tracker = LatestVersionTracker(
+                event_source or self.session.event_hub, parent=self
+            )
+            self._tracker.versionsPublished.connect(
+                self._asset_list.refresh_latest_versions
+            )
+            self._asset_list_model.rowsInserted.connect(
+                self._update_tracked_asset_ids
+            )
+            self._asset_list_model.rowsRemoved.connect(
+                self._update_tracked_asset_ids
+            )
+            self._asset_list_model.modelReset.connect(
+                self._update_tracked_asset_ids
+            )
+            self._asset_list_model.dataChanged.connect(
+                self._update_tracked_asset_ids
+            )
+        self._update_tracked_asset_ids()
+        self._tracker.start()
+
+    def _update_tracked_asset_ids(self, *args):
+        '''Track the asset ids currently in model'''
+        self._tracker.asset_ids = [
+            asset_info[asset_constants.ASSET_ID]
+            for asset_info in self._asset_list_model.items()
+        ]
 
     def set_busy(self, busy):
         '''Enter busy mode if *busy* is True - start spinner and show it. If *busy* is false, stop and hide the spinner'''
@@ -327,10 +381,33 @@ class AssetManagerWidget(AssetManagerBaseWidget):
         '''
         Triggered when update action menu been clicked.
         Emits update_asset signal.
-        Uses the given *plugin* to update the selected assets
+        Uses the given *plugin* to update the selected assets not already
+        at their latest version.
         '''
         selection = self._asset_list.selection()
         if self.check_selection(selection):
+            plan, unresolved = self._asset_list_model.get_update_plan(
+                selection
+            )
+            unresolved_ids = set(
+                [
+                    asset_info[asset_constants.ASSET_INFO_ID]
+                    for asset_info in unresolved
+                ]
+            )
+            selection = [
+                asset_info
+                for asset_info in selection
+                if asset_info[asset_constants.ASSET_INFO_ID] in plan
+                or asset_info[asset_constants.ASSET_INFO_ID] in unresolved_ids
+            ]
+            if len(selection) == 0:
+                ModalDialog(
+                    self._client,
+                    title='ftrack Asset manager',
+                    message='Selected Assets are already at latest version.',
+                )
+                return
             if ModalDialog(
                 self._client.parent(),
                 title='ftrack Asset manager',
@@ -455,92 +532,376 @@ class AssetManagerListWidget(AssetListWidget):
     changeAssetVersion = QtCore.Signal(
         object, object
     )  # User has commanded a change of version
-
-    def __init__(self, model, asset_widget_class, docked=False, parent=None):
+    assetsHydrated = QtCore.Signal(
+        object, object
+    )  # Version data of assets has been fetched
+    rowsHydrated = QtCore.Signal(
+        object, object, object
+    )  # Version data of inserted or changed assets has been fetched
+    latestVersionsResolved = QtCore.Signal(
+        object
+    )  # Versions of assets has been fetched after new publish
+
+    def __init__(
+        self,
+        model,
+        asset_widget_class,
+        docked=False,
+        virtualized=False,
+        parent=None,
+    ):
         '''
         Initialize the asset manager list widget
 
         :param model: :class:`~ftrack_connect_pipeline_qt.ui.asset_manager.model.AssetListModel` instance
         :param asset_widget_class: The class inheriting from :class:`~ftrack_connect_pipeline_qt.ui.asset_manager.AssetWidget` to use when instantiating assets
         :param docked: Boolean telling if the list is docked in DCC or is within an ftrack dialog - drive style
+        :param virtualized: If True, build asset widgets first when they are scrolled into view
         :param parent: The parent dialog or frame
         '''
         self._asset_widget_class = asset_widget_class
         self._docked = docked
         self.prev_search_text = ''
+        self._hydration_generation = 0
+        self._hydrating = False
+        self._versions = {}
+        self._versions_by_component = {}
 
-        super(AssetManagerListWidget, self).__init__(model, parent=parent)
+        super(AssetManagerListWidget, self).__init__(
+            model, virtualized=virtualized, parent=parent
+        )
 
     def post_build(self):
         '''(Override)'''
         super(AssetManagerListWidget, self).post_build()
-        # Do not distinguish between different model events,
-        # always rebuild entire list from scratch for now.
-        self._model.rowsInserted.connect(self._on_asset_data_changed)
+        # Patch the rows affected by model changes, rebuild on reset
+        self._model.rowsInserted.connect(self._on_rows_inserted)
         self._model.modelReset.connect(self._on_asset_data_changed)
-        self._model.rowsRemoved.connect(self._on_asset_data_changed)
-        self._model.dataChanged.connect(self._on_asset_data_changed)
+        self._model.rowsRemoved.connect(self._on_rows_removed)
+        self._model.dataChanged.connect(self._on_data_changed)
+        self.assetsHydrated.connect(self._on_assets_hydrated)
+        self.rowsHydrated.connect(self._on_rows_hydrated)
+        self.latestVersionsResolved.connect(self._on_latest_versions_resolved)
 
     def _on_asset_data_changed(self, *args):
         '''React upon change in asset model'''
         self.rebuild()
 
+    def _can_patch(self, row_count_change):
+        '''Return True if list widgets reflect the model before a change
+        of *row_count_change* rows, and can be patched'''
+        return (
+            not self._hydrating
+            and self.layout().count()
+            == self.model.rowCount() - row_count_change
+        )
+
+    def _on_rows_inserted(self, parent, first, last):
+        '''Asset model rows *first* to *last* has been inserted, add them
+        to list'''
+        if not self._can_patch(last - first + 1):
+            self.rebuild()
+            return
+        self._hydrate_rows(
+            first,
+            last,
+            partial(self._insert_hydrated_rows, first, last),
+            'hydrate_inserted_assets_thread',
+        )
+
+    def _hydrate_rows(self, first, last, apply, thread_name):
+        '''Call *apply* once the version data of model rows *first* to
+        *last* is available, fetching it in a background thread named
+        *thread_name* unless already fetched'''
+        asset_infos = [
+            self.model.data(self.model.createIndex(row, 0, self.model))
+            for row in range(first, last + 1)
+        ]
+        if all(
+            asset_info[asset_constants.VERSION_ID] in self._versions
+            and (
+                asset_info[asset_constants.ASSET_ID],
+                asset_info[asset_constants.COMPONENT_NAME],
+            )
+            in self._versions_by_component
+            for asset_info in asset_infos
+        ):
+            apply()
+            return
+        # Fetch version data in one go before building the rows, further
+        # model changes meanwhile will rebuild the list
+        self._hydration_generation += 1
+        self._hydrating = True
+        thread = BaseThread(
+            name=thread_name,
+            target=self._hydrate_async,
+            callback=partial(
+                self._on_rows_hydrated_async,
+                self._hydration_generation,
+                apply,
+            ),
+            target_args=[asset_infos],
+        )
+        thread.start()
+
+    def _on_rows_hydrated_async(self, generation, apply, result):
+        '''(Background thread) Version data of inserted or changed rows
+        has been fetched, pass on to main thread'''
+        self.rowsHydrated.emit(generation, apply, result)
+
+    def _on_rows_hydrated(self, generation, apply, result):
+        '''Store the fetched version data in *result* and call *apply* to
+        build the rows. Discard if the list has been rebuilt since.'''
+        if generation != self._hydration_generation:
+            return
+        self._hydrating = False
+        if result is not None:
+            (versions, versions_by_component) = result
+            self._versions.update(versions)
+            self._versions_by_component.update(versions_by_component)
+        apply()
+
+    def _insert_hydrated_rows(self, first, last):
+        '''Build and add the widgets of model rows *first* to *last*'''
+        self.insert_rows(first, last)
+        self._update_first_row()
+        self.refresh()
+        self.refreshed.emit()
+
+    def _on_rows_removed(self, parent, first, last):
+        '''Asset model rows *first* to *last* has been removed, remove
+        them from list'''
+        if not self._can_patch(first - last - 1):
+            self.rebuild()
+            return
+        self.remove_rows(first, last)
+        self._update_first_row()
+        self.refreshed.emit()
+
+    def _on_data_changed(self, top_left, bottom_right, *args):
+        '''Asset model rows has been changed, rebuild their widgets'''
+        if not self._can_patch(0):
+            self.rebuild()
+            return
+        self._hydrate_rows(
+            top_left.row(),
+            bottom_right.row(),
+            partial(
+                self._update_hydrated_rows, top_left.row(), bottom_right.row()
+            ),
+            'hydrate_changed_assets_thread',
+        )
+
+    def _update_hydrated_rows(self, first, last):
+        '''Rebuild the widgets of model rows *first* to *last*'''
+        self.update_rows(first, last)
+        self.refresh()
+
+    def _update_first_row(self):
+        '''Make sure only the first asset widget is styled as first'''
+        for position in range(min(2, self.layout().count())):
+            widget = self.layout().itemAt(position).widget()
+            if isinstance(widget, AssetWidget):
+                set_property(
+                    widget, 'first', 'true' if position == 0 else 'false'
+                )
+
     def rebuild(
         self,
     ):
-        '''Clear widget and add all assets again from model.'''
-        clear_layout(self.layout())
-        # TODO: Save selection state
-        for row in range(self.model.rowCount()):
-            index = self.model.createIndex(row, 0, self.model)
-            asset_info = self.model.data(index)
-            asset_widget = self._asset_widget_class(
-                index, self.model.event_manager, docked=self._docked
-            )
-            set_property(
-                asset_widget, 'first', 'true' if row == 0 else 'false'
-            )
-            asset_widget.set_asset_info(asset_info)
-            self.layout().addWidget(asset_widget)
-            asset_widget.clicked.connect(
-                partial(self.asset_clicked, asset_widget)
+        '''Clear widget and add all assets again from model, after the
+        version data for all assets has been fetched in one go.'''
+        self.clear_rows()
+        self._hydration_generation += 1
+        self._hydrating = True
+        asset_infos = [
+            self.model.data(self.model.createIndex(row, 0, self.model))
+            for row in range(self.model.rowCount())
+        ]
+        if len(asset_infos) == 0:
+            self._on_assets_hydrated(self._hydration_generation, None)
+            return
+        thread = BaseThread(
+            name='hydrate_assets_thread',
+            target=self._hydrate_async,
+            callback=partial(
+                self._on_assets_hydrated_async, self._hydration_generation
+            ),
+            target_args=[asset_infos],
+        )
+        thread.start()
+
+    def _hydrate_async(self, asset_infos):
+        '''(Background thread) Fetch the version data of all *asset_infos*
+        with a few batched queries. Returns a tuple of versions by id, and
+        lists of versions by asset id and component name.'''
+        try:
+            versions = query_in_batches(
+                self.model.session,
+                'select id, version, is_latest_version, date, asset_id, '
+                'status.name, status.color, user.first_name, user.last_name, '
+                'user.email, task.link from AssetVersion where id in ({})',
+                [
+                    asset_info[asset_constants.VERSION_ID]
+                    for asset_info in asset_infos
+                ],
             )
-            asset_widget.changeAssetVersion.connect(
-                self._on_change_asset_version
+            versions_by_component = self.model.resolve_latest_versions(
+                asset_infos
             )
+        except Exception as e:
+            self.model.logger.exception(e)
+            return None
+        return (
+            dict([(version['id'], version) for version in versions]),
+            versions_by_component,
+        )
+
+    def _on_assets_hydrated_async(self, generation, result):
+        '''(Background thread) Version data has been fetched, pass on
+        to main thread'''
+        self.assetsHydrated.emit(generation, result)
+
+    def _on_assets_hydrated(self, generation, result):
+        '''Build asset widgets from model using the fetched version data in
+        *result*, discard if a newer rebuild has been requested since.'''
+        if generation != self._hydration_generation:
+            return
+        self._hydrating = False
+        self._versions, self._versions_by_component = result or ({}, {})
+        self.clear_rows()
+        # TODO: Save selection state
+        for row in range(self.model.rowCount()):
+            self.add_row(self.model.createIndex(row, 0, self.model))
         self.refresh()
         self.refreshed.emit()
 
+    def refresh_latest_versions(self, asset_ids):
+        '''New versions has been published on *asset_ids*, resolve their
+        latest versions in background'''
+        asset_infos = [
+            asset_info
+            for asset_info in self.model.items()
+            if asset_info[asset_constants.ASSET_ID] in asset_ids
+        ]
+        if len(asset_infos) == 0:
+            return
+        thread = BaseThread(
+            name='resolve_latest_versions_thread',
+            target=self._resolve_latest_versions_async,
+            callback=self._on_latest_versions_resolved_async,
+            target_args=[asset_infos],
+        )
+        thread.start()
+
+    def _resolve_latest_versions_async(self, asset_infos):
+        '''(Background thread) Fetch the versions of *asset_infos*'''
+        try:
+            return self.model.resolve_latest_versions(asset_infos)
+        except Exception as e:
+            self.model.logger.exception(e)
+            return None
+
+    def _on_latest_versions_resolved_async(self, versions_by_component):
+        '''(Background thread) Pass on fetched versions to main thread'''
+        self.latestVersionsResolved.emit(versions_by_component)
+
+    def _on_latest_versions_resolved(self, versions_by_component):
+        '''Rebuild the rows of assets having *versions_by_component*
+        updated, flagging them as outdated'''
+        if not versions_by_component:
+            return
+        self._versions_by_component.update(versions_by_component)
+        if not self._can_patch(0):
+            return
+        for row, asset_info in enumerate(self.model.items()):
+            if (
+                asset_info[asset_constants.ASSET_ID],
+                asset_info[asset_constants.COMPONENT_NAME],
+            ) in versions_by_component:
+                self.update_rows(row, row)
+        self.refresh()
+
+    def build_widget(self, index):
+        '''(Override) Build the asset widget for model *index*'''
+        asset_info = self.model.data(index)
+        asset_widget = self._asset_widget_class(
+            index, self.model.event_manager, docked=self._docked
+        )
+        set_property(
+            asset_widget, 'first', 'true' if index.row() == 0 else 'false'
+        )
+        asset_widget.set_asset_info(
+            asset_info,
+            version=self._versions.get(asset_info[asset_constants.VERSION_ID]),
+            versions=self._versions_by_component.get(
+                (
+                    asset_info[asset_constants.ASSET_ID],
+                    asset_info[asset_constants.COMPONENT_NAME],
+                )
+            ),
+        )
+        asset_widget.clicked.connect(partial(self.asset_clicked, asset_widget))
+        asset_widget.changeAssetVersion.connect(self._on_change_asset_version)
+        return asset_widget
+
     def _on_change_asset_version(self, index, version_entity):
         '''User has commanded a change of version within the asset, propagate'''
         self.changeAssetVersion.emit(self.model.data(index), version_entity)
 
+    def get_search_values(self, index):
+        '''(Override) Match the context path, asset, component and
+        publisher of the asset at model *index*'''
+        asset_info = self.model.data(index)
+        result = [
+            asset_info[asset_constants.ASSET_NAME],
+            asset_info[asset_constants.COMPONENT_NAME],
+        ]
+        version = self._versions.get(asset_info[asset_constants.VERSION_ID])
+        if version is not None:
+            result.append(
+                ' / '.join(link['name'] for link in version['task']['link'])
+            )
+            result.extend(
+                [
+                    version['user']['first_name'],
+                    version['user']['last_name'],
+                    version['user']['email'],
+                ]
+            )
+        return result
+
     def refresh(self, search_text=None):
         '''Update asset list depending on search text'''
         if search_text is None:
             search_text = self.prev_search_text
-        for asset_widget in self.assets:
-            asset_widget.setVisible(
-                len(search_text) == 0 or asset_widget.matches(search_text)
-            )
+        self.set_search_text(search_text)
 
     def on_search(self, text):
         '''Callback on change of user search input'''
         if text != self.prev_search_text:
-            self.refresh(text.lower())
             self.prev_search_text = text
+            self.refresh(text)
 
 
 class AssetWidget(AccordionBaseWidget):
     '''Minimal widget representation of an asset(asset_info)'''
 
     changeAssetVersion = QtCore.Signal(object, object)  # User change version
+    versionsFetched = QtCore.Signal(
+        object
+    )  # Version and dependency versions has been fetched
 
     @property
     def index(self):
         '''Return the index this asset has in list'''
         return self._index
 
+    @index.setter
+    def index(self, value):
+        '''Set the index this asset has in list to *value*'''
+        self._index = value
+
     @property
     def options_widget(self):
         '''Return the widget representing options'''
@@ -565,6 +926,9 @@ class AssetWidget(AccordionBaseWidget):
         )
         self._version_id = None
         self._index = index
+        self._versions = {}
+
+        self.versionsFetched.connect(self._on_versions_fetched)
 
     def init_status_widget(self):
         '''Build the asset status widget'''
@@ -624,14 +988,17 @@ class AssetWidget(AccordionBaseWidget):
         content_layout.setContentsMargins(10, 2, 10, 2)
         content_layout.setSpacing(5)
 
-    def set_asset_info(self, asset_info):
-        '''Update widget from asset data provided in *asset_info*'''
+    def set_asset_info(self, asset_info, version=None, versions=None):
+        '''Update widget from asset data provided in *asset_info*. The
+        asset *version* entity and all *versions* of the asset component can
+        be supplied if already fetched, otherwise they are queried.'''
         self._version_id = asset_info[asset_constants.VERSION_ID]
-        version = self.session.query(
-            'select is_latest_version from AssetVersion where id={}'.format(
-                self._version_id
-            )
-        ).one()
+        if version is None:
+            version = self.session.query(
+                'select is_latest_version from AssetVersion where id={}'.format(
+                    self._version_id
+                )
+            ).one()
         # Calculate path
         parent_path = [link['name'] for link in version['task']['link']]
         self._path_widget.setText(' / '.join(parent_path))
@@ -639,16 +1006,17 @@ class AssetWidget(AccordionBaseWidget):
             '{} '.format(asset_info[asset_constants.ASSET_NAME])
         )
 
-        query = (
-            'select is_latest_version, id, asset, components, components.name, '
-            'components.id, version, asset , asset.name, asset.type.name from '
-            'AssetVersion where asset.id is "{}" and components.name is "{}"'
-            'order by version ascending'
-        ).format(
-            asset_info[asset_constants.ASSET_ID],
-            asset_info[asset_constants.COMPONENT_NAME],
-        )
-        versions = self.session.query(query).all()
+        if versions is None:
+            query = (
+                'select is_latest_version, id, asset, components, components.name, '
+                'components.id, version, asset , asset.name, asset.type.name from '
+                'AssetVersion where asset.id is "{}" and components.name is "{}"'
+                'order by version ascending'
+            ).format(
+                asset_info[asset_constants.ASSET_ID],
+                asset_info[asset_constants.COMPONENT_NAME],
+            )
+            versions = self.session.query(query).all()
 
         self._versions_collection = versions
         self._version_nr = version['version']
@@ -657,7 +1025,11 @@ class AssetWidget(AccordionBaseWidget):
 
         indicator_color = 'gray'
         self._is_loaded = asset_info.get(asset_constants.OBJECTS_LOADED)
-        self._is_latest_version = version['is_latest_version']
+        if versions:
+            # Latest version having the same component
+            self._is_latest_version = versions[-1]['id'] == version['id']
+        else:
+            self._is_latest_version = version['is_latest_version']
         if self._is_loaded:
             if self._is_latest_version:
                 indicator_color = 'green'
@@ -691,168 +1063,230 @@ class AssetWidget(AccordionBaseWidget):
             asset_constants.DEPENDENCY_IDS
         ]
 
-    def matches(self, search_text):
-        '''Do a simple match if this search text matches any asset attributes'''
-        if self._path_widget.text().lower().find(search_text) > -1:
-            return True
-        if self._asset_name_widget.text().lower().find(search_text) > -1:
-            return True
-        if (self._component_path or '').lower().find(search_text) > -1:
-            return True
-        if (
-            '{} {} {}'.format(
-                self._published_by['first_name'],
-                self._published_by['last_name'],
-                self._published_by['email'],
-            )
-        ).lower().find(search_text) > -1:
-            return True
-        return False
+    def _get_expanded_version_ids(self):
+        '''Return the ids of the version and dependency versions shown when
+        asset is expanded'''
+        result = []
+        if self._version_id is not None:
+            result.append(self._version_id)
+        for dep_version_id in self._version_dependency_ids or []:
+            if dep_version_id not in result:
+                result.append(dep_version_id)
+        return result
+
+    def _get_versions_model(self):
+        '''Return the asset list model caching versions, or None if
+        asset widget is not bound to a model'''
+        model = self.index.model() if self.index is not None else None
+        return model if hasattr(model, 'fetch_versions') else None
 
     def on_collapse(self, collapsed):
-        '''Dynamically populate asset expanded view'''
+        '''Dynamically populate asset expanded view, from versions fetched
+        in background. A placeholder is shown while fetching.'''
         # Remove all content widgets
-        for i in reversed(range(self.content.layout().count())):
-            widget = self.content.layout().itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
+        clear_layout(self.content.layout())
         if collapsed is False:
-            if self._version_id is None:
-                self.add_widget(QtWidgets.QLabel('Have no version ID!'))
-                version = None
-            else:
-                version = self.session.query(
-                    'AssetVersion where id={}'.format(self._version_id)
-                ).one()
-
-            context_widget = QtWidgets.QWidget()
-            context_widget.setLayout(QtWidgets.QHBoxLayout())
-            context_widget.layout().setContentsMargins(1, 3, 1, 3)
-            context_widget.setMaximumHeight(64)
-
-            if version:
-                # Add thumbnail
-                self._thumbnail_widget = AssetVersionThumbnail(self.session)
-                self._thumbnail_widget.load(self._version_id)
-                self._thumbnail_widget.setScaledContents(True)
-                self._thumbnail_widget.setMinimumHeight(50)
-                self._thumbnail_widget.setMaximumHeight(50)
-                self._thumbnail_widget.setMinimumWidth(90)
-                self._thumbnail_widget.setMaximumWidth(90)
-                context_widget.layout().addWidget(self._thumbnail_widget)
-
-                self._component_and_version_widget = ComponentAndVersionWidget(
-                    False
-                )
-                self._component_and_version_widget.set_component_filename(
-                    self._component_path
-                )
-                self._component_and_version_widget.set_version(
-                    self._version_nr, versions=self._versions_collection
-                )
-                self._component_and_version_widget.set_latest_version(
-                    self._is_latest_version
-                )
-                self._component_and_version_widget.version_selector.currentIndexChanged.connect(
-                    self._on_version_selected
+            version_ids = self._get_expanded_version_ids()
+            model = self._get_versions_model()
+            versions = (
+                model.get_cached_versions(version_ids)
+                if model is not None
+                else None
+            )
+            if versions is None and len(version_ids) > 0:
+                self._build_content(loading=True)
+                thread = BaseThread(
+                    name='fetch_asset_versions_thread',
+                    target=self._fetch_versions_async,
+                    callback=self._on_versions_fetched_async,
+                    target_args=[model, version_ids],
                 )
+                thread.start()
+            else:
+                self._versions = versions or {}
+                self._build_content()
+
+    def _fetch_versions_async(self, model, version_ids):
+        '''(Background thread) Fetch the versions having *version_ids*,
+        through *model* cache if available'''
+        try:
+            if model is not None:
+                return model.fetch_versions(version_ids)
+            result = dict([(version_id, None) for version_id in version_ids])
+            for version in query_in_batches(
+                self.session,
+                'select id, version, date, task, task.link, thumbnail_url '
+                'from AssetVersion where id in ({})',
+                version_ids,
+            ):
+                result[version['id']] = version
+            return result
+        except Exception as e:
+            logger.exception(e)
+            return {}
+
+    def _on_versions_fetched_async(self, versions):
+        '''(Background thread) Versions has been fetched, pass on to main
+        thread'''
+        self.versionsFetched.emit(versions)
+
+    def _on_versions_fetched(self, versions):
+        '''Versions has been fetched, populate expanded view if still
+        expanded'''
+        if not shiboken2.isValid(self) or self.collapsed:
+            return
+        self._versions = versions
+        clear_layout(self.content.layout())
+        self._build_content()
+
+    def _build_content(self, loading=False):
+        '''Populate asset expanded view from fetched versions, or with
+        placeholders if *loading*'''
+        if self._version_id is None:
+            self.add_widget(QtWidgets.QLabel('Have no version ID!'))
+            version = None
+        elif loading:
+            self.add_widget(QtWidgets.QLabel('Loading...'))
+            version = None
+        else:
+            version = self._versions.get(self._version_id)
+
+        context_widget = QtWidgets.QWidget()
+        context_widget.setLayout(QtWidgets.QHBoxLayout())
+        context_widget.layout().setContentsMargins(1, 3, 1, 3)
+        context_widget.setMaximumHeight(64)
+
+        if version:
+            # Add thumbnail
+            self._thumbnail_widget = AssetVersionThumbnail(self.session)
+            self._thumbnail_widget.load(
+                self._version_id,
+                url=get_fetched_thumbnail_url(version),
+            )
+            self._thumbnail_widget.setScaledContents(True)
+            self._thumbnail_widget.setMinimumHeight(50)
+            self._thumbnail_widget.setMaximumHeight(50)
+            self._thumbnail_widget.setMinimumWidth(90)
+            self._thumbnail_widget.setMaximumWidth(90)
+            context_widget.layout().addWidget(self._thumbnail_widget)
+
+            self._component_and_version_widget = ComponentAndVersionWidget(
+                False
+            )
+            self._component_and_version_widget.set_component_filename(
+                self._component_path
+            )
+            self._component_and_version_widget.set_version(
+                self._version_nr, versions=self._versions_collection
+            )
+            self._component_and_version_widget.set_latest_version(
+                self._is_latest_version
+            )
+            self._component_and_version_widget.version_selector.currentIndexChanged.connect(
+                self._on_version_selected
+            )
 
-                # Add context info with version selection
-                self._entity_info = EntityInfo(
-                    additional_widget=self._component_and_version_widget
-                )
-                self._entity_info.entity = version['task']['parent']
-                self._entity_info.setMinimumHeight(100)
-                context_widget.layout().addWidget(self._entity_info, 100)
-
-            self.add_widget(context_widget)
-
-            load_info_label = QtWidgets.QLabel(
-                '<html>Added as a <font color="white">{}</font> with <font color="white">'
-                '{}</font></html>'.format(
-                    self._load_mode,
-                    self._asset_info_options.get('pipeline', {}).get(
-                        'definition', '?'
-                    )
-                    if self._asset_info_options
-                    else '?',
-                )
+            # Add context info with version selection
+            self._entity_info = EntityInfo(
+                additional_widget=self._component_and_version_widget
             )
-            self.add_widget(load_info_label)
-            load_info_label.setToolTip(
-                json.dumps(self._asset_info_options, indent=2)
+            # Path of task parent, from the link fetched with version
+            self._entity_info.set_link(version['task']['link'][:-1])
+            self._entity_info.setMinimumHeight(100)
+            context_widget.layout().addWidget(self._entity_info, 100)
+
+        self.add_widget(context_widget)
+
+        load_info_label = QtWidgets.QLabel(
+            '<html>Added as a <font color="white">{}</font> with <font color="white">'
+            '{}</font></html>'.format(
+                self._load_mode,
+                self._asset_info_options.get('pipeline', {}).get(
+                    'definition', '?'
+                )
+                if self._asset_info_options
+                else '?',
             )
-            self.add_widget(
-                QtWidgets.QLabel(
-                    '<html>Published by: <font color="white">{} {}</font></html>'.format(
-                        self._published_by['first_name'],
-                        self._published_by['last_name'],
-                    )
+        )
+        self.add_widget(load_info_label)
+        load_info_label.setToolTip(
+            json.dumps(self._asset_info_options, indent=2)
+        )
+        self.add_widget(
+            QtWidgets.QLabel(
+                '<html>Published by: <font color="white">{} {}</font></html>'.format(
+                    self._published_by['first_name'],
+                    self._published_by['last_name'],
                 )
             )
-            self.add_widget(
-                QtWidgets.QLabel(
-                    '<html>Publish date: <font color="white">{}</font></html>'.format(
-                        self._published_date
-                    )
+        )
+        self.add_widget(
+            QtWidgets.QLabel(
+                '<html>Publish date: <font color="white">{}</font></html>'.format(
+                    self._published_date
                 )
             )
+        )
 
-            if 0 < len(self._version_dependency_ids or []):
-                self.add_widget(line.Line())
+        if 0 < len(self._version_dependency_ids or []):
+            self.add_widget(line.Line())
 
-                dependencies_label = QtWidgets.QLabel(
-                    'DEPENDENCIES({}):'.format(
-                        len(self._version_dependency_ids)
-                    )
+            dependencies_label = QtWidgets.QLabel(
+                'DEPENDENCIES({}):'.format(
+                    len(self._version_dependency_ids)
                 )
-                dependencies_label.setObjectName('h4')
-                self.add_widget(dependencies_label)
-
-                for dep_version_id in self._version_dependency_ids:
-                    dep_version = self.session.query(
-                        'AssetVersion where id={}'.format(dep_version_id)
-                    ).first()
-
-                    if dep_version:
-                        dep_version_widget = QtWidgets.QWidget()
-                        dep_version_widget.setLayout(QtWidgets.QHBoxLayout())
-                        dep_version_widget.setContentsMargins(20, 1, 1, 1)
-                        dep_version_widget.setMaximumHeight(64)
-
-                        dep_thumbnail_widget = AssetVersionThumbnail(
-                            self.session
-                        )
-                        dep_thumbnail_widget.load(dep_version_id)
-                        dep_thumbnail_widget.setScaledContents(True)
-                        dep_thumbnail_widget.setMinimumSize(69, 48)
-                        dep_thumbnail_widget.setMaximumSize(69, 48)
-                        dep_version_widget.layout().addWidget(
-                            dep_thumbnail_widget
-                        )
+            )
+            dependencies_label.setObjectName('h4')
+            self.add_widget(dependencies_label)
+
+            for dep_version_id in self._version_dependency_ids:
+                if loading:
+                    self.add_widget(QtWidgets.QLabel('Loading...'))
+                    continue
+                dep_version = self._versions.get(dep_version_id)
+
+                if dep_version:
+                    dep_version_widget = QtWidgets.QWidget()
+                    dep_version_widget.setLayout(QtWidgets.QHBoxLayout())
+                    dep_version_widget.setContentsMargins(20, 1, 1, 1)
+                    dep_version_widget.setMaximumHeight(64)
+
+                    dep_thumbnail_widget = AssetVersionThumbnail(
+                        self.session
+                    )
+                    dep_thumbnail_widget.load(
+                        dep_version_id,
+                        url=get_fetched_thumbnail_url(dep_version),
+                    )
+                    dep_thumbnail_widget.setScaledContents(True)
+                    dep_thumbnail_widget.setMinimumSize(69, 48)
+                    dep_thumbnail_widget.setMaximumSize(69, 48)
+                    dep_version_widget.layout().addWidget(
+                        dep_thumbnail_widget
+                    )
 
-                        # Add context info
-                        dep_entity_info = EntityInfo(
-                            additional_widget=QtWidgets.QLabel(
-                                ' - v{}'.format(dep_version['version'])
-                            )
+                    # Add context info
+                    dep_entity_info = EntityInfo(
+                        additional_widget=QtWidgets.QLabel(
+                            ' - v{}'.format(dep_version['version'])
                         )
-                        dep_entity_info.entity = dep_version['task']
-                        dep_entity_info.setMinimumHeight(100)
-                        dep_version_widget.layout().addWidget(dep_entity_info)
-
-                        self.add_widget(dep_version_widget)
-                    else:
-                        self.add_widget(
-                            QtWidgets.QLabel(
-                                'MISSING dependency '
-                                'version: {}'.format(dep_version_id)
-                            )
+                    )
+                    dep_entity_info.set_link(dep_version['task']['link'])
+                    dep_entity_info.setMinimumHeight(100)
+                    dep_version_widget.layout().addWidget(dep_entity_info)
+
+                    self.add_widget(dep_version_widget)
+                else:
+                    self.add_widget(
+                        QtWidgets.QLabel(
+                            'MISSING dependency '
+                            'version: {}'.format(dep_version_id)
                         )
+                    )
 
-                self.add_widget(line.Line())
+            self.add_widget(line.Line())
 
-            self.content.layout().addStretch()
+        self.content.layout().addStretch()
 
     def _on_version_selected(self, index):
         '''Change version of asset.'''
@@ -6,10 +6,12 @@ from Qt import QtWidgets, QtCore
 import shiboken2
 
 from ftrack_connect_pipeline_qt.ui.utility.widget.search import Search
+from ftrack_connect_pipeline_qt.ui.utility.search_index import SearchIndex
 from ftrack_connect_pipeline_qt.ui.utility.widget.base.accordion_base import (
     AccordionBaseWidget,
 )
 from ftrack_connect_pipeline_qt.ui.utility.widget import scroll_area
+from ftrack_connect_pipeline_qt.utils import clear_layout
 
 
 class AssetManagerBaseWidget(QtWidgets.QWidget):
@@ -98,11 +100,63 @@ class AssetManagerBaseWidget(QtWidgets.QWidget):
         pass
 
 
+class AssetPlaceholderWidget(QtWidgets.QWidget):
+    '''Lightweight stand-in for an asset widget that has not yet been
+    scrolled into view, holding the selection state of the asset'''
+
+    exposed = QtCore.Signal(object)  # Emitted when placeholder gets painted
+
+    @property
+    def index(self):
+        '''Return the index this asset has in list'''
+        return self._index
+
+    @index.setter
+    def index(self, value):
+        '''Set the index this asset has in list to *value*'''
+        self._index = value
+
+    @property
+    def selected(self):
+        '''Return True if asset is selected'''
+        return self._selected
+
+    def __init__(self, index, height, parent=None):
+        '''
+        Initialize asset placeholder widget
+
+        :param index: The index this asset has in list
+        :param height: The (estimated) height of the asset widget
+        :param parent: The parent dialog or frame
+        '''
+        super(AssetPlaceholderWidget, self).__init__(parent=parent)
+        self._index = index
+        self._selected = False
+        self.setMinimumHeight(height)
+        self.setMaximumHeight(height)
+
+    def set_selected(self, selected):
+        '''Set selected property to *selected*, returns True is selection changed'''
+        if self._selected == selected:
+            return False
+        self._selected = selected
+        return True
+
+    def paintEvent(self, event):
+        '''(Override) Only placeholders within view are painted, request
+        the real asset widget to be built'''
+        self.exposed.emit(self)
+
+
 class AssetListWidget(QtWidgets.QWidget):
-    '''Generic asset list view widget'''
+    '''Generic asset list view widget. If virtualized, light placeholders
+    are added for each asset and the asset widget is built when scrolled into
+    view.'''
 
     _last_clicked = None  # The asset last clicked, used for SHIFT+ selections
 
+    placeholder_height = 40  # Height of asset placeholders, if virtualized
+
     selectionUpdated = QtCore.Signal(
         object
     )  # Emitted when selection has been updated
@@ -112,23 +166,43 @@ class AssetListWidget(QtWidgets.QWidget):
     def model(self):
         return self._model
 
+    @property
+    def virtualized(self):
+        '''Return True if asset widgets are built when scrolled into view'''
+        return self._virtualized
+
     @property
     def assets(self):
-        '''Return assets added to widget'''
+        '''Return assets added to widget, not including placeholders'''
         for i in range(self.layout().count()):
             widget = self.layout().itemAt(i).widget()
             if widget and isinstance(widget, AccordionBaseWidget):
                 yield widget
 
-    def __init__(self, model, parent=None):
+    @property
+    def rows(self):
+        '''Return asset widgets and placeholders added to widget'''
+        for i in range(self.layout().count()):
+            widget = self.layout().itemAt(i).widget()
+            if widget and isinstance(
+                widget, (AccordionBaseWidget, AssetPlaceholderWidget)
+            ):
+                yield widget
+
+    def __init__(self, model, virtualized=False, parent=None):
         '''
         Initialize asset list widget
 
         :param model: :class:`~ftrack_connect_pipeline_qt.ui.asset_manager.model.AssetListModel` instance
+        :param virtualized: If True, build asset widgets first when they are scrolled into view
         :param parent:  The parent dialog or frame
         '''
         super(AssetListWidget, self).__init__(parent=parent)
         self._model = model
+        self._virtualized = virtualized
+        self._exposed_placeholders = []
+        self._row_widgets = None  # Model row -> widget, built when needed
+        self._search_index = SearchIndex()
         self.was_clicked = False
 
         self.pre_build()
@@ -141,22 +215,164 @@ class AssetListWidget(QtWidgets.QWidget):
         self.layout().setSpacing(0)
 
     def build(self):
-        pass
+        self._materialize_timer = QtCore.QTimer(self)
+        self._materialize_timer.setSingleShot(True)
+        self._materialize_timer.setInterval(0)
 
     def post_build(self):
-        pass
+        self._materialize_timer.timeout.connect(self._materialize_exposed)
 
     def rebuild(self):
         '''Clear widget and add all assets again from model. Should be overridden by child'''
         raise NotImplementedError()
 
+    def build_widget(self, index):
+        '''Build and return the asset widget for model *index*. Should be
+        overridden by child'''
+        raise NotImplementedError()
+
+    def get_search_values(self, index):
+        '''Return the values of the asset at model *index* that search
+        should match, can be overridden by child'''
+        return []
+
+    def set_search_text(self, text):
+        '''Filter assets on search *text*, only showing or hiding the rows
+        which match state changed'''
+        for row in self._search_index.set_query(text):
+            widget = self._get_row_widget(row)
+            if widget is not None:
+                widget.setVisible(self._search_index.matches(row))
+
+    def clear_rows(self):
+        '''Remove all widgets from list'''
+        clear_layout(self.layout())
+        self._row_widgets = None
+        self._search_index.clear()
+
+    def add_row(self, index, position=-1):
+        '''Add the asset at model *index* to list at layout *position*, as
+        a placeholder if virtualized. Returns the added widget.'''
+        if self._virtualized:
+            widget = AssetPlaceholderWidget(index, self.placeholder_height)
+            widget.exposed.connect(self._on_placeholder_exposed)
+        else:
+            widget = self.build_widget(index)
+        if not self._search_index.insert(
+            index.row(), self.get_search_values(index)
+        ):
+            widget.setVisible(False)
+        self.layout().insertWidget(position, widget)
+        if self._row_widgets is not None:
+            self._row_widgets[index.row()] = widget
+        return widget
+
+    def materialize(self, widget):
+        '''Replace *widget* with the real asset widget if it is a
+        placeholder, preserving selection and visibility. Returns the asset
+        widget.'''
+        if not isinstance(widget, AssetPlaceholderWidget):
+            return widget
+        return self._replace_widget(widget, self.build_widget(widget.index))
+
+    def _replace_widget(self, widget, asset_widget):
+        '''Replace *widget* with *asset_widget* in list, preserving
+        selection and visibility. Returns the asset widget.'''
+        if widget.selected:
+            asset_widget.set_selected(True)
+        asset_widget.setVisible(not widget.isHidden())
+        self.layout().replaceWidget(widget, asset_widget)
+        if self._last_clicked is widget:
+            self._last_clicked = asset_widget
+        if self._row_widgets is not None:
+            self._row_widgets[asset_widget.index.row()] = asset_widget
+        widget.deleteLater()
+        return asset_widget
+
+    def insert_rows(self, first, last):
+        '''Add widgets for model rows *first* to *last*, shifting the
+        following rows'''
+        self._row_widgets = None
+        for row in range(first, last + 1):
+            self.add_row(self.model.createIndex(row, 0, self.model), row)
+        self._update_indexes(last + 1)
+
+    def remove_rows(self, first, last):
+        '''Remove widgets of model rows *first* to *last*, shifting the
+        following rows'''
+        selection_asset_data_changed = False
+        self._row_widgets = None
+        self._search_index.remove(first, last)
+        for row in range(last, first - 1, -1):
+            widget = self.layout().takeAt(row).widget()
+            if widget is None:
+                continue
+            if widget.selected:
+                selection_asset_data_changed = True
+            if self._last_clicked is widget:
+                self._last_clicked = None
+            widget.deleteLater()
+        self._update_indexes(first)
+        if selection_asset_data_changed:
+            selection = self.selection()
+            if selection is not None:
+                self.selectionUpdated.emit(selection)
+
+    def update_rows(self, first, last):
+        '''Rebuild widgets of model rows *first* to *last*, placeholders
+        are left as they build from model when exposed'''
+        for row in range(first, last + 1):
+            widget = self._get_row_widget(row)
+            if widget is None:
+                continue
+            if self._search_index.update(
+                row, self.get_search_values(widget.index)
+            ):
+                widget.setVisible(self._search_index.matches(row))
+            if isinstance(widget, AssetPlaceholderWidget):
+                continue
+            self._replace_widget(widget, self.build_widget(widget.index))
+
+    def _update_indexes(self, first):
+        '''Update the model index of list widgets from position *first*,
+        after rows has been inserted or removed'''
+        for position in range(
+            first, min(self.layout().count(), self.model.rowCount())
+        ):
+            widget = self.layout().itemAt(position).widget()
+            if widget is not None and widget.index.row() != position:
+                widget.index = self.model.createIndex(position, 0, self.model)
+
+    def materialize_all(self):
+        '''Replace all placeholders with real asset widgets'''
+        for widget in list(self.rows):
+            self.materialize(widget)
+
+    def _on_placeholder_exposed(self, placeholder):
+        '''A placeholder has been scrolled into view, build the asset
+        widget after painting is done'''
+        if placeholder not in self._exposed_placeholders:
+            self._exposed_placeholders.append(placeholder)
+        self._materialize_timer.start()
+
+    def _materialize_exposed(self):
+        '''Build asset widgets for all placeholders that has been exposed'''
+        placeholders = self._exposed_placeholders
+        self._exposed_placeholders = []
+        for placeholder in placeholders:
+            if (
+                shiboken2.isValid(placeholder)
+                and self.layout().indexOf(placeholder) > -1
+            ):
+                self.materialize(placeholder)
+
     def selection(self, as_widgets=False):
         '''Return list of asset infos or asset widgets if *as_widgets* is True'''
         result = []
-        for widget in self.assets:
+        for widget in list(self.rows):
             if widget.selected:
                 if as_widgets:
-                    result.append(widget)
+                    result.append(self.materialize(widget))
                 else:
                     data = self.model.data(widget.index)
                     if data is None:
@@ -170,7 +386,7 @@ class AssetListWidget(QtWidgets.QWidget):
         if not shiboken2.isValid(self):
             return
         selection_asset_data_changed = False
-        for asset_widget in self.assets:
+        for asset_widget in self.rows:
             if asset_widget.set_selected(False):
                 selection_asset_data_changed = True
         if selection_asset_data_changed:
@@ -206,7 +422,7 @@ class AssetListWidget(QtWidgets.QWidget):
                 end_row = max(
                     self._last_clicked.index.row(), asset_widget.index.row()
                 )
-                for widget in self.assets:
+                for widget in self.rows:
                     if start_row <= widget.index.row() <= end_row:
                         if widget.set_selected(True):
                             selection_asset_data_changed = True
@@ -220,11 +436,23 @@ class AssetListWidget(QtWidgets.QWidget):
             if selection is not None:
                 self.selectionUpdated.emit(selection)
 
+    def _get_row_widget(self, row):
+        '''Return the asset widget or placeholder at model *row*'''
+        if self._row_widgets is None:
+            self._row_widgets = dict(
+                [(widget.index.row(), widget) for widget in self.rows]
+            )
+        widget = self._row_widgets.get(row)
+        if widget is not None and not shiboken2.isValid(widget):
+            self._row_widgets = None
+            return self._get_row_widget(row)
+        return widget
+
     def get_widget(self, index):
         '''Return the asset widget representation at *index*'''
-        for widget in self.assets:
-            if widget.index.row() == index.row():
-                return widget
+        widget = self._get_row_widget(index.row())
+        if widget is not None:
+            return self.materialize(widget)
 
     def mousePressEvent(self, event):
         '''Consume this event, so parent client does not de-select all'''
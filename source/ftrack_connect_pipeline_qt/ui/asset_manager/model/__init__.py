@@ -1,19 +1,19 @@
 # :coding: utf-8
 # :copyright: Copyright (c) 2014-2022 ftrack
 import platform
+import threading
 
 from Qt import QtCore
 
 import logging
 
 from ftrack_connect_pipeline.constants import asset as asset_const
+from ftrack_connect_pipeline_qt.utils import query_in_batches
 
 
 class AssetListModel(QtCore.QAbstractTableModel):
     '''Custom asset list model holding asset info data'''
 
-    __asset_entities_list = []  # Model data storage
-
     @property
     def event_manager(self):
         '''Return :class:`~ftrack_connect_pipeline.event.EventManager` instance'''
@@ -35,11 +35,49 @@ class AssetListModel(QtCore.QAbstractTableModel):
         )
         super(AssetListModel, self).__init__()
         self._event_manager = event_manager
+        self.__asset_entities_list = []  # Model data storage
+        self._rows_by_id = None  # Asset info id -> row, built when needed
+        self._versions = {}  # Version id -> version (None if missing)
+        self._versions_lock = threading.Lock()
+        self._latest_versions = {}  # (Asset id, component name) -> version
+
+    def _get_rows_by_id(self):
+        '''Return the mapping of asset info id to row, build it if model
+        has been reset since last lookup'''
+        if self._rows_by_id is None:
+            self._rows_by_id = dict(
+                [
+                    (asset_info[asset_const.ASSET_INFO_ID], row)
+                    for row, asset_info in enumerate(
+                        self.__asset_entities_list
+                    )
+                ]
+            )
+        return self._rows_by_id
+
+    def _unindex_rows(self, first, last):
+        '''Drop rows *first* to *last*, about to be removed, from the
+        mapping of asset info id to row'''
+        if self._rows_by_id is None:
+            return
+        for asset_info in self.__asset_entities_list[first : last + 1]:
+            self._rows_by_id.pop(asset_info[asset_const.ASSET_INFO_ID], None)
+
+    def _index_rows(self, first):
+        '''Update the mapping of asset info id to row for rows from
+        *first*, shifted by an insert or remove'''
+        if self._rows_by_id is None:
+            return
+        for row in range(first, len(self.__asset_entities_list)):
+            self._rows_by_id[
+                self.__asset_entities_list[row][asset_const.ASSET_INFO_ID]
+            ] = row
 
     def reset(self):
         '''Empty model'''
         self.beginResetModel()
         self.__asset_entities_list = []
+        self._rows_by_id = None
         self.endResetModel()
 
     def rowCount(self, index=QtCore.QModelIndex):
@@ -64,23 +102,93 @@ class AssetListModel(QtCore.QAbstractTableModel):
     def insertRows(self, row, data, index=None):
         '''Insert *data* at *index* (or *row* if no index defined)'''
         count = len(data)
-        self.beginInsertRows(
-            index or self.createIndex(row, 0), row, row + count - 1
-        )
+        if index is not None:
+            row = index.row()
+        self.beginInsertRows(QtCore.QModelIndex(), row, row + count - 1)
+        first = min(row, len(self.__asset_entities_list))
         for n in range(count):
             if row + n < len(self.__asset_entities_list):
                 self.__asset_entities_list.insert(row + n, data[n])
             else:
                 self.__asset_entities_list.append(data[n])
+        self._index_rows(first)
         self.endInsertRows()
 
+    def reconcile(self, asset_infos, key=None):
+        '''
+        Update model to hold *asset_infos*, comparing them by asset info id
+        with current data, or the identity returned by *key* if given. Only
+        rows removed, inserted or changed are signaled, model is reset if the
+        order of remaining assets has changed.
+        '''
+        if key is None:
+            key = lambda asset_info: asset_info[asset_const.ASSET_INFO_ID]
+        new_asset_infos = []
+        new_ids = set()
+        for asset_info in asset_infos:
+            asset_info_id = key(asset_info)
+            if asset_info_id not in new_ids:
+                new_ids.add(asset_info_id)
+                new_asset_infos.append(asset_info)
+
+        # Remove rows no longer present, in contiguous ranges from the end
+        row = len(self.__asset_entities_list) - 1
+        while row >= 0:
+            if key(self.__asset_entities_list[row]) in new_ids:
+                row -= 1
+                continue
+            last = row
+            while (
+                row > 0
+                and key(self.__asset_entities_list[row - 1]) not in new_ids
+            ):
+                row -= 1
+            self.beginRemoveRows(QtCore.QModelIndex(), row, last)
+            self._unindex_rows(row, last)
+            del self.__asset_entities_list[row : last + 1]
+            self._index_rows(row)
+            self.endRemoveRows()
+            row -= 1
+
+        current_ids = [
+            key(asset_info) for asset_info in self.__asset_entities_list
+        ]
+        current_rows = set(current_ids)
+        if [
+            key(asset_info)
+            for asset_info in new_asset_infos
+            if key(asset_info) in current_rows
+        ] != current_ids:
+            # Assets has been reordered
+            self.beginResetModel()
+            self.__asset_entities_list = new_asset_infos
+            self._rows_by_id = None
+            self.endResetModel()
+            return
+
+        # Update changed rows and insert new ones, in contiguous ranges
+        row = 0
+        while row < len(new_asset_infos):
+            asset_info = new_asset_infos[row]
+            if key(asset_info) in current_rows:
+                if self.__asset_entities_list[row] != asset_info:
+                    self.__asset_entities_list[row] = asset_info
+                    index = self.createIndex(row, 0)
+                    self.dataChanged.emit(index, index)
+                row += 1
+                continue
+            first = row
+            while (
+                row + 1 < len(new_asset_infos)
+                and key(new_asset_infos[row + 1]) not in current_rows
+            ):
+                row += 1
+            self.insertRows(first, new_asset_infos[first : row + 1])
+            row += 1
+
     def getIndex(self, asset_info_id):
         '''Return index of asset having id provided in *asset_info_id*'''
-        row = -1
-        for _row, asset_info in enumerate(self.__asset_entities_list):
-            if asset_info[asset_const.ASSET_INFO_ID] == asset_info_id:
-                row = _row
-                break
+        row = self._get_rows_by_id().get(asset_info_id, -1)
         if row == -1:
             self.logger.warning(
                 'No asset info found for id {}'.format(asset_info_id)
@@ -90,9 +198,9 @@ class AssetListModel(QtCore.QAbstractTableModel):
 
     def getDataById(self, asset_info_id):
         '''Return asset info of asset having id provided in *asset_info_id*'''
-        for index, asset_info in enumerate(self.__asset_entities_list):
-            if asset_info[asset_const.ASSET_INFO_ID] == asset_info_id:
-                return asset_info
+        row = self._get_rows_by_id().get(asset_info_id)
+        if row is not None:
+            return self.__asset_entities_list[row]
         self.logger.warning(
             'No asset info found for id {}'.format(asset_info_id)
         )
@@ -100,17 +208,119 @@ class AssetListModel(QtCore.QAbstractTableModel):
 
     def setData(self, index, asset_info, silent=False, roles=None):
         '''Store the *asset_info* at *index*'''
+        if self._rows_by_id is not None:
+            previous_asset_info = self.__asset_entities_list[index.row()]
+            self._rows_by_id.pop(
+                previous_asset_info[asset_const.ASSET_INFO_ID], None
+            )
+            self._rows_by_id[asset_info[asset_const.ASSET_INFO_ID]] = (
+                index.row()
+            )
         self.__asset_entities_list[index.row()] = asset_info
         if not silent:
             self.dataChanged.emit(index, index)
 
     def removeRows(self, index, count=1):
         '''Remove *count* rows starting at *index*'''
-        self.beginRemoveRows(index, index.row(), count)
+        self.beginRemoveRows(
+            QtCore.QModelIndex(), index.row(), index.row() + count - 1
+        )
+        self._unindex_rows(index.row(), index.row() + count - 1)
         for n in range(count):
             self.__asset_entities_list.pop(index.row())
+        self._index_rows(index.row())
         self.endRemoveRows()
 
+    def get_cached_versions(self, version_ids):
+        '''Return a dict of versions having *version_ids*, mapping missing
+        versions to None. Return None if any version has not been fetched.'''
+        with self._versions_lock:
+            if any(
+                version_id not in self._versions for version_id in version_ids
+            ):
+                return None
+            return dict(
+                [
+                    (version_id, self._versions[version_id])
+                    for version_id in version_ids
+                ]
+            )
+
+    def fetch_versions(self, version_ids):
+        '''(Background thread) Return a dict of versions having
+        *version_ids*, fetching the ones not cached in batched queries together
+        with their context path, as task link.'''
+        with self._versions_lock:
+            missing_ids = [
+                version_id
+                for version_id in version_ids
+                if version_id not in self._versions
+            ]
+        if len(missing_ids) > 0:
+            versions = query_in_batches(
+                self.session,
+                'select id, version, date, user.first_name, user.last_name, '
+                'task, task.name, task.link, thumbnail_url from '
+                'AssetVersion where id in ({})',
+                missing_ids,
+            )
+            with self._versions_lock:
+                for version_id in missing_ids:
+                    self._versions[version_id] = None
+                for version in versions:
+                    self._versions[version['id']] = version
+        return self.get_cached_versions(version_ids)
+
+    def resolve_latest_versions(self, asset_infos):
+        '''(Background thread) Fetch all versions of the assets in
+        *asset_infos* having the same component, in batched queries. Cache
+        the latest compatible version per asset id and component name.
+        Returns the versions by asset id and component name, sorted by
+        version number.'''
+        asset_versions = query_in_batches(
+            self.session,
+            'select id, version, is_latest_version, asset_id, '
+            'components.name from AssetVersion where asset_id in ({})',
+            [asset_info[asset_const.ASSET_ID] for asset_info in asset_infos],
+        )
+        versions_by_component = {}
+        for asset_version in sorted(
+            asset_versions, key=lambda _version: _version['version']
+        ):
+            for component in asset_version['components']:
+                versions_by_component.setdefault(
+                    (asset_version['asset_id'], component['name']), []
+                ).append(asset_version)
+        with self._versions_lock:
+            for key, versions in versions_by_component.items():
+                self._latest_versions[key] = versions[-1]
+        return versions_by_component
+
+    def get_latest_version(self, asset_info):
+        '''Return the cached latest version compatible with *asset_info*,
+        None if not resolved'''
+        with self._versions_lock:
+            return self._latest_versions.get(
+                (
+                    asset_info[asset_const.ASSET_ID],
+                    asset_info[asset_const.COMPONENT_NAME],
+                )
+            )
+
+    def get_update_plan(self, asset_infos):
+        '''Return a dict of asset info id to the latest compatible version
+        for each of the *asset_infos* not being at latest version, and a list
+        of asset infos which latest version has not been resolved.'''
+        plan = {}
+        unresolved = []
+        for asset_info in asset_infos:
+            latest_version = self.get_latest_version(asset_info)
+            if latest_version is None:
+                unresolved.append(asset_info)
+            elif latest_version['id'] != asset_info[asset_const.VERSION_ID]:
+                plan[asset_info[asset_const.ASSET_INFO_ID]] = latest_version
+        return plan, unresolved
+
     def flags(self, index):
         '''Return flags at *index*'''
         if not index.isValid():
@@ -0,0 +1,149 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014-2023 ftrack
+import logging
+import threading
+
+from Qt import QtCore
+
+
+class LocalEventSource(object):
+    '''Stand-in for :class:`ftrack_api.event.hub.EventHub`, delivering
+    events published locally to subscribers of their topic. Used to drive
+    the tracker without an event server.'''
+
+    def __init__(self):
+        '''Initialise LocalEventSource'''
+        self._subscribers = {}
+        self._next_id = 0
+
+    def subscribe(self, subscription, callback):
+        '''Subscribe *callback* to events matching *subscription*, on the
+        form "topic=<topic>". Return the subscriber identifier.'''
+        self._next_id += 1
+        topic = subscription.split('=', 1)[-1].strip()
+        self._subscribers[self._next_id] = (topic, callback)
+        return self._next_id
+
+    def unsubscribe(self, subscriber_identifier):
+        '''Remove subscriber having *subscriber_identifier*'''
+        self._subscribers.pop(subscriber_identifier, None)
+
+    def publish(self, event):
+        '''Deliver *event* to the subscribers of its topic'''
+        for topic, callback in list(self._subscribers.values()):
+            if topic == event['topic']:
+                callback(event)
+
+
+class LatestVersionTracker(QtCore.QObject):
+    '''
+    Track publishes of new versions of the assets in the scene, by
+    subscribing to entity update events through the session event hub.
+    Events are collected and emitted debounced, filtered to the tracked
+    asset ids.
+    '''
+
+    TOPIC = 'ftrack.update'
+
+    versionsPublished = QtCore.Signal(
+        object
+    )  # Versions has been published/updated on the asset ids provided
+    eventReceived = QtCore.Signal()  # Update event received in background
+
+    @property
+    def asset_ids(self):
+        '''Return the asset ids being tracked'''
+        return self._asset_ids
+
+    @asset_ids.setter
+    def asset_ids(self, value):
+        '''Track the asset ids in *value*'''
+        with self._lock:
+            self._asset_ids = frozenset(value)
+
+    @property
+    def running(self):
+        '''Return True if subscribed to update events'''
+        return self._subscriber_id is not None
+
+    def __init__(self, event_source, debounce_interval=2000, parent=None):
+        '''
+        Initialise LatestVersionTracker
+
+        :param event_source: The event hub to subscribe to, usually session.event_hub or a :class:`LocalEventSource`
+        :param debounce_interval: Time in milliseconds to collect events before emitting
+        :param parent: The parent object
+        '''
+        super(LatestVersionTracker, self).__init__(parent=parent)
+
+        self.logger = logging.getLogger(
+            __name__ + '.' + self.__class__.__name__
+        )
+
+        self._event_source = event_source
+        self._subscriber_id = None
+        self._asset_ids = frozenset()
+        self._pending_asset_ids = set()
+        self._lock = threading.Lock()
+
+        self._debounce_timer = QtCore.QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce_interval)
+        self._debounce_timer.timeout.connect(self._flush)
+        self.eventReceived.connect(self._on_event_received)
+
+    def start(self):
+        '''Subscribe to update events, once'''
+        if self._subscriber_id is not None:
+            return
+        self._subscriber_id = self._event_source.subscribe(
+            'topic={}'.format(self.TOPIC), self._on_update_event
+        )
+        self.logger.debug('Tracking new asset versions')
+
+    def stop(self):
+        '''Unsubscribe to update events and drop pending ones'''
+        if self._subscriber_id is None:
+            return
+        try:
+            self._event_source.unsubscribe(self._subscriber_id)
+        except Exception as e:
+            self.logger.warning(
+                'Could not unsubscribe to update events: {}'.format(e)
+            )
+        self._subscriber_id = None
+        self._debounce_timer.stop()
+        with self._lock:
+            self._pending_asset_ids.clear()
+
+    def _on_update_event(self, event):
+        '''(Event hub thread) Collect the tracked asset ids having a version
+        created or updated in *event*'''
+        asset_ids = set()
+        for entity in (event.get('data') or {}).get('entities') or []:
+            if (entity.get('entityType') or '').lower() != 'assetversion':
+                continue
+            if entity.get('action') not in ['add', 'update']:
+                continue
+            for parent in entity.get('parents') or []:
+                if (parent.get('entityType') or '').lower() == 'asset':
+                    asset_ids.add(parent.get('entityId'))
+        with self._lock:
+            asset_ids = asset_ids.intersection(self._asset_ids)
+            if len(asset_ids) == 0:
+                return
+            self._pending_asset_ids.update(asset_ids)
+        self.eventReceived.emit()
+
+    def _on_event_received(self):
+        '''Start emit timer, if not already started'''
+        if not self._debounce_timer.isActive():
+            self._debounce_timer.start()
+
+    def _flush(self):
+        '''Emit the asset ids collected since last flush'''
+        with self._lock:
+            asset_ids = self._pending_asset_ids
+            self._pending_asset_ids = set()
+        if len(asset_ids) > 0:
+            self.versionsPublished.emit(asset_ids)
@@ -47,6 +47,12 @@ class WidgetFactoryBase(QtWidgets.QWidget):
     host_types = None
     ui_types = None
 
+    # Plugin widget discovery result, True if resolved or False if not found,
+    # by (plugin_name, plugin_type, host_type, ui_type) - shared among
+    # factories
+    _plugin_widget_cache = {}
+    _plugin_widget_cache_host_id = None
+
     @property
     def widgets(self):
         '''Return registered plugin's widgets.'''
@@ -61,15 +67,31 @@ class WidgetFactoryBase(QtWidgets.QWidget):
     def host_connection(self, host_connection):
         '''Sets :obj:`host_connection` with the given *host_connection*'''
         self._host_connection = host_connection
+        if (
+            host_connection is not None
+            and host_connection.id
+            != WidgetFactoryBase._plugin_widget_cache_host_id
+        ):
+            # Another host, plugins might differ
+            WidgetFactoryBase.clear_plugin_widget_cache()
+            WidgetFactoryBase._plugin_widget_cache_host_id = (
+                host_connection.id
+            )
+
+    @staticmethod
+    def clear_plugin_widget_cache():
+        '''Forget resolved plugin widgets, should be called when plugins
+        has been (re-)discovered'''
+        WidgetFactoryBase._plugin_widget_cache.clear()
 
     @property
     def batch_id(self):
-        '''Return the id of the current batch item/version'''
+        '''Return the id of the current batch item/component'''
         return self._batch_id
 
     @batch_id.setter
     def batch_id(self, value):
-        '''(Batch) Set the current ID of the current batch item/version'''
+        '''(Batch) Set the current ID of the current batch item/component'''
         self._batch_id = value
 
     @property
@@ -561,6 +583,14 @@ class WidgetFactoryBase(QtWidgets.QWidget):
         result = None
         for host_type in reversed(self.host_connection.host_types):
             for _ui_type in reversed(self.ui_types):
+                cache_key = (plugin_name, plugin_type, host_type, _ui_type)
+                if (
+                    WidgetFactoryBase._plugin_widget_cache.get(cache_key)
+                    is False
+                ):
+                    # Known miss, only run the plugin resolved
+                    continue
+
                 data = {
                     'pipeline': {
                         'plugin_name': plugin_name,
@@ -588,7 +618,19 @@ class WidgetFactoryBase(QtWidgets.QWidget):
                 )
 
                 if result:
+                    widget = None
+                    if (
+                        result[0].get('status')
+                        == core_constants.SUCCESS_STATUS
+                        and result[0].get('result')
+                    ):
+                        widget = list(result[0]['result'].values())[0]
+                    if isinstance(widget, BaseOptionsWidget):
+                        WidgetFactoryBase._plugin_widget_cache[
+                            cache_key
+                        ] = True
                     return result
+                WidgetFactoryBase._plugin_widget_cache[cache_key] = False
 
     def _update_progress_widget_async(self, event):
         self.updateProgressWidget.emit(event)
@@ -93,7 +93,7 @@ class AssemblerWidgetFactory(OpenerAssemblerWidgetFactoryBase):
                     self.progress_widget.add_step(
                         step_type,
                         step_name,
-                        batch_id=component['version']['id'],
+                        batch_id=component['id'],
                     )
             else:
                 for stage in step.get_all(category=core_constants.STAGE):
@@ -102,7 +102,7 @@ class AssemblerWidgetFactory(OpenerAssemblerWidgetFactoryBase):
                         self.progress_widget.add_step(
                             step_type,
                             stage_name,
-                            batch_id=component['version']['id'],
+                            batch_id=component['id'],
                         )
 
     def check_components(self, asset_version_entity):
@@ -316,6 +316,7 @@ class BatchProgressWidget(ProgressWidgetObject):
     def __init__(
         self, name, fragment_data, status_view_mode=None, parent=None
     ):
+        self._version_widgets = {}  # Component id -> (status, cancel)
         super(BatchProgressWidget, self).__init__(
             name,
             fragment_data,
@@ -323,16 +324,56 @@ class BatchProgressWidget(ProgressWidgetObject):
             parent=parent,
         )
 
-    def add_version(self, component):
-        version_widget = QtWidgets.QLabel(
+    def add_version(self, component, on_cancel=None):
+        '''Add header of *component* to the progress widget, with a cancel
+        button calling *on_cancel* if provided'''
+        version_widget = QtWidgets.QWidget()
+        version_widget.setLayout(QtWidgets.QHBoxLayout())
+        version_widget.layout().setContentsMargins(0, 0, 0, 0)
+        version_widget.layout().setSpacing(5)
+        label = QtWidgets.QLabel(
             '{} | {}'.format(
                 str_version(component['version']).replace('/', ' | '),
                 component['name'],
             )
         )
-        version_widget.setObjectName('h2')
+        label.setObjectName('h2')
+        version_widget.layout().addWidget(label)
+        version_widget.layout().addStretch()
+        status_label = QtWidgets.QLabel()
+        status_label.setObjectName('gray')
+        version_widget.layout().addWidget(status_label)
+        cancel_button = None
+        if on_cancel is not None:
+            cancel_button = (
+                ftrack_connect_pipeline_qt.ui.utility.widget.button.RemoveButton(
+                    'CANCEL'
+                )
+            )
+            cancel_button.clicked.connect(on_cancel)
+            version_widget.layout().addWidget(cancel_button)
+        self._version_widgets[component['id']] = (
+            status_label,
+            cancel_button,
+        )
         self.content_widget.layout().addWidget(version_widget)
 
+    def set_version_status(self, batch_id, message, cancellable=False):
+        '''Set the status *message* of component having *batch_id*, and
+        if it still can be cancelled'''
+        if batch_id not in self._version_widgets:
+            return
+        (status_label, cancel_button) = self._version_widgets[batch_id]
+        if shiboken2.isValid(status_label):
+            status_label.setText(message)
+        if cancel_button is not None and shiboken2.isValid(cancel_button):
+            cancel_button.setVisible(cancellable)
+
+    def clear_components(self):
+        '''(Override)'''
+        super(BatchProgressWidget, self).clear_components()
+        self._version_widgets = {}
+
     def add_item(self, item):
         item_widget = QtWidgets.QLabel(item)
         item_widget.setObjectName('h2')
@@ -10,6 +10,10 @@ import logging
 from Qt import QtWidgets, QtCore, QtCompat, QtGui
 
 from ftrack_connect_pipeline.configure_logging import get_log_directory
+from ftrack_connect_pipeline_qt.ui.log_viewer.model.log_file import (
+    LogFileModel,
+)
+from ftrack_connect_pipeline_qt.ui.utility.widget.search import Search
 from ftrack_connect_pipeline_qt.ui.utility.widget.circular_button import (
     CircularButton,
 )
@@ -18,12 +22,16 @@ from ftrack_connect_pipeline_qt.ui.utility.widget.circular_button import (
 class FileLogViewerWidget(QtWidgets.QWidget):
     '''Main widget of the file log viewer'''
 
+    FOLLOW_INTERVAL = 2000  # Check for appended lines when following (ms)
+
     def __init__(self, parent=None):
         '''Initialise FileLogViewerWidget with *parent*'''
         super(FileLogViewerWidget, self).__init__(parent=parent)
 
         self.logger = logging.getLogger(__name__)
 
+        self._search_pending = False
+
         self.pre_build()
         self.build()
         self.post_build()
@@ -48,18 +56,60 @@ class FileLogViewerWidget(QtWidgets.QWidget):
 
         self.layout().addLayout(toolbar_layout)
 
-        self._content_textarea = QtWidgets.QTextEdit()
-        self._content_textarea.setFontFamily('Courier New')
-        self._content_textarea.setReadOnly(True)
-        self._content_textarea.setLineWrapMode(QtWidgets.QTextEdit.NoWrap)
-        self._content_textarea.setHorizontalScrollBarPolicy(
+        search_layout = QtWidgets.QHBoxLayout()
+        search_layout.setContentsMargins(5, 0, 5, 0)
+        search_layout.setSpacing(5)
+
+        self._search = Search(collapsed=False, collapsable=False)
+        search_layout.addWidget(self._search, 10)
+
+        self._previous_match_button = CircularButton('keyboard_arrow_up')
+        self._previous_match_button.setToolTip('Previous match')
+        search_layout.addWidget(self._previous_match_button)
+
+        self._next_match_button = CircularButton('keyboard_arrow_down')
+        self._next_match_button.setToolTip('Next match')
+        search_layout.addWidget(self._next_match_button)
+
+        self._end_button = CircularButton('vertical_align_bottom')
+        self._end_button.setToolTip('Jump to end')
+        search_layout.addWidget(self._end_button)
+
+        self._follow_checkbox = QtWidgets.QCheckBox('Follow')
+        self._follow_checkbox.setToolTip(
+            'Keep reading lines appended to log file and show them'
+        )
+        search_layout.addWidget(self._follow_checkbox)
+
+        self.layout().addLayout(search_layout)
+
+        self._status_label = QtWidgets.QLabel()
+        self._status_label.setWordWrap(True)
+        self.layout().addWidget(self._status_label)
+
+        self._content_model = LogFileModel(self)
+
+        self._content_view = QtWidgets.QListView()
+        self._content_view.setFont(QtGui.QFont('Courier New'))
+        self._content_view.setUniformItemSizes(True)
+        self._content_view.setEditTriggers(
+            QtWidgets.QAbstractItemView.NoEditTriggers
+        )
+        self._content_view.setSelectionMode(
+            QtWidgets.QAbstractItemView.ExtendedSelection
+        )
+        self._content_view.setHorizontalScrollBarPolicy(
             QtCore.Qt.ScrollBarAlwaysOn
         )
-        self._content_textarea.setVerticalScrollBarPolicy(
+        self._content_view.setVerticalScrollBarPolicy(
             QtCore.Qt.ScrollBarAlwaysOn
         )
+        self._content_view.setModel(self._content_model)
+
+        self.layout().addWidget(self._content_view, 100)
 
-        self.layout().addWidget(self._content_textarea, 100)
+        self._follow_timer = QtCore.QTimer(self)
+        self._follow_timer.setInterval(self.FOLLOW_INTERVAL)
 
         self.open_log_folder_button = QtWidgets.QPushButton(
             'Open log directory'
@@ -76,6 +126,17 @@ class FileLogViewerWidget(QtWidgets.QWidget):
         self._files_combobox.currentIndexChanged.connect(
             self._on_file_index_changed
         )
+        self._search.inputUpdated.connect(self._on_search)
+        self._previous_match_button.clicked.connect(
+            self._on_previous_match_clicked
+        )
+        self._next_match_button.clicked.connect(self._on_next_match_clicked)
+        self._end_button.clicked.connect(self._content_view.scrollToBottom)
+        self._follow_checkbox.toggled.connect(self._on_follow_toggled)
+        self._follow_timer.timeout.connect(self._content_model.update)
+        self._content_model.rowsInserted.connect(self._on_rows_inserted)
+        self._content_model.searchDone.connect(self._on_search_done)
+        self._content_model.indexingDone.connect(self._on_indexing_done)
 
     def refresh_ui(self):
         '''Find all log files in log directory'''
@@ -89,15 +150,9 @@ class FileLogViewerWidget(QtWidgets.QWidget):
         if os.path.exists(log_directory_path):
             try:
                 files = []
-                for filename in os.listdir(log_directory_path):
-                    files.append(
-                        (
-                            filename,
-                            os.path.getmtime(
-                                os.path.join(log_directory_path, filename)
-                            ),
-                        )
-                    )
+                for entry in os.scandir(log_directory_path):
+                    if entry.is_file():
+                        files.append((entry.name, entry.stat().st_mtime))
                 selected_index = 0
                 for index, (filename, unused_mtime) in enumerate(
                     sorted(files, key=lambda t: t[1], reverse=True)
@@ -108,25 +163,103 @@ class FileLogViewerWidget(QtWidgets.QWidget):
                 if selected_index > -1:
                     self._files_combobox.setCurrentIndex(selected_index)
             except:
-                self._content_textarea.setText(traceback.format_exc())
+                self._status_label.setText(traceback.format_exc())
         else:
-            self._content_textarea.setText(
+            self._status_label.setText(
                 'Connect log directory "{}" does not exist!'.format(
                     log_directory_path
                 )
             )
 
     def _on_file_index_changed(self, selected_index):
-        '''Callback on user log file selection'''
+        '''Callback on user log file selection, read appended lines only
+        if same file is selected again'''
         if len(self._files_combobox.currentText() or '') > 0:
             file_path = os.path.join(
                 get_log_directory(), self._files_combobox.currentText()
             )
-            self._content_textarea.clear()
+            if file_path == self._content_model.file_path:
+                self._content_model.update()
+                return
             self.logger.info('Loading log file: "{}"'.format(file_path))
-            with open(file_path, "r") as f:
-                self._content_textarea.append(f.read())
-        # self._content_textarea.append(" ") # Make sure last line is displayed
+            self._status_label.setText('Indexing...')
+            self._search_pending = len(self._search.text) > 0
+            self._content_model.set_file(file_path)
+
+    def _on_indexing_done(self):
+        '''Log file has been indexed, run pending search or show line
+        count'''
+        if self._search_pending:
+            self._search_pending = False
+            self._on_search(self._search.text)
+        elif len(self._search.text) == 0:
+            self._status_label.setText(
+                '{} line(s)'.format(self._content_model.rowCount())
+            )
+
+    def _on_rows_inserted(self, parent, first, last):
+        '''Lines were appended to log file, scroll to end if following'''
+        if self._follow_checkbox.isChecked():
+            self._content_view.scrollToBottom()
+
+    def _on_follow_toggled(self, checked):
+        '''Start or stop following appended lines'''
+        if checked:
+            self._content_model.update()
+            self._content_view.scrollToBottom()
+            self._follow_timer.start()
+        else:
+            self._follow_timer.stop()
+
+    def _on_search(self, text):
+        '''Search log file for *text* in background'''
+        self._content_model.search(text)
+
+    def _on_search_done(self):
+        '''Search finished, select first match'''
+        if len(self._search.text) == 0:
+            self._on_indexing_done()
+            return
+        self._status_label.setText(
+            '{} matching line(s)'.format(
+                len(self._content_model.search_results)
+            )
+        )
+        self._select_match(backwards=False)
+
+    def _on_previous_match_clicked(self):
+        '''Select previous search match'''
+        self._select_match(backwards=True)
+
+    def _on_next_match_clicked(self):
+        '''Select next search match'''
+        self._select_match(backwards=False)
+
+    def _select_match(self, backwards=False):
+        '''Select the next search match after current row'''
+        current_index = self._content_view.currentIndex()
+        row = current_index.row() if current_index.isValid() else -1
+        if backwards and row == -1:
+            row = self._content_model.rowCount()
+        match_row = self._content_model.get_next_match(row, backwards)
+        if match_row is None:
+            return
+        index = self._content_model.index(match_row)
+        self._content_view.setCurrentIndex(index)
+        self._content_view.scrollTo(
+            index, QtWidgets.QAbstractItemView.PositionAtCenter
+        )
+
+    def showEvent(self, event):
+        '''(Override) Resume following appended lines'''
+        super(FileLogViewerWidget, self).showEvent(event)
+        if self._follow_checkbox.isChecked():
+            self._follow_timer.start()
+
+    def hideEvent(self, event):
+        '''(Override) Pause following appended lines'''
+        super(FileLogViewerWidget, self).hideEvent(event)
+        self._follow_timer.stop()
 
     def _open_directory(self, path):
         '''Open a filesystem directory from *path* in the OS file browser.
@@ -0,0 +1,343 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014-2023 ftrack
+import os
+import bisect
+import logging
+from array import array
+from collections import OrderedDict
+
+from Qt import QtCore
+
+from ftrack_connect_pipeline_qt.utils import BaseThread
+
+
+class LogFileModel(QtCore.QAbstractListModel):
+    '''List model exposing the lines of a log file, without loading it
+    into memory. Line offsets are indexed in a background thread and lines
+    are read on demand, in blocks.'''
+
+    CHUNK_SIZE = 4 * 1024 * 1024  # Bytes read at a time when indexing/searching
+    BLOCK_SIZE = 256  # Lines read from file at a time
+    MAX_BLOCKS = 32  # Blocks of lines kept in memory
+    MAX_LINE_LENGTH = 4096  # Characters displayed per line
+
+    linesIndexed = QtCore.Signal(
+        object, object, object, object
+    )  # Line offsets has been indexed in background thread
+    searchResultsFound = QtCore.Signal(
+        object, object, object
+    )  # Rows matching search has been found in background thread
+    indexingDone = QtCore.Signal()  # File is fully indexed
+    searchDone = QtCore.Signal()  # Search has finished
+
+    @property
+    def file_path(self):
+        '''Return the path of the file being viewed'''
+        return self._file_path
+
+    @property
+    def indexing(self):
+        '''Return True if file is being indexed'''
+        return self._indexing
+
+    @property
+    def search_results(self):
+        '''Return the sorted list of rows matching the current search'''
+        return self._search_results
+
+    def __init__(self, parent=None):
+        '''Initialise LogFileModel with *parent*'''
+        super(LogFileModel, self).__init__(parent=parent)
+
+        self.logger = logging.getLogger(
+            __name__ + '.' + self.__class__.__name__
+        )
+
+        self._file_path = None
+        self._file_id = None
+        self._generation = 0
+        self._line_starts = array('Q')
+        self._size = 0
+        self._indexing = False
+        self._update_pending = False
+        self._blocks = OrderedDict()
+        self._search_text = ''
+        self._search_id = 0
+        self._search_results = []
+
+        self.linesIndexed.connect(self._on_lines_indexed)
+        self.searchResultsFound.connect(self._on_search_results_found)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        '''Return the number of lines indexed'''
+        if parent.isValid():
+            return 0
+        return len(self._line_starts)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        '''Return the line at *index*'''
+        if not index.isValid() or role != QtCore.Qt.DisplayRole:
+            return None
+        return self.get_line(index.row())
+
+    def set_file(self, file_path):
+        '''View log file at *file_path*, index it from the start'''
+        self._generation += 1
+        self.beginResetModel()
+        self._file_path = file_path
+        self._file_id = None
+        self._line_starts = array('Q')
+        self._size = 0
+        self._blocks.clear()
+        self._search_results = []
+        self.endResetModel()
+        self._indexing = False
+        self._update_pending = False
+        self.update()
+
+    def update(self):
+        '''Index the bytes appended to file since last update. Reset
+        the model if file has been truncated or replaced.'''
+        if not self._file_path:
+            return
+        if self._indexing:
+            self._update_pending = True
+            return
+        try:
+            stat = os.stat(self._file_path)
+        except OSError as error:
+            self.logger.warning(
+                'Could not access log file "{}": {}'.format(
+                    self._file_path, error
+                )
+            )
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if self._file_id is not None and (
+            file_id != self._file_id or stat.st_size < self._size
+        ):
+            self.set_file(self._file_path)
+            return
+        self._file_id = file_id
+        if stat.st_size == self._size:
+            return
+        self._indexing = True
+        thread = BaseThread(
+            name='log_file_index_thread',
+            target=self._index_async,
+            target_args=[
+                self._generation,
+                self._file_path,
+                self._size,
+                stat.st_size,
+            ],
+        )
+        thread.start()
+
+    def _index_async(self, generation, file_path, position, size):
+        '''(Background thread) Index line offsets of *file_path* from
+        *position* to *size*, emitting them chunk by chunk'''
+        try:
+            with open(file_path, 'rb') as f:
+                at_line_start = position == 0
+                if position > 0:
+                    f.seek(position - 1)
+                    at_line_start = f.read(1) == b'\n'
+                while position < size:
+                    if generation != self._generation:
+                        return
+                    chunk = f.read(min(self.CHUNK_SIZE, size - position))
+                    if not chunk:
+                        break
+                    line_starts = array('Q')
+                    if at_line_start:
+                        line_starts.append(position)
+                    index = chunk.find(b'\n')
+                    while index != -1:
+                        if position + index + 1 < size:
+                            line_starts.append(position + index + 1)
+                        index = chunk.find(b'\n', index + 1)
+                    at_line_start = chunk.endswith(b'\n')
+                    position += len(chunk)
+                    self.linesIndexed.emit(
+                        generation, line_starts, position, False
+                    )
+        except Exception as error:
+            self.logger.warning(
+                'Could not index log file "{}": {}'.format(file_path, error)
+            )
+        self.linesIndexed.emit(generation, array('Q'), position, True)
+
+    def _on_lines_indexed(self, generation, line_starts, size, done):
+        '''Append indexed *line_starts* to model, having file indexed up
+        to *size*'''
+        if generation != self._generation:
+            return
+        count = len(self._line_starts)
+        if count > 0 and size > self._size:
+            # Last block is no longer complete
+            self._blocks.pop(int((count - 1) / self.BLOCK_SIZE), None)
+            if len(line_starts) == 0 or line_starts[0] != self._size:
+                # Last line has been extended
+                index = self.index(count - 1)
+                self.dataChanged.emit(index, index)
+        self._size = size
+        if len(line_starts) > 0:
+            self.beginInsertRows(
+                QtCore.QModelIndex(), count, count + len(line_starts) - 1
+            )
+            self._line_starts.extend(line_starts)
+            self.endInsertRows()
+        if done:
+            self._indexing = False
+            self.indexingDone.emit()
+            if self._update_pending:
+                self._update_pending = False
+                self.update()
+
+    def get_line(self, row):
+        '''Return the text of line at *row*, read from file in blocks'''
+        block_index = int(row / self.BLOCK_SIZE)
+        block = self._blocks.get(block_index)
+        if block is None:
+            block = self._read_block(block_index)
+            self._blocks[block_index] = block
+            while len(self._blocks) > self.MAX_BLOCKS:
+                self._blocks.popitem(last=False)
+        else:
+            self._blocks.move_to_end(block_index)
+        offset = row - block_index * self.BLOCK_SIZE
+        return block[offset] if offset < len(block) else ''
+
+    def _read_block(self, block_index):
+        '''Read lines of block at *block_index* from file'''
+        first_row = block_index * self.BLOCK_SIZE
+        last_row = min(first_row + self.BLOCK_SIZE, len(self._line_starts))
+        if first_row >= last_row:
+            return []
+        start = self._line_starts[first_row]
+        end = (
+            self._line_starts[last_row]
+            if last_row < len(self._line_starts)
+            else self._size
+        )
+        try:
+            with open(self._file_path, 'rb') as f:
+                f.seek(start)
+                data = f.read(end - start)
+        except (IOError, OSError) as error:
+            self.logger.warning(
+                'Could not read log file "{}": {}'.format(
+                    self._file_path, error
+                )
+            )
+            return []
+        result = []
+        for row in range(first_row, last_row):
+            line_start = self._line_starts[row] - start
+            line_end = (
+                self._line_starts[row + 1] - start
+                if row + 1 < last_row
+                else len(data)
+            )
+            line = (
+                data[line_start:line_end]
+                .rstrip(b'\r\n')
+                .decode('utf-8', errors='replace')
+            )
+            if len(line) > self.MAX_LINE_LENGTH:
+                line = line[: self.MAX_LINE_LENGTH] + '...'
+            result.append(line.expandtabs())
+        return result
+
+    def search(self, text):
+        '''Search indexed lines for *text* (case insensitive) in
+        background, emitting searchDone when finished'''
+        self._search_id += 1
+        self._search_text = (text or '').lower()
+        self._search_results = []
+        if len(self._search_text) == 0 or len(self._line_starts) == 0:
+            self.searchDone.emit()
+            return
+        thread = BaseThread(
+            name='log_file_search_thread',
+            target=self._search_async,
+            target_args=[
+                self._generation,
+                self._search_id,
+                self._file_path,
+                self._search_text.encode('utf-8'),
+                array('Q', self._line_starts),
+                self._size,
+            ],
+        )
+        thread.start()
+
+    def _search_async(
+        self, generation, search_id, file_path, needle, line_starts, size
+    ):
+        '''(Background thread) Find rows of *line_starts* containing
+        *needle* in *file_path*, up to *size*, emitting them chunk by
+        chunk'''
+        try:
+            with open(file_path, 'rb') as f:
+                position = 0
+                previous_row = -1
+                while position < size:
+                    if (
+                        generation != self._generation
+                        or search_id != self._search_id
+                    ):
+                        return
+                    f.seek(position)
+                    chunk = f.read(
+                        min(self.CHUNK_SIZE + len(needle), size - position)
+                    ).lower()
+                    if not chunk:
+                        break
+                    rows = []
+                    index = chunk.find(needle)
+                    while index != -1 and index < self.CHUNK_SIZE:
+                        row = (
+                            bisect.bisect_right(line_starts, position + index)
+                            - 1
+                        )
+                        if row != previous_row:
+                            rows.append(row)
+                            previous_row = row
+                        # Continue search from next line
+                        if row + 1 >= len(line_starts):
+                            break
+                        index = chunk.find(
+                            needle, line_starts[row + 1] - position
+                        )
+                    if len(rows) > 0:
+                        self.searchResultsFound.emit(
+                            generation, search_id, rows
+                        )
+                    position += self.CHUNK_SIZE
+        except Exception as error:
+            self.logger.warning(
+                'Could not search log file "{}": {}'.format(file_path, error)
+            )
+        self.searchResultsFound.emit(generation, search_id, None)
+
+    def _on_search_results_found(self, generation, search_id, rows):
+        '''Store found *rows*, None means search is finished'''
+        if generation != self._generation or search_id != self._search_id:
+            return
+        if rows is None:
+            self.searchDone.emit()
+        else:
+            self._search_results.extend(rows)
+
+    def get_next_match(self, row, backwards=False):
+        '''Return the row of next search match after *row*, wrapping
+        around. Return None if there are no matches.'''
+        if len(self._search_results) == 0:
+            return None
+        if backwards:
+            index = bisect.bisect_left(self._search_results, row) - 1
+        else:
+            index = bisect.bisect_right(self._search_results, row)
+        return self._search_results[index % len(self._search_results)]
@@ -1,5 +1,6 @@
 # :coding: utf-8
 # :copyright: Copyright (c) 2014-2020 ftrack
+import fnmatch
 
 from Qt import QtWidgets, QtCore, QtGui
 
@@ -32,6 +33,8 @@ class LogTableModel(QtCore.QAbstractTableModel):
         ]
 
         self._data = []
+        self._sort_keys = []  # Per row, the sort key of each column
+        self._filter_keys = []  # Per row, lowercase text to filter on
 
     def set_log_items(self, log_items):
         '''
@@ -39,9 +42,82 @@ class LogTableModel(QtCore.QAbstractTableModel):
         *log_items*
         '''
         self.beginResetModel()
-        self._data = log_items
+        self._data = list(log_items)
+        self._sort_keys = [self._get_sort_keys(item) for item in self._data]
+        self._filter_keys = [
+            self._get_filter_key(item) for item in self._data
+        ]
         self.endResetModel()
 
+    def update_log_items(self, log_items):
+        '''
+        Update the model with the given *log_items*, only inserting new rows
+        if the current items are the beginning of *log_items*, otherwise
+        reset the model.
+        '''
+        count = len(self._data)
+        if count > len(log_items) or (
+            count > 0
+            and self._get_item_key(log_items[count - 1])
+            != self._get_item_key(self._data[-1])
+        ):
+            self.set_log_items(log_items)
+        elif count < len(log_items):
+            self.append_log_items(log_items[count:])
+
+    def append_log_items(self, log_items):
+        '''Append *log_items* to the model as new rows'''
+        if len(log_items) == 0:
+            return
+        count = len(self._data)
+        self.beginInsertRows(
+            QtCore.QModelIndex(), count, count + len(log_items) - 1
+        )
+        self._data.extend(log_items)
+        self._sort_keys.extend(
+            [self._get_sort_keys(item) for item in log_items]
+        )
+        self._filter_keys.extend(
+            [self._get_filter_key(item) for item in log_items]
+        )
+        self.endInsertRows()
+
+    def _get_item_key(self, item):
+        '''Return a key identifying log *item*'''
+        return (item.date, item.plugin_name, item.plugin_type, item.status)
+
+    def _get_sort_keys(self, item):
+        '''Return the sort keys of each column for log *item*'''
+        result = []
+        for column_name in self._headers:
+            value = getattr(item, column_name)
+            if column_name == 'date':
+                result.append(value.timestamp() if value else 0.0)
+            elif column_name == 'execution_time':
+                result.append(float(value or 0))
+            else:
+                result.append(str(value or '').lower())
+        return result
+
+    def _get_filter_key(self, item):
+        '''Return the lowercase text, concatenating the display values of
+        all columns, that log *item* is filtered on'''
+        values = []
+        for column_name in self._headers:
+            value = getattr(item, column_name)
+            if value and column_name == 'date':
+                value = value.strftime('%H:%M:%S.%f')
+            values.append(str(value or ''))
+        return '\t'.join(values).lower()
+
+    def sort_key(self, row, column):
+        '''Return the precomputed sort key at *row* and *column*'''
+        return self._sort_keys[row][column]
+
+    def filter_key(self, row):
+        '''Return the precomputed filter text at *row*'''
+        return self._filter_keys[row]
+
     def rowCount(self, parent):
         '''Return the row count for the internal data.'''
         if parent.column() > 0:
@@ -116,31 +192,32 @@ class FilterProxyModel(QtCore.QSortFilterProxyModel):
         '''Initialize the FilterProxyModel'''
         super(FilterProxyModel, self).__init__(parent=parent)
 
+        self._search_text = ''
+        self._search_pattern = None
+
         self.setDynamicSortFilter(True)
         self.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
         self.setFilterKeyColumn(-1)
 
-    def filterAcceptsRowItself(self, source_row, source_parent):
-        '''Provide a way to filter internal values.'''
-        return super(FilterProxyModel, self).filterAcceptsRow(
-            source_row, source_parent
-        )
+    def set_search_text(self, text):
+        '''Filter rows on *text*, supporting * and ? wildcards'''
+        self._search_text = (text or '').lower()
+        self._search_pattern = None
+        if '*' in self._search_text or '?' in self._search_text:
+            self._search_pattern = '*{}*'.format(self._search_text)
+        self.invalidateFilter()
 
     def filterAcceptsRow(self, source_row, source_parent):
-        '''Override filterAcceptRow to filter to any entry.'''
-        if self.filterAcceptsRowItself(source_row, source_parent):
+        '''Override filterAcceptRow to filter on precomputed text.'''
+        if len(self._search_text) == 0:
             return True
-
-        parent = source_parent
-        while parent.isValid():
-            if self.filterAcceptsRowItself(parent.row(), parent.parent()):
-                return True
-            parent = parent.parent()
-
-        return False
+        filter_key = self.sourceModel().filter_key(source_row)
+        if self._search_pattern:
+            return fnmatch.fnmatchcase(filter_key, self._search_pattern)
+        return self._search_text in filter_key
 
     def lessThan(self, left, right):
-        '''Allow to sort the model.'''
-        left_data = self.sourceModel().item(left)
-        right_data = self.sourceModel().item(right)
-        return left_data.id > right_data.id
+        '''Allow to sort the model, on precomputed keys.'''
+        return self.sourceModel().sort_key(
+            left.row(), left.column()
+        ) < self.sourceModel().sort_key(right.row(), right.column())
@@ -87,7 +87,7 @@ class PluginLogViewerWidget(QtWidgets.QWidget):
 
     def _on_search(self, value):
         '''Search in the current model.'''
-        self.log_table_view.model().setFilterWildcard(value)
+        self.log_table_view.model().set_search_text(value)
 
     def set_log_items(self, log_items):
         '''
@@ -95,6 +95,12 @@ class PluginLogViewerWidget(QtWidgets.QWidget):
         '''
         self.log_table_view.set_log_items(log_items)
 
+    def update_log_items(self, log_items):
+        '''
+        Update the view with new items in *log_items*
+        '''
+        self.log_table_view.update_log_items(log_items)
+
     def show_detail_widget(self, index):
         '''
         Raises a dock widget with the log details.
@@ -165,6 +171,13 @@ class LogTableView(QtWidgets.QTableView):
         '''
         self.log_model.set_log_items(log_items)
 
+    def update_log_items(self, log_items):
+        '''
+        Append new items in *log_items* to model, preserving scroll and
+        selection
+        '''
+        self.log_model.update_log_items(log_items)
+
 
 class LogDetailDialog(ModalDialog):
     TEMPLATE = """
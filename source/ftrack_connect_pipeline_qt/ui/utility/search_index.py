@@ -0,0 +1,149 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014-2023 ftrack
+import re
+import bisect
+
+
+class SearchIndex(object):
+    '''
+    Search keys of list rows, normalized once when the row is added. A
+    query is split into terms on whitespace, a row matches if every term
+    is the prefix of one of its tokens. Terms containing punctuation, for
+    example paths, are matched anywhere in the row text.
+
+    The match state of each row is kept, so a new query only reports the
+    rows that need to be shown or hidden.
+    '''
+
+    _WORD_SPLIT = re.compile(r'[\W_]+', re.UNICODE)
+    _WORD_PARTS = re.compile(r'[^\W\d_]+|\d+', re.UNICODE)
+
+    @property
+    def query(self):
+        '''Return the current query'''
+        return self._query
+
+    def __init__(self):
+        '''Initialise SearchIndex'''
+        self._keys = []
+        self._matched = []
+        self._query = ''
+        self._terms = []
+
+    def __len__(self):
+        '''Return the number of rows indexed'''
+        return len(self._keys)
+
+    @classmethod
+    def normalize(cls, values):
+        '''Return the search key of *values*, a tuple of the lower case
+        text and the sorted list of tokens. Tokens are the words of the text
+        and their letter and digit parts, "sh010_anim" gives "sh010",
+        "sh", "010" and "anim".'''
+        text = '\n'.join(
+            '{}'.format(value) for value in values or [] if value is not None
+        ).lower()
+        tokens = set(cls._WORD_SPLIT.split(text))
+        tokens.update(cls._WORD_PARTS.findall(text))
+        tokens.discard('')
+        return (text, sorted(tokens))
+
+    @classmethod
+    def get_terms(cls, query):
+        '''Return the terms of *query*'''
+        return (query or '').lower().split()
+
+    @classmethod
+    def match_term(cls, key, term):
+        '''Return True if *term* matches search *key*'''
+        (text, tokens) = key
+        if cls._WORD_SPLIT.search(term):
+            return term in text
+        index = bisect.bisect_left(tokens, term)
+        return index < len(tokens) and tokens[index].startswith(term)
+
+    def _match(self, key, terms):
+        '''Return True if all *terms* match *key*'''
+        for term in terms:
+            if not self.match_term(key, term):
+                return False
+        return True
+
+    def matches(self, row):
+        '''Return True if *row* matches the current query'''
+        return self._matched[row]
+
+    def insert(self, row, values):
+        '''Insert search key of *values* at *row*, shifting the following
+        rows. Return True if row matches the current query.'''
+        key = self.normalize(values)
+        matched = self._match(key, self._terms)
+        self._keys.insert(row, key)
+        self._matched.insert(row, matched)
+        return matched
+
+    def append(self, values):
+        '''Add search key of *values* as the last row, return True if it
+        matches the current query.'''
+        return self.insert(len(self._keys), values)
+
+    def update(self, row, values):
+        '''Update search key of *row* to *values*, return True if the
+        match state of row changed.'''
+        key = self.normalize(values)
+        matched = self._match(key, self._terms)
+        self._keys[row] = key
+        changed = matched != self._matched[row]
+        self._matched[row] = matched
+        return changed
+
+    def remove(self, first, last):
+        '''Remove search keys of rows *first* to *last*'''
+        del self._keys[first : last + 1]
+        del self._matched[first : last + 1]
+
+    def clear(self):
+        '''Remove all search keys, keep the query'''
+        self._keys = []
+        self._matched = []
+
+    def set_query(self, query):
+        '''Match rows against *query*, return the rows which match state
+        changed.'''
+        terms = self.get_terms(query)
+        self._query = query or ''
+        if terms == self._terms:
+            return []
+        if self._narrows(self._terms, terms):
+            # Only matching rows can stop matching
+            candidates = [row for row, m in enumerate(self._matched) if m]
+        elif self._narrows(terms, self._terms):
+            # Only rows not matching can start matching
+            candidates = [row for row, m in enumerate(self._matched) if not m]
+        else:
+            candidates = range(len(self._keys))
+        self._terms = terms
+        result = []
+        for row in candidates:
+            matched = self._match(self._keys[row], terms)
+            if matched != self._matched[row]:
+                self._matched[row] = matched
+                result.append(row)
+        return result
+
+    @staticmethod
+    def _narrows(terms, new_terms):
+        '''Return True if *new_terms* can only match a subset of the rows
+        matching *terms*, each term having been extended or new terms
+        added.'''
+        if len(new_terms) < len(terms):
+            return False
+        for term, new_term in zip(terms, new_terms):
+            if not new_term.startswith(term):
+                return False
+            if bool(SearchIndex._WORD_SPLIT.search(term)) != bool(
+                SearchIndex._WORD_SPLIT.search(new_term)
+            ):
+                # Matched differently
+                return False
+        return True
@@ -1,5 +1,9 @@
 # :coding: utf-8
 # :copyright: Copyright (c) 2022 ftrack
+import time
+import logging
+import threading
+import weakref
 from functools import partial
 
 import ftrack_connect_pipeline_qt.ui.utility.widget.button
@@ -7,14 +11,19 @@ from Qt import QtWidgets, QtCore, QtGui
 
 import shiboken2
 
-from ftrack_connect_pipeline_qt.ui.utility.widget.thumbnail import Context
+from ftrack_connect_pipeline_qt.ui.utility.widget.thumbnail import (
+    Context,
+    get_fetched_thumbnail_id,
+)
 from ftrack_connect_pipeline_qt.ui.utility.widget.search import Search
+from ftrack_connect_pipeline_qt.ui.utility.search_index import SearchIndex
 from ftrack_connect_pipeline_qt.utils import (
     BaseThread,
     clear_layout,
     set_property,
     center_widget,
     InputEventBlockingWidget,
+    query_in_batches,
 )
 from ftrack_connect_pipeline_qt.ui.utility.widget.circular_button import (
     CircularButton,
@@ -28,6 +37,140 @@ from ftrack_connect_pipeline_qt.ui.utility.widget import (
     scroll_area,
 )
 
+logger = logging.getLogger(__name__)
+
+
+class ContextTreeCache(object):
+    '''
+    Session scoped cache of the context tree, storing the children of
+    each browsed context and the context entities resolved by id.
+    Entries expire after TTL seconds or when invalidated. Children are
+    fetched with their name, link and parent, so navigating the tree and
+    rendering breadcrumbs does not load attributes lazily.
+    '''
+
+    TTL = 300  # Seconds before a cached node has to be fetched again
+
+    _caches = weakref.WeakKeyDictionary()  # Cache per session
+    _caches_lock = threading.Lock()
+
+    @classmethod
+    def get_cache(cls, session):
+        '''Return the context tree cache for *session*'''
+        with cls._caches_lock:
+            cache = cls._caches.get(session)
+            if cache is None:
+                cache = cls._caches[session] = cls(session)
+            return cache
+
+    @property
+    def session(self):
+        '''Return :class:`ftrack_api.session.Session`'''
+        return self._session()
+
+    def __init__(self, session):
+        '''Initialise ContextTreeCache for *session*'''
+        self._session = weakref.ref(session)
+        self._lock = threading.Lock()
+        self._children = {}  # Parent id (None for projects) -> (time, list)
+        self._entities = {}  # Context id -> (time, entity)
+
+    def _get_valid(self, store, key):
+        '''Return value stored at *key* in *store* if not expired'''
+        with self._lock:
+            entry = store.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.TTL:
+                del store[key]
+                return None
+            return entry[1]
+
+    def get_children(self, parent_id):
+        '''Return the cached children beneath context *parent_id*, None
+        means projects. Return None if not cached.'''
+        return self._get_valid(self._children, parent_id)
+
+    def fetch_children(self, parent_id, show_children=False):
+        '''Return children beneath context *parent_id*, query and cache
+        them if not cached. Include children of children if
+        *show_children* is True.'''
+        result = self.get_children(parent_id)
+        if result is not None:
+            return result
+        if parent_id is None:
+            # List projects
+            result = self.session.query(
+                'select id, name, link, thumbnail_id from Project where '
+                'status=active'
+            ).all()
+        else:
+            result = self.session.query(
+                'select id, name, link, thumbnail_id, parent.id, '
+                'parent.name{} from Context where parent.id is {}'.format(
+                    ', children' if show_children else '', parent_id
+                )
+            ).all()
+        self._store_children(parent_id, result)
+        return result
+
+    def prefetch_children(self, entities):
+        '''Fetch and cache the children of all non task *entities* in
+        batched queries, skipping the ones already cached.'''
+        parent_ids = [
+            entity['id']
+            for entity in entities
+            if entity.entity_type != 'Task'
+            and self.get_children(entity['id']) is None
+        ]
+        if len(parent_ids) == 0:
+            return
+        children = dict([(parent_id, []) for parent_id in parent_ids])
+        for child in query_in_batches(
+            self.session,
+            'select id, name, link, thumbnail_id, parent.id, parent.name '
+            'from Context where parent.id in ({})',
+            parent_ids,
+        ):
+            children[child['parent']['id']].append(child)
+        for parent_id, result in children.items():
+            self._store_children(parent_id, result)
+
+    def _store_children(self, parent_id, entities):
+        '''Cache *entities* as children of *parent_id*, and by id'''
+        now = time.time()
+        with self._lock:
+            self._children[parent_id] = (now, entities)
+            for entity in entities:
+                self._entities[entity['id']] = (now, entity)
+
+    def find_context_entity(self, entity_id):
+        '''Return the context entity having *entity_id*, query and cache
+        it if not cached.'''
+        result = self._get_valid(self._entities, entity_id)
+        if result is None:
+            result = self.session.query(
+                'select link, name, parent, parent.name from Context where id '
+                'is "{}"'.format(entity_id)
+            ).one()
+            with self._lock:
+                self._entities[entity_id] = (time.time(), result)
+        return result
+
+    def invalidate(self, parent_id):
+        '''Forget the cached children of *parent_id*'''
+        with self._lock:
+            entry = self._children.pop(parent_id, None)
+            if entry is not None:
+                for entity in entry[1]:
+                    self._entities.pop(entity['id'], None)
+
+    def clear(self):
+        '''Forget all cached nodes'''
+        with self._lock:
+            self._children.clear()
+            self._entities.clear()
+
 
 class EntityBrowser(dialog.ModalDialog):
     '''
@@ -124,6 +267,11 @@ class EntityBrowser(dialog.ModalDialog):
         '''Return :class:`ftrack_api.session.Session`'''
         return self._session
 
+    @property
+    def context_tree_cache(self):
+        '''Return the :class:`ContextTreeCache` of session'''
+        return ContextTreeCache.get_cache(self._session)
+
     def __init__(self, parent, session, entity=None, mode=None, title=None):
         '''
         Initialize the entity browser
@@ -142,6 +290,7 @@ class EntityBrowser(dialog.ModalDialog):
         self._session = session
         self._external_navigator = None
         self._prev_search_text = ""
+        self._search_index = SearchIndex()
         self.working = False
 
         self.mode = mode or EntityBrowser.MODE_TASK
@@ -215,7 +364,7 @@ class EntityBrowser(dialog.ModalDialog):
             self._set_parent_intermediate_entity
         )
 
-        self._rebuild_button.clicked.connect(self.rebuild)
+        self._rebuild_button.clicked.connect(self._on_sync)
         self._approve_button.clicked.connect(self._on_apply)
         self._deny_button.clicked.connect(self.reject)
 
@@ -273,19 +422,48 @@ class EntityBrowser(dialog.ModalDialog):
         self.intermediate_entity = entity['parent'] if entity else None
 
     def find_context_entity(self, entity_id):
-        '''Fetch the entity from frack based on *entity_id*'''
-        context_entity = self.session.query(
-            'select link, name, parent, parent.name from Context where id '
-            'is "{}"'.format(entity_id)
-        ).one()
-        return context_entity
+        '''Fetch the entity from frack based on *entity_id*, through
+        context tree cache'''
+        return self.context_tree_cache.find_context_entity(entity_id)
+
+    def _get_intermediate_entity_id(self):
+        '''Return the id of current intermediate entity, None if browsing
+        projects'''
+        return (
+            self.intermediate_entity['id']
+            if self.intermediate_entity is not None
+            else None
+        )
+
+    def _on_sync(self):
+        '''Sync button clicked, refresh the children of current node'''
+        if self.working:
+            return
+        self.context_tree_cache.invalidate(self._get_intermediate_entity_id())
+        self.rebuild()
 
     def rebuild(self):
         if self.working:
             return
 
         self.working = True
+
+        entities = self.context_tree_cache.get_children(
+            self._get_intermediate_entity_id()
+        )
+        if entities is not None:
+            # Already fetched, rebuild now and prefetch next level in background
+            self._busy_indicator = None
+            self._on_entities_fetched(entities)
+            thread = BaseThread(
+                name='prefetch_entities_thread',
+                target=self._prefetch_entities,
+                target_args=[entities],
+            )
+            thread.start()
+            return
         self.entity_widgets = []
+        self._search_index.clear()
 
         self._busy_indicator = BusyIndicator(False)
 
@@ -307,25 +485,27 @@ class EntityBrowser(dialog.ModalDialog):
         '''(Run in background thread) Fetch projects/child entities'''
         signal_emitted = False
         try:
-            intermediate_entity = self.intermediate_entity
-            if self.intermediate_entity is None:
-                # List projects
-                entities = self.session.query(
-                    'select id, name from Project where status=active'
-                ).all()
-            else:
-                entities = self.session.query(
-                    'select id, name{} from Context where parent.id is {}'.format(
-                        ', children' if self.SHOW_CHILDREN else '',
-                        intermediate_entity['id'],
-                    )
-                ).all()
+            entities = self.context_tree_cache.fetch_children(
+                self._get_intermediate_entity_id(),
+                show_children=self.SHOW_CHILDREN,
+            )
             self.entitiesFetched.emit(entities)
             signal_emitted = True
         finally:
             if not signal_emitted:
                 # Crashed, stop working to unblock
                 self.working = False
+        self._prefetch_entities(entities)
+
+    def _prefetch_entities(self, entities):
+        '''(Run in background thread) Fetch the children of *entities*
+        ahead, so drilling down is served from cache'''
+        try:
+            self.context_tree_cache.prefetch_children(entities)
+        except Exception as error:
+            logger.warning(
+                'Could not prefetch child entities: {}'.format(error)
+            )
 
     def _on_entities_fetched(self, entities):
         '''Entities has been fetch, rebuild widget'''
@@ -335,7 +515,8 @@ class EntityBrowser(dialog.ModalDialog):
             entities_widget.layout().setContentsMargins(0, 0, 0, 0)
             entities_widget.layout().setSpacing(0)
 
-            self._busy_indicator.stop()
+            if self._busy_indicator is not None:
+                self._busy_indicator.stop()
 
             self._scroll.setWidget(entities_widget)
 
@@ -391,16 +572,22 @@ class EntityBrowser(dialog.ModalDialog):
 
             entities_widget.layout().addWidget(QtWidgets.QLabel(), 100)
 
+            self._search_index.clear()
+            for entity_widget in self.entity_widgets:
+                if not self._search_index.append(
+                    [entity_widget.entity['name']]
+                ):
+                    entity_widget.setVisible(False)
+
         finally:
             self.working = False
 
     def refresh(self):
-        '''Filter visible entities on search.'''
-        text = self._search.text.lower()
-        for entity_widget in self.entity_widgets:
-            entity_widget.setVisible(
-                len(text) == 0
-                or entity_widget.entity['name'].lower().find(text) > -1
+        '''Filter visible entities on search, only show or hide the ones
+        which match state changed.'''
+        for row in self._search_index.set_query(self._search.text):
+            self.entity_widgets[row].setVisible(
+                self._search_index.matches(row)
             )
 
     def _entity_selected(self, entity, double_click=False):
@@ -727,7 +914,10 @@ class EntityWidget(QtWidgets.QFrame):
         self.thumbnail_widget.setMaximumWidth(71)
         self.thumbnail_widget.setMaximumHeight(40)
         if not self.is_parent:
-            self.thumbnail_widget.load(self.entity['id'])
+            self.thumbnail_widget.load(
+                self.entity['id'],
+                thumbnail_id=get_fetched_thumbnail_id(self.entity),
+            )
         self.layout().addWidget(self.thumbnail_widget)
 
         central_widget = QtWidgets.QWidget()
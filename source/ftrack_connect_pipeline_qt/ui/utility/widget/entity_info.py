@@ -29,6 +29,14 @@ class EntityInfo(QtWidgets.QWidget):
         parents.reverse()
         self.pathReady.emit(parents)
 
+    def set_link(self, link):
+        '''Set the path from *link*, the link of an entity as projected in
+        a query - from project down to the entity itself. Spares walking
+        the entity parents.'''
+        if not link:
+            return
+        self.pathReady.emit(list(link))
+
     def __init__(self, additional_widget=None, parent=None):
         '''
         Instantiate the entity info widget
@@ -18,6 +18,8 @@ class Search(QtWidgets.QFrame):
     inputUpdated = QtCore.Signal(object)  # User has update input
     clear = QtCore.Signal()  # Clear button was pressed
 
+    DEBOUNCE_INTERVAL = 150  # Milliseconds to wait for more input
+
     @property
     def text(self):
         '''Retrieve the search text'''
@@ -29,18 +31,30 @@ class Search(QtWidgets.QFrame):
         if self._input:
             self._input.setText(value)
 
-    def __init__(self, collapsed=True, collapsable=True, parent=None):
+    def __init__(
+        self,
+        collapsed=True,
+        collapsable=True,
+        debounce_interval=None,
+        parent=None,
+    ):
         '''
         Initialize the search widget
 
         :param collapsed: If True, search box should start collapsed (default)
         :param collapsable: If True, search can be collapsed by user.
+        :param debounce_interval: Milliseconds to wait after last keystroke before inputUpdated is emitted, defaults to DEBOUNCE_INTERVAL.
         :param parent: The parent dialog or frame
         '''
         super(Search, self).__init__(parent=parent)
 
         self._collapsed = collapsed
         self._collapsable = collapsable
+        self._debounce_interval = (
+            debounce_interval
+            if debounce_interval is not None
+            else self.DEBOUNCE_INTERVAL
+        )
         self.pre_build()
         self.build()
         self.post_build()
@@ -55,11 +69,15 @@ class Search(QtWidgets.QFrame):
 
     def build(self):
         '''Build widgets and parent them.'''
+        self._input_timer = QtCore.QTimer(self)
+        self._input_timer.setSingleShot(True)
+        self._input_timer.setInterval(self._debounce_interval)
         self.rebuild()
 
     def post_build(self):
         '''Post Build ui method for events connections.'''
         self._search_button.clicked.connect(self._on_search_clicked)
+        self._input_timer.timeout.connect(self._emit_input)
 
     def rebuild(self):
         '''Remove current widgets, clear input'''
@@ -113,12 +131,21 @@ class Search(QtWidgets.QFrame):
         '''User clicked search button, update collapsed state'''
         if self._collapsable:
             self._collapsed = not self._collapsed
+            self._input_timer.stop()
             self.rebuild()
             self.inputUpdated.emit('')
 
     def _on_input_changed(self):
-        '''Search input text changed'''
-        self.inputUpdated.emit(self._input.text())
+        '''Search input text changed, emit when user stops typing'''
+        if self._debounce_interval > 0 and len(self._input.text()) > 0:
+            self._input_timer.start()
+        else:
+            self._emit_input()
+
+    def _emit_input(self):
+        '''Emit the current search input'''
+        self._input_timer.stop()
+        self.inputUpdated.emit(self.text)
 
     def _on_clear_clicked(self):
         '''Clear search input'''
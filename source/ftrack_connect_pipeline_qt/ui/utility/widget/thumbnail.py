@@ -1,30 +1,502 @@
 # :coding: utf-8
 # :copyright: Copyright (c) 2015 ftrack
-import time
 import os
+import time
 import logging
+import hashlib
+import threading
+import weakref
+import collections
+from functools import partial
+import queue
+import ssl
+import http.client
 import urllib.request, urllib.parse, urllib.error
 import urllib.request, urllib.error, urllib.parse
 
 from Qt import QtCore, QtGui, QtWidgets
 import shiboken2
 
-from ftrack_connect_pipeline_qt.utils import BaseThread
+from ftrack_connect_pipeline_qt.utils import (
+    query_in_batches,
+    get_loaded_value,
+)
+
+# Thumbnail url or id passed on load of an entity known to have no thumbnail
+NO_THUMBNAIL = ''
+
+
+def get_fetched_thumbnail_url(version):
+    '''Return the thumbnail url of *version* if fetched along with it,
+    NO_THUMBNAIL if fetched and version has none, None if not fetched'''
+    thumbnail_url = get_loaded_value(version, 'thumbnail_url', False)
+    if thumbnail_url is False:
+        return None
+    return (thumbnail_url or {}).get('url') or NO_THUMBNAIL
+
+
+def get_fetched_thumbnail_id(entity):
+    '''Return the thumbnail component id of *entity* if fetched along
+    with it, NO_THUMBNAIL if fetched and entity has none, None if not
+    fetched'''
+    thumbnail_id = get_loaded_value(entity, 'thumbnail_id', False)
+    if thumbnail_id is False:
+        return None
+    return thumbnail_id or NO_THUMBNAIL
+
+
+def get_thumbnail_url(session, component_id):
+    '''Return the url of thumbnail component having *component_id* on
+    *session* server, None if no id given'''
+    if not component_id:
+        return None
+
+    params = urllib.parse.urlencode(
+        {
+            'id': component_id,
+            'username': session.api_user,
+            'apiKey': session.api_key,
+        }
+    )
+
+    return '{base_url}/component/thumbnail?{params}'.format(
+        base_url=session._server_url, params=params
+    )
+
+
+class ThumbnailCache(object):
+    '''Two tier thumbnail cache; downloaded image data is persisted on disk
+    within a size budget, evicting least recently used files, and scaled
+    pixmaps are kept in a bounded in memory LRU.'''
+
+    MAX_DISK_SIZE = 200 * 1024 * 1024  # Disk budget in bytes
+    MAX_PIXMAPS = 500  # Amount of scaled pixmaps to keep in memory
+
+    @property
+    def path(self):
+        '''Return the disk cache folder path'''
+        if self._path is None:
+            self._path = os.path.join(
+                QtCore.QStandardPaths.writableLocation(
+                    QtCore.QStandardPaths.GenericCacheLocation
+                ),
+                'ftrack',
+                'thumbnails',
+            )
+        return self._path
+
+    def __init__(self, path=None, max_disk_size=None, max_pixmaps=None):
+        '''
+        Initialise thumbnail cache
+
+        :param path: The disk cache folder, defaults to ftrack/thumbnails beneath the generic user cache location
+        :param max_disk_size: The maximum size of disk cache in bytes
+        :param max_pixmaps: The maximum amount of scaled pixmaps to keep in memory
+        '''
+        self.logger = logging.getLogger(
+            __name__ + '.' + self.__class__.__name__
+        )
+        self._path = path
+        self._max_disk_size = max_disk_size or self.MAX_DISK_SIZE
+        self._max_pixmaps = max_pixmaps or self.MAX_PIXMAPS
+        self._disk_size = None
+        self._pixmaps = collections.OrderedDict()
+        self._not_found = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            'pixmap_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'not_found': 0,
+        }
+
+    def stats(self):
+        '''Return a copy of the hit and miss counters'''
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, counter):
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _get_file_path(self, key):
+        '''Return the disk cache file path for *key*'''
+        return os.path.join(
+            self.path, hashlib.sha1(key.encode('utf-8')).hexdigest()
+        )
+
+    def get_pixmap(self, key, size):
+        '''Return the scaled pixmap stored for *key* and *size* if
+        cached, None otherwise. Should be called from main thread.'''
+        pixmap = self._pixmaps.get((key, size))
+        if pixmap is not None:
+            self._pixmaps.move_to_end((key, size))
+            self._count('pixmap_hits')
+        return pixmap
+
+    def set_pixmap(self, key, size, pixmap):
+        '''Store scaled *pixmap* for *key* and *size*, evict least
+        recently used pixmaps. Should be called from main thread.'''
+        self._pixmaps[(key, size)] = pixmap
+        self._pixmaps.move_to_end((key, size))
+        while len(self._pixmaps) > self._max_pixmaps:
+            self._pixmaps.popitem(last=False)
+
+    def is_not_found(self, key):
+        '''Return True if no thumbnail exists for *key*'''
+        return key in self._not_found
+
+    def set_not_found(self, key):
+        '''Remember that no thumbnail exists for *key*, for this session'''
+        self._not_found.add(key)
+        self._count('not_found')
+
+    def get_data(self, key):
+        '''Return the image data stored on disk for *key*, None if not
+        cached. Counts a miss if not found.'''
+        file_path = self._get_file_path(key)
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            # Mark as recently used
+            os.utime(file_path, None)
+        except (IOError, OSError):
+            self._count('misses')
+            return None
+        self._count('disk_hits')
+        return data
+
+    def set_data(self, key, data):
+        '''Persist image *data* on disk for *key*, evict least recently
+        used files if exceeding the disk budget.'''
+        if not data:
+            return
+        file_path = self._get_file_path(key)
+        try:
+            if not os.path.exists(self.path):
+                os.makedirs(self.path)
+            # Write to temporary file first, to not have concurrent readers
+            # pick up partial data
+            temp_path = '{}.{}.tmp'.format(file_path, threading.get_ident())
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, file_path)
+        except (IOError, OSError) as e:
+            self.logger.warning(
+                'Could not cache thumbnail on disk: {}'.format(e)
+            )
+            return
+        with self._lock:
+            if self._disk_size is None:
+                self._disk_size = self._compute_disk_size()
+            else:
+                self._disk_size += len(data)
+            if self._disk_size > self._max_disk_size:
+                self._evict()
+
+    def _compute_disk_size(self):
+        '''Return the total size of the disk cache'''
+        result = 0
+        for entry in os.scandir(self.path):
+            if entry.is_file():
+                result += entry.stat().st_size
+        return result
+
+    def _evict(self):
+        '''Remove least recently used files until disk cache is below 80%
+        of the budget'''
+        entries = []
+        for entry in os.scandir(self.path):
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        self._disk_size = sum(entry[1] for entry in entries)
+        for (unused_mtime, size, file_path) in sorted(entries):
+            if self._disk_size <= self._max_disk_size * 0.8:
+                break
+            try:
+                os.remove(file_path)
+                self._disk_size -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        '''Empty memory tier and forget thumbnails not found'''
+        self._pixmaps.clear()
+        self._not_found.clear()
+
+
+class ThumbnailDownloader(object):
+    '''Shared pool of a bounded amount of download threads, serving a
+    queue of thumbnail fetch requests. Concurrent requests for the same
+    thumbnail are coalesced and requests can be cancelled until started.
+    Each thread keeps persistent (keep-alive) HTTP connections, honouring
+    the FTRACK_PROXY environment variable.'''
+
+    MAX_CONNECTIONS = 10  # Maximum number of parallel connections to allow
+    MAX_REDIRECTS = 5
+
+    def __init__(self, max_connections=None):
+        '''
+        Initialise thumbnail downloader
+
+        :param max_connections: The maximum number of download threads
+        '''
+        self.logger = logging.getLogger(
+            __name__ + '.' + self.__class__.__name__
+        )
+        self._max_connections = max_connections or self.MAX_CONNECTIONS
+        self._queue = queue.Queue()
+        self._workers = []
+        self._subscribers = {}  # Pending requests, by key
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def request(self, key, fetch, callback, is_wanted=None):
+        '''Queue a request for thumbnail *key*, to be fetched by calling
+        *fetch* in a download thread. *callback* will be called with
+        the resulting data, or None if not found, in the download thread.
+        *is_wanted* can be supplied to have the request skipped when it
+        returns False, for example if the requesting widget has been
+        destroyed. Returns a token that can be used to cancel the request.'''
+        token = (key, callback)
+        with self._lock:
+            if key in self._subscribers:
+                # Already queued or in flight, wait for the same result
+                self._subscribers[key].append((callback, is_wanted))
+                return token
+            self._subscribers[key] = [(callback, is_wanted)]
+            if len(self._workers) < self._max_connections:
+                worker = threading.Thread(
+                    name='thumbnail_download_thread', target=self._work
+                )
+                worker.daemon = True
+                self._workers.append(worker)
+                worker.start()
+        self._queue.put((key, fetch))
+        return token
+
+    def cancel(self, token):
+        '''Cancel the request identified by *token*, the fetch is skipped
+        if no one else is waiting for the same thumbnail'''
+        (key, callback) = token
+        with self._lock:
+            if key in self._subscribers:
+                self._subscribers[key] = [
+                    subscriber
+                    for subscriber in self._subscribers[key]
+                    if subscriber[0] != callback
+                ]
+
+    def _work(self):
+        '''(Download thread) Serve requests from queue'''
+        while True:
+            (key, fetch) = self._queue.get()
+            with self._lock:
+                subscribers = [
+                    (callback, is_wanted)
+                    for (callback, is_wanted) in self._subscribers.get(key)
+                    or []
+                    if is_wanted is None or is_wanted()
+                ]
+                if len(subscribers) == 0:
+                    # All requests has been cancelled
+                    self._subscribers.pop(key, None)
+                    continue
+                self._subscribers[key] = subscribers
+            data = None
+            try:
+                data = fetch()
+            except Exception as e:
+                self.logger.debug(
+                    'Could not fetch thumbnail {}: {}'.format(key, e)
+                )
+            with self._lock:
+                subscribers = self._subscribers.pop(key, None) or []
+            for (callback, unused_is_wanted) in subscribers:
+                try:
+                    callback(data)
+                except Exception as e:
+                    self.logger.exception(e)
+
+    def _get_connection(self, scheme, netloc, timeout):
+        '''Return a persistent connection for this thread to *netloc*
+        using *scheme*'''
+        connections = getattr(self._local, 'connections', None)
+        if connections is None:
+            connections = self._local.connections = {}
+        connection = connections.get((scheme, netloc))
+        if connection is None:
+            url = urllib.parse.urlsplit('{}://{}'.format(scheme, netloc))
+            proxy = os.getenv('FTRACK_PROXY', '')
+            if proxy:
+                proxy_url = urllib.parse.urlsplit(
+                    proxy if '://' in proxy else 'http://{}'.format(proxy)
+                )
+            if scheme == 'https':
+                port = url.port or 443
+                if proxy:
+                    connection = http.client.HTTPSConnection(
+                        proxy_url.hostname,
+                        proxy_url.port or 80,
+                        timeout=timeout,
+                        context=ssl.create_default_context(),
+                    )
+                    connection.set_tunnel(url.hostname, port)
+                else:
+                    connection = http.client.HTTPSConnection(
+                        url.hostname,
+                        port,
+                        timeout=timeout,
+                        context=ssl.create_default_context(),
+                    )
+            else:
+                if proxy:
+                    connection = http.client.HTTPConnection(
+                        proxy_url.hostname,
+                        proxy_url.port or 80,
+                        timeout=timeout,
+                    )
+                else:
+                    connection = http.client.HTTPConnection(
+                        url.hostname, url.port or 80, timeout=timeout
+                    )
+            connections[(scheme, netloc)] = connection
+        return connection
+
+    def _close_connection(self, scheme, netloc):
+        '''Close and forget the persistent connection to *netloc*'''
+        connections = getattr(self._local, 'connections', None) or {}
+        connection = connections.pop((scheme, netloc), None)
+        if connection is not None:
+            connection.close()
+
+    def open_url(self, url, timeout=5):
+        '''(Download thread) Return the data at *url*, following redirects.
+        Raises :exc:`urllib.error.URLError` if not found or connection
+        failed.'''
+        for unused_redirect in range(self.MAX_REDIRECTS):
+            split_url = urllib.parse.urlsplit(url)
+            path = urllib.parse.urlunsplit(
+                ('', '', split_url.path or '/', split_url.query, '')
+            )
+            if split_url.scheme == 'http' and os.getenv('FTRACK_PROXY'):
+                # Plain http proxy expects the absolute url
+                path = url
+            response = None
+            for attempt in range(2):
+                connection = self._get_connection(
+                    split_url.scheme, split_url.netloc, timeout
+                )
+                try:
+                    connection.request('GET', path)
+                    response = connection.getresponse()
+                    data = response.read()
+                    break
+                except (http.client.HTTPException, OSError) as e:
+                    # Kept alive connection could have been closed by server,
+                    # retry once with a new connection
+                    self._close_connection(split_url.scheme, split_url.netloc)
+                    if attempt == 1:
+                        raise urllib.error.URLError(e)
+            if response.status in (301, 302, 303, 307, 308):
+                url = urllib.parse.urljoin(
+                    url, response.getheader('Location')
+                )
+                continue
+            if response.status >= 400:
+                raise urllib.error.HTTPError(
+                    url,
+                    response.status,
+                    response.reason,
+                    response.headers,
+                    None,
+                )
+            return data
+        raise urllib.error.URLError('Too many redirects: {}'.format(url))
+
+
+class ThumbnailUrlResolver(object):
+    '''Resolve the thumbnail url of entities for the download threads.
+    Urls requested at the same time are resolved with a single batched
+    query.'''
+
+    BATCH_DELAY = 0.02  # Seconds to collect requests before querying
+
+    def __init__(self, query, get_url):
+        '''
+        Initialise thumbnail url resolver
+
+        :param query: The query selecting thumbnail attributes, with a single `{}` placeholder for the entity ids
+        :param get_url: Function returning the thumbnail url given the session and a queried entity
+        '''
+        self.logger = logging.getLogger(
+            __name__ + '.' + self.__class__.__name__
+        )
+        self._query = query
+        self._get_url = get_url
+        self._lock = threading.Lock()
+        self._batches = weakref.WeakKeyDictionary()  # Collecting, by session
+
+    def resolve(self, session, entity_id):
+        '''(Download thread) Return the thumbnail url of entity having
+        *entity_id*, None if it has no thumbnail'''
+        with self._lock:
+            batch = self._batches.get(session)
+            is_leader = batch is None
+            if is_leader:
+                batch = self._batches[session] = {
+                    'ids': set(),
+                    'urls': {},
+                    'done': threading.Event(),
+                }
+            batch['ids'].add(entity_id)
+        if not is_leader:
+            batch['done'].wait()
+            return batch['urls'].get(entity_id)
+        # Collect concurrent requests, then resolve them all
+        time.sleep(self.BATCH_DELAY)
+        with self._lock:
+            del self._batches[session]
+        try:
+            for entity in query_in_batches(
+                session, self._query, list(batch['ids'])
+            ):
+                batch['urls'][entity['id']] = self._get_url(session, entity)
+        except Exception as e:
+            self.logger.warning(
+                'Could not resolve thumbnail urls: {}'.format(e)
+            )
+        finally:
+            batch['done'].set()
+        return batch['urls'].get(entity_id)
+
 
 # Cache of thumbnail images.
-IMAGE_CACHE = dict()
+THUMBNAIL_CACHE = ThumbnailCache()
+
+# Download thumbnail images
+THUMBNAIL_DOWNLOADER = ThumbnailDownloader()
+
+# Resolve thumbnail urls not provided on load
+ASSET_VERSION_THUMBNAIL_URLS = ThumbnailUrlResolver(
+    'select thumbnail_url from AssetVersion where id in ({})',
+    lambda session, version: (version['thumbnail_url'] or {}).get('url'),
+)
+CONTEXT_THUMBNAIL_URLS = ThumbnailUrlResolver(
+    'select thumbnail_id from Context where id in ({})',
+    lambda session, context: get_thumbnail_url(
+        session, context['thumbnail_id']
+    ),
+)
 
 
 class ThumbnailBase(QtWidgets.QLabel):
     '''Widget to load thumbnails from ftrack server.'''
 
-    MAX_CONNECTIONS = 10  # Maximum number of parallel connections to allow
-
     thumbnailFetched = QtCore.Signal(object)
     thumbnailNotFound = QtCore.Signal()
 
-    _connection_count = 0
-
     def __init__(self, session, scale=True, parent=None):
         super(ThumbnailBase, self).__init__(parent)
         self.session = session
@@ -35,8 +507,10 @@ class ThumbnailBase(QtWidgets.QLabel):
             __name__ + '.' + self.__class__.__name__
         )
 
-        # self._worker = None
         self.__loadingReference = None
+        self.__loadingHints = (None, None)
+        self.__request = None
+        self.__cancelledLoad = None
         self.pre_build()
         self.post_build()
 
@@ -53,65 +527,156 @@ class ThumbnailBase(QtWidgets.QLabel):
         self.thumbnailFetched.connect(self._downloaded)
         self.thumbnailNotFound.connect(self._use_placeholder)
 
-    def load(self, reference):
-        '''Load thumbnail from *reference* and display it.'''
+    def get_cache_key(self, reference):
+        '''Return the key identifying thumbnail *reference* in memory
+        cache. The disk cache key also includes the thumbnail url, see
+        :meth:`get_disk_cache_key`.'''
+        return '{}:{}:{}'.format(
+            self.session.server_url, self.__class__.__name__, reference
+        )
 
-        if reference in IMAGE_CACHE:
-            if IMAGE_CACHE[reference] is not None:
-                self._updatePixmapData(IMAGE_CACHE[reference])
-            else:
-                self._updateWithPlaceholderPixmap()
+    def get_disk_cache_key(self, reference, url):
+        '''Return the key identifying thumbnail *reference* downloaded from
+        *url* in disk cache. Disk entries persist across sessions, keying on
+        url picks up a new thumbnail of the same entity.'''
+        return '{}:{}'.format(self.get_cache_key(reference), url)
+
+    def _get_pixmap_size(self):
+        '''Return the size the thumbnail pixmap will be scaled to'''
+        if not self._scale:
+            return None
+        return (self.width(), self.height())
+
+    def get_thumbnail_url(self, component):
+        '''Return the url of thumbnail *component*'''
+        if not component:
             return
+        return get_thumbnail_url(self.session, component['id'])
+
+    def get_placeholder_url(self):
+        '''Return the url of the image to download if there is no
+        thumbnail, None to use the placeholder resource'''
+        return None
 
-        thread = BaseThread(
-            name='get_thumbnail_thread',
-            target=self._download_async,
-            callback=self._downloaded_async,
-            target_args=[reference],
+    def load(self, reference, url=None, thumbnail_id=None):
+        '''Load thumbnail from *reference* and display it. The thumbnail
+        *url*, or *thumbnail_id* of the thumbnail component, can be provided
+        if already fetched to spare resolving it from server. Pass
+        NO_THUMBNAIL if known to have no thumbnail.'''
+        self._cancel()
+        self.__loadingReference = self.__cancelledLoad = None
+        cache_key = self.get_cache_key(reference)
+        if THUMBNAIL_CACHE.is_not_found(cache_key):
+            self._updateWithPlaceholderPixmap()
+            return
+        pixmap = THUMBNAIL_CACHE.get_pixmap(
+            cache_key, self._get_pixmap_size()
         )
-        thread.start()
+        if pixmap is not None:
+            self.setPixmap(pixmap)
+            return
 
         self.__loadingReference = reference
+        self.__loadingHints = (url, thumbnail_id)
+        self.__request = THUMBNAIL_DOWNLOADER.request(
+            cache_key,
+            partial(self._download_async, reference, url, thumbnail_id),
+            partial(self._downloaded_async, reference),
+            is_wanted=partial(shiboken2.isValid, self),
+        )
 
-    def _download_async(self, reference):
-        '''(Run in background thread) Download image'''
-        while ThumbnailBase.MAX_CONNECTIONS <= ThumbnailBase._connection_count:
-            time.sleep(0.01)
-            # Thumbnail widget still active?
-            if not shiboken2.isValid(self):
-                return
-        ThumbnailBase._connection_count += 1
+    def _cancel(self):
+        '''Cancel pending thumbnail download, if any'''
+        if self.__request is not None:
+            THUMBNAIL_DOWNLOADER.cancel(self.__request)
+            self.__request = None
+
+    def hideEvent(self, event):
+        '''(Override) Do not download thumbnails not shown'''
+        if self.__request is not None:
+            self._cancel()
+            self.__cancelledLoad = (
+                self.__loadingReference,
+            ) + self.__loadingHints
+            self.__loadingReference = None
+        super(ThumbnailBase, self).hideEvent(event)
+
+    def showEvent(self, event):
+        '''(Override) Resume download cancelled when hidden'''
+        super(ThumbnailBase, self).showEvent(event)
+        if self.__cancelledLoad is not None:
+            self.load(*self.__cancelledLoad)
+
+    def _download_async(self, reference, url=None, thumbnail_id=None):
+        '''(Run in download thread) Resolve the thumbnail url, unless
+        provided by *url* or *thumbnail_id*, then fetch image from disk cache
+        or download it'''
+        cache_key = self.get_cache_key(reference)
         try:
-            return self._download(reference)
+            if url is None and thumbnail_id is not None:
+                url = (
+                    get_thumbnail_url(self.session, thumbnail_id)
+                    or NO_THUMBNAIL
+                )
+            if url is None:
+                url = self._get_url(reference)
         except urllib.error.URLError:
-            # Not found
-            if not shiboken2.isValid(self):
-                # Thumbnail widget has been destroyed
-                return
-            self.thumbnailNotFound.emit()
-        finally:
-            ThumbnailBase._connection_count -= 1
+            url = None
+        if not url:
+            # No thumbnail
+            url = self.get_placeholder_url()
+        data = None
+        if url:
+            disk_key = self.get_disk_cache_key(reference, url)
+            data = THUMBNAIL_CACHE.get_data(disk_key)
+            if data is not None:
+                return data
+            try:
+                data = self._download_url(url)
+            except urllib.error.URLError:
+                # Not found
+                data = None
+        if data:
+            THUMBNAIL_CACHE.set_data(disk_key, data)
+        else:
+            THUMBNAIL_CACHE.set_not_found(cache_key)
+        return data
 
-    def _downloaded_async(self, html):
-        '''(Run in background thread) Image has been downloaded, propagate to QT thread'''
+    def _downloaded_async(self, reference, html):
+        '''(Run in download thread) Image has been downloaded, propagate to QT thread'''
         if not shiboken2.isValid(self):
             # Thumbnail widget has been destroyed
             return
-        self.thumbnailFetched.emit(html)
+        if reference != self.__loadingReference:
+            # Another thumbnail has been requested since
+            return
+        if html:
+            self.thumbnailFetched.emit(html)
+        else:
+            self.thumbnailNotFound.emit()
 
     def _downloaded(self, result):
         '''Handler worker finished event.'''
         if not shiboken2.isValid(self):
             # Thumbnail widget has been destroyed
             return
-        IMAGE_CACHE[self.__loadingReference] = result
-        self._updatePixmapData(result)
+        if result and self.__loadingReference is not None:
+            self._updatePixmapData(result)
+            pixmap = self.pixmap()
+            if pixmap is not None and not pixmap.isNull():
+                THUMBNAIL_CACHE.set_pixmap(
+                    self.get_cache_key(self.__loadingReference),
+                    self._get_pixmap_size(),
+                    pixmap,
+                )
 
         self.__loadingReference = None
+        self.__request = None
 
     def _use_placeholder(self):
         '''Use placeholder image'''
-        IMAGE_CACHE[self.__loadingReference] = None
+        self.__loadingReference = None
+        self.__request = None
         self._updateWithPlaceholderPixmap()
 
     def _updatePixmapData(self, data):
@@ -136,39 +701,20 @@ class ThumbnailBase(QtWidgets.QLabel):
             scaled_pixmap = pixmap
         self.setPixmap(scaled_pixmap)
 
-    def _safeDownload(self, url, opener_callback, timeout=5):
-        '''Check *url* through the given *openener_callback*.
-
-        .. note::
-
-           A placeholder image will be returned if there is not response within
-           the given *timeout*.
+    def _get_url(self, reference):
+        '''(Run in download thread) Return the thumbnail url of
+        *reference*, an url. Resolve url from reference if overridden by
+        child.'''
+        return reference
 
-        '''
-
-        return opener_callback(url, timeout=timeout)
+    def _download(self, reference):
+        '''(Run in download thread) Return thumbnail file from *reference*'''
+        return self._download_url(self._get_url(reference))
 
-    def _download(self, url):
-        '''Return thumbnail file from *url*.'''
+    def _download_url(self, url):
+        '''(Run in download thread) Return thumbnail file from *url*.'''
         if url:
-            ftrackProxy = os.getenv('FTRACK_PROXY', '')
-            ftrackServer = self.session._server_url
-
-            if ftrackProxy != '':
-                if ftrackServer.startswith('https'):
-                    httpHandle = 'https'
-                else:
-                    httpHandle = 'http'
-
-                proxy = urllib.request.ProxyHandler({httpHandle: ftrackProxy})
-                opener = urllib.request.build_opener(proxy)
-                response = self._safeDownload(url, opener.open)
-                html = response.read()
-            else:
-                response = self._safeDownload(url, urllib.request.urlopen)
-                html = response.read()
-
-            return html
+            return THUMBNAIL_DOWNLOADER.open_url(url)
 
         self.logger.warning('There is no url image to download')
         return None
@@ -194,39 +740,14 @@ class EllipseThumbnailBase(ThumbnailBase):
 class Context(ThumbnailBase):
     '''Context thumbnail widget'''
 
-    def _download(self, reference):
-        '''Return thumbnail from *reference*.'''
-        context = self.session.get('Context', reference)
-        thumbnail = context['thumbnail']
-        if thumbnail is None and context['thumbnail_id'] is not None:
-            thumbnail = self.session.query(
-                'FileComponent where id is "{}"'.format(
-                    context['thumbnail_id']
-                )
-            ).one()
-        url = self.get_thumbnail_url(thumbnail)
+    def _get_url(self, reference):
+        '''Return thumbnail url of *reference*.'''
+        url = CONTEXT_THUMBNAIL_URLS.resolve(self.session, reference)
         if url is not None:
-            return super(Context, self)._download(url)
+            return url
         else:
             raise urllib.error.URLError("No context URL")
 
-    def get_thumbnail_url(self, component):
-        if not component:
-            return
-
-        params = urllib.parse.urlencode(
-            {
-                'id': component['id'],
-                'username': self.session.api_user,
-                'apiKey': self.session.api_key,
-            }
-        )
-
-        result_url = '{base_url}/component/thumbnail?{params}'.format(
-            base_url=self.session._server_url, params=params
-        )
-        return result_url
-
     def _scaleAndSetPixmap(self, pixmap):
         '''Scale and set *pixmap*.'''
         if self._scale:
@@ -243,30 +764,14 @@ class Context(ThumbnailBase):
 class AssetVersion(ThumbnailBase):
     '''Asset version thumbnail widget'''
 
-    def _download(self, reference):
-        '''Return thumbnail from *reference*.'''
-        url = self.session.get('AssetVersion', reference)['thumbnail_url'][
-            'url'
-        ]
-        url = url or self.placholderThumbnail
-        return super(AssetVersion, self)._download(url)
+    def _get_url(self, reference):
+        '''Return thumbnail url of *reference*.'''
+        url = ASSET_VERSION_THUMBNAIL_URLS.resolve(self.session, reference)
+        return url or self.get_placeholder_url()
 
-    def get_thumbnail_url(self, component):
-        if not component:
-            return
-
-        params = urllib.parse.urlencode(
-            {
-                'id': component['id'],
-                'username': self.session.api_user,
-                'apiKey': self.session.api_key,
-            }
-        )
-
-        result_url = '{base_url}/component/thumbnail?{params}'.format(
-            base_url=self.session._server_url, params=params
-        )
-        return result_url
+    def get_placeholder_url(self):
+        '''(Override)'''
+        return self.placholderThumbnail
 
     def _scaleAndSetPixmap(self, pixmap):
         '''Scale and set *pixmap*.'''
@@ -284,29 +789,11 @@ class AssetVersion(ThumbnailBase):
 class User(EllipseThumbnailBase):
     '''User(avatar) thumbnail widget'''
 
-    def _download(self, reference):
-        '''Return thumbnail from *reference*.'''
+    def _get_url(self, reference):
+        '''Return thumbnail url of *reference*.'''
         thumbnail = self.session.query(
             'select thumbnail from User where username is "{}"'.format(
                 reference
             )
         ).first()['thumbnail']
-        url = self.get_thumbnail_url(thumbnail)
-        return super(User, self)._download(url)
-
-    def get_thumbnail_url(self, component):
-        if not component:
-            return
-
-        params = urllib.parse.urlencode(
-            {
-                'id': component['id'],
-                'username': self.session.api_user,
-                'apiKey': self.session.api_key,
-            }
-        )
-
-        result_url = '{base_url}/component/thumbnail?{params}'.format(
-            base_url=self.session._server_url, params=params
-        )
-        return result_url
+        return self.get_thumbnail_url(thumbnail)
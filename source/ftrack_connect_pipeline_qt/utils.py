@@ -116,6 +116,47 @@ class BaseThread(threading.Thread):
             self.callback(result)
 
 
+def query_in_batches(session, query, ids, batch_size=100):
+    '''Run *query* with *session* for all unique *ids*, in batches of
+    *batch_size*. The query should contain a single `{}` placeholder to be
+    replaced by the comma separated list of quoted ids, e.g.
+    'select version from AssetVersion where id in ({})'.
+    Return a list of resulting entities.'''
+    unique_ids = []
+    visited = set()
+    for entity_id in ids:
+        if entity_id and entity_id not in visited:
+            visited.add(entity_id)
+            unique_ids.append(entity_id)
+    result = []
+    for offset in range(0, len(unique_ids), batch_size):
+        batch = unique_ids[offset : offset + batch_size]
+        result.extend(
+            session.query(
+                query.format(
+                    ','.join(['"{}"'.format(entity_id) for entity_id in batch])
+                )
+            ).all()
+        )
+    return result
+
+
+def get_loaded_value(entity, key, default=None):
+    '''Return the value of attribute *key* of *entity* if it has been set
+    or loaded, for example by a query projection. Return *default*
+    otherwise, never populating the attribute from the server.'''
+    attribute = entity.attributes.get(key)
+    if attribute is None:
+        return default
+    # Attribute.get_value would populate the value if auto populate is on
+    value = attribute.get_local_value(entity)
+    if value is ftrack_api.symbol.NOT_SET:
+        value = attribute.get_remote_value(entity)
+    if value is ftrack_api.symbol.NOT_SET:
+        return default
+    return value
+
+
 def is_main_thread():
     '''Return True if running in main thread.'''
     return (
@@ -0,0 +1,206 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014-2023 ftrack
+import threading
+
+import pytest
+
+batch = pytest.importorskip('ftrack_connect_pipeline_qt.client.load.batch')
+
+BatchItem = batch.BatchItem
+BatchRunner = batch.BatchRunner
+
+
+def create_items(count):
+    '''Return *count* batch items, each having a component id'''
+    return [
+        BatchItem({'id': 'component{}'.format(n)}, None, None, 'loader')
+        for n in range(count)
+    ]
+
+
+def create_runner(items, prepare=None, execute=None, **kwargs):
+    '''Return a runner of *items*, by default preparing nothing and
+    succeeding to execute'''
+    return BatchRunner(
+        items,
+        prepare or (lambda item: None),
+        execute or (lambda item: True),
+        process_events=lambda: None,
+        **kwargs
+    )
+
+
+def test_run_in_order():
+    items = create_items(10)
+    prepared = []
+    executed = []
+    started = []
+    finished = []
+
+    def execute(item):
+        assert item.status == BatchItem.STATUS_RUNNING
+        assert threading.current_thread() is threading.main_thread()
+        executed.append(item.batch_id)
+        return True
+
+    runner = create_runner(
+        items,
+        prepare=lambda item: prepared.append(item.batch_id),
+        execute=execute,
+        max_workers=3,
+    )
+    runner.run(
+        on_item_started=lambda item: started.append(item.batch_id),
+        on_item_finished=lambda item: finished.append(item.batch_id),
+    )
+    ids = [item.batch_id for item in items]
+    assert sorted(prepared) == sorted(ids)
+    assert executed == started == finished == ids
+    assert [item.status for item in items] == [BatchItem.STATUS_DONE] * 10
+    assert not runner.running
+    for item in items:
+        assert set(item.timings) == set(
+            [
+                BatchItem.PHASE_PREPARE,
+                BatchItem.PHASE_WAIT,
+                BatchItem.PHASE_RUN,
+            ]
+        )
+
+
+def test_failures():
+    items = create_items(4)
+
+    def prepare(item):
+        if item.batch_id == 'component0':
+            raise Exception('Prepare failed')
+
+    def execute(item):
+        if item.batch_id == 'component1':
+            raise Exception('Execute failed')
+        return item.batch_id != 'component2'
+
+    create_runner(items, prepare=prepare, execute=execute).run()
+    assert [item.status for item in items] == [
+        BatchItem.STATUS_DONE,
+        BatchItem.STATUS_FAILED,
+        BatchItem.STATUS_FAILED,
+        BatchItem.STATUS_DONE,
+    ]
+
+
+def test_queue_bound():
+    items = create_items(20)
+    prepared = []
+    lock = threading.Lock()
+    ahead = []
+
+    def prepare(item):
+        with lock:
+            prepared.append(item.batch_id)
+
+    def execute(item):
+        with lock:
+            # Items prepared or being prepared beyond the one running
+            ahead.append(len(prepared) - items.index(item) - 1)
+        return True
+
+    create_runner(
+        items, prepare=prepare, execute=execute, max_workers=4, queue_size=3
+    ).run()
+    assert len(prepared) == 20
+    assert max(ahead) <= 2
+
+
+def test_queue_size_one_prepares_before_run():
+    items = create_items(5)
+    events = []
+    create_runner(
+        items,
+        prepare=lambda item: events.append(('prepare', item.batch_id)),
+        execute=lambda item: events.append(('run', item.batch_id)) or True,
+        max_workers=2,
+        queue_size=1,
+    ).run()
+    assert events == [
+        (phase, item.batch_id)
+        for item in items
+        for phase in ['prepare', 'run']
+    ]
+
+
+def test_cancel_item():
+    items = create_items(5)
+    items[1].cancel()
+    items[3].cancel()
+    executed = []
+    finished = []
+    create_runner(
+        items, execute=lambda item: executed.append(item.batch_id) or True
+    ).run(on_item_finished=lambda item: finished.append(item.batch_id))
+    assert executed == ['component0', 'component2', 'component4']
+    assert finished == [item.batch_id for item in items]
+    assert [item.status for item in items] == [
+        BatchItem.STATUS_DONE,
+        BatchItem.STATUS_CANCELLED,
+        BatchItem.STATUS_DONE,
+        BatchItem.STATUS_CANCELLED,
+        BatchItem.STATUS_DONE,
+    ]
+
+
+def test_cancel_remaining():
+    items = create_items(5)
+    runner = None
+
+    def execute(item):
+        if item.batch_id == 'component1':
+            runner.cancel()
+        return True
+
+    runner = create_runner(items, execute=execute)
+    runner.run()
+    assert [item.status for item in items] == [
+        BatchItem.STATUS_DONE,
+        BatchItem.STATUS_DONE,
+        BatchItem.STATUS_CANCELLED,
+        BatchItem.STATUS_CANCELLED,
+        BatchItem.STATUS_CANCELLED,
+    ]
+
+
+def test_cancel_while_waiting():
+    items = create_items(2)
+    release = threading.Event()
+    waits = []
+
+    def prepare(item):
+        release.wait(5)
+
+    def process_events():
+        # Cancel from the UI while waiting on preparation
+        waits.append(True)
+        items[0].cancel()
+        release.set()
+
+    runner = BatchRunner(
+        items,
+        prepare,
+        lambda item: True,
+        max_workers=1,
+        process_events=process_events,
+    )
+    try:
+        runner.run()
+    finally:
+        release.set()
+    assert len(waits) > 0
+    assert items[0].status == BatchItem.STATUS_CANCELLED
+    assert items[1].status == BatchItem.STATUS_DONE
+
+
+def test_cancel_ignored_once_running():
+    item = create_items(1)[0]
+    item.status = BatchItem.STATUS_RUNNING
+    item.cancel()
+    assert not item.cancelled
@@ -0,0 +1,148 @@
+# :coding: utf-8
+# :copyright: Copyright (c) 2014-2023 ftrack
+import os
+import types
+import uuid
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+QtCore = pytest.importorskip('Qt.QtCore')
+
+from ftrack_connect_pipeline_qt.ui.asset_manager.tracker import (
+    LatestVersionTracker,
+    LocalEventSource,
+)
+
+
+@pytest.fixture(scope='module')
+def app():
+    '''Return the Qt application running timers'''
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture
+def event_source():
+    return LocalEventSource()
+
+
+@pytest.fixture
+def tracker(app, event_source):
+    '''Return a started tracker, collecting the emitted asset ids'''
+    result = LatestVersionTracker(event_source)
+    result.published = []
+    result.versionsPublished.connect(result.published.append)
+    result.start()
+    yield result
+    result.stop()
+
+
+def update_event(asset_id, entity_type='AssetVersion', action='add'):
+    '''Return an update event of an *entity_type* entity below the asset
+    having *asset_id*'''
+    return {
+        'topic': LatestVersionTracker.TOPIC,
+        'data': {
+            'entities': [
+                {
+                    'entityType': entity_type,
+                    'entityId': uuid.uuid4().hex,
+                    'action': action,
+                    'parents': [
+                        {'entityType': entity_type, 'entityId': 'x'},
+                        {'entityType': 'asset', 'entityId': asset_id},
+                    ],
+                }
+            ]
+        },
+    }
+
+
+def wait(milliseconds):
+    '''Run the event loop for *milliseconds*'''
+    loop = QtCore.QEventLoop()
+    QtCore.QTimer.singleShot(milliseconds, loop.quit)
+    loop.exec_()
+
+
+def test_subscribe(tracker, event_source):
+    assert tracker.running
+    assert list(event_source._subscribers.values()) == [
+        (LatestVersionTracker.TOPIC, tracker._on_update_event)
+    ]
+    tracker.start()
+    assert len(event_source._subscribers) == 1
+
+
+def test_filter_tracked_assets(tracker, event_source):
+    tracker.asset_ids = ['asset1', 'asset2']
+    event_source.publish(update_event('asset1'))
+    event_source.publish(update_event('asset2', action='update'))
+    event_source.publish(update_event('asset3'))
+    event_source.publish(update_event('asset2', action='remove'))
+    event_source.publish(update_event('asset2', entity_type='Task'))
+    event_source.publish(dict(update_event('asset2'), topic='ftrack.other'))
+    tracker._flush()
+    assert tracker.published == [set(['asset1', 'asset2'])]
+
+
+def test_untracked_assets_not_debounced(tracker, event_source):
+    tracker.asset_ids = ['asset1']
+    event_source.publish(update_event('asset2'))
+    assert not tracker._debounce_timer.isActive()
+    tracker._flush()
+    assert tracker.published == []
+
+
+def test_debounce_coalescing(tracker, event_source):
+    tracker.asset_ids = ['asset1', 'asset2']
+    assert tracker._debounce_timer.interval() == 2000
+    event_source.publish(update_event('asset1'))
+    assert tracker._debounce_timer.isActive()
+    event_source.publish(update_event('asset2'))
+    event_source.publish(update_event('asset1'))
+    assert tracker.published == []
+    tracker._debounce_timer.stop()
+    tracker._flush()
+    assert tracker.published == [set(['asset1', 'asset2'])]
+    tracker._flush()
+    assert len(tracker.published) == 1
+
+
+def test_debounce_timer(app, event_source):
+    tracker = LatestVersionTracker(event_source, debounce_interval=50)
+    published = []
+    tracker.versionsPublished.connect(published.append)
+    tracker.asset_ids = ['asset1', 'asset2']
+    tracker.start()
+    event_source.publish(update_event('asset1'))
+    event_source.publish(update_event('asset2'))
+    wait(200)
+    event_source.publish(update_event('asset1'))
+    wait(200)
+    tracker.stop()
+    assert published == [set(['asset1', 'asset2']), set(['asset1'])]
+
+
+def test_stop_drops_pending(tracker, event_source):
+    tracker.asset_ids = ['asset1']
+    event_source.publish(update_event('asset1'))
+    tracker.stop()
+    assert not tracker._debounce_timer.isActive()
+    tracker._flush()
+    event_source.publish(update_event('asset1'))
+    tracker._flush()
+    assert tracker.published == []
+
+
+def test_set_live_mode_off_unsubscribes(tracker, event_source):
+    pytest.importorskip('ftrack_connect_pipeline')
+    from ftrack_connect_pipeline_qt.ui.asset_manager import (
+        AssetManagerWidget,
+    )
+
+    widget = types.SimpleNamespace(_tracker=tracker)
+    AssetManagerWidget.set_live_mode(widget, False)
+    assert not tracker.running
+    assert event_source._subscribers == {}